@@ -0,0 +1,61 @@
+"""
+Measures the cold-start import time of each public fluxon module in a fresh interpreter.
+
+Usage:
+    python benchmarks/bench_import_time.py [repeats]
+"""
+import os
+import subprocess
+import sys
+
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'))
+
+MODULES = [
+    "fluxon.parser",
+    "fluxon.prompter",
+    "fluxon.utils",
+    "fluxon.metrics",
+    "fluxon.sanitizer",
+    "fluxon.structured_parsing.fluxon_structured_parser",
+    "fluxon.converter_registry",
+    "fluxon.format_converter",
+    "fluxon.validator",
+    "fluxon.schema_compiler",
+]
+
+HEAVY_DEPENDENCIES = ["jsonschema", "pydantic", "yaml", "xmltodict", "multiprocessing"]
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = [name for name in {heavy!r} if name in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure(module: str, repeats: int) -> tuple:
+    timings = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_DEPENDENCIES)],
+            env={**os.environ, "PYTHONPATH": SRC},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        timings.append(float(output[0]))
+        loaded = output[1] if len(output) > 1 else "-"
+    return min(timings), loaded
+
+
+def main(repeats: int = 5):
+    print(f"{'module':52} {'import ms':>10}  heavy dependencies loaded")
+    for module in MODULES:
+        elapsed, loaded = measure(module, repeats)
+        print(f"{module:52} {elapsed * 1e3:10.2f}  {loaded}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
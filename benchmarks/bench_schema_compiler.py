@@ -0,0 +1,55 @@
+"""
+Compares the generic parse/repair/validate pipeline with a schema-specialized parser.
+
+Usage:
+    python benchmarks/bench_schema_compiler.py [iterations]
+"""
+import os
+import sys
+import timeit
+from typing import List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+from pydantic import BaseModel
+from fluxon.schema_compiler import compile_schema_parser
+from fluxon.validator import generate_schema, parse_and_validate
+
+
+class Item(BaseModel):
+    name: str
+    qty: int = 1
+    tags: List[str] = []
+
+
+class Order(BaseModel):
+    id: int
+    paid: bool = False
+    items: List[Item]
+    note: Optional[str] = None
+
+
+SAMPLES = [
+    '{"id": 1, "paid": true, "items": [{"name": "a", "qty": 2, "tags": ["x", "y"]}, {"name": "b"}]}',
+    '{"id": "7", "paid": "false", "items": [{"name": "c", "qty": "3"}], "note": "rush"}',
+    '{"id": 3, "items": [{"name": 4}]}',
+]
+
+
+def main(iterations: int = 20000):
+    schema = generate_schema(Order)
+    specialized = compile_schema_parser(schema)
+    for sample in SAMPLES:
+        assert specialized(sample) == parse_and_validate(sample, schema)
+
+    generic_time = timeit.timeit(lambda: [parse_and_validate(sample, schema) for sample in SAMPLES], number=iterations)
+    specialized_time = timeit.timeit(lambda: [specialized(sample) for sample in SAMPLES], number=iterations)
+    calls = iterations * len(SAMPLES)
+
+    print(f"generic:     {generic_time / calls * 1e6:8.2f} us/call")
+    print(f"specialized: {specialized_time / calls * 1e6:8.2f} us/call")
+    print(f"speedup:     {generic_time / specialized_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
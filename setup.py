@@ -22,6 +22,10 @@ setup(
         "pydantic>=1.10.0",
     ],
     extras_require={
+        "yaml": ["pyyaml>=6.0"],
+        "xml": ["xmltodict>=0.13.0"],
+        "numpy": ["numpy>=1.22"],
+        "all": ["pyyaml>=6.0", "xmltodict>=0.13.0", "numpy>=1.22"],
         "dev": [
             "pytest>=7.0",
             "black>=22.0",
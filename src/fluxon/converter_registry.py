@@ -0,0 +1,216 @@
+import csv
+import importlib
+import json
+import re
+from fluxon.metrics import measure
+
+SNIFF_SIZE = 512
+CSV_HEADER_PATTERN = re.compile(r'[^\n:]*,[^\n]*')
+YAML_PREFIXES = ("---", "%YAML")
+OUTPUTS = ("object", "json", "jsonl")
+
+COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+class ConverterFormat:
+    """ A registered input format: how to load it, stream its records and recognize it. """
+    __slots__ = ("name", "loader", "record_iterator", "sniffer")
+
+    def __init__(self, name: str, loader, record_iterator=None, sniffer=None):
+        """
+        Args:
+            name (str): The format name, such as "csv".
+            loader: A callable turning the content into a Python object, or its import path
+                as "module:attribute", resolved on first use.
+            record_iterator: Optional callable, or import path, yielding the records of the
+                content one at a time. When omitted, records are derived from the loaded object.
+            sniffer (callable): Optional function taking a stripped prefix of the content and
+                returning True if the content is in this format.
+        """
+        self.name = name
+        self.loader = loader
+        self.record_iterator = record_iterator
+        self.sniffer = sniffer
+
+    def load(self, content: str, **options):
+        self.loader = resolve(self.loader)
+        return self.loader(content, **options)
+
+    def iter_records(self, content: str, **options):
+        if self.record_iterator is None:
+            loaded = self.load(content, **options)
+            return iter(loaded) if isinstance(loaded, list) else iter([loaded])
+        self.record_iterator = resolve(self.record_iterator)
+        return self.record_iterator(content, **options)
+
+
+class ConverterRegistry:
+    """ Registry of input formats with prefix-based detection and conversion to objects or JSON. """
+
+    def __init__(self, fallback: str = "yaml"):
+        """
+        Args:
+            fallback (str): The format assumed when no sniffer recognizes the content.
+        """
+        self.formats = {}
+        self.fallback = fallback
+
+    def register(self, name: str, loader, record_iterator=None, sniffer=None):
+        """
+        Registers a format, replacing any format with the same name.
+
+        Loaders and record iterators may be given as "module:attribute" import paths so that
+        the module behind a format is only imported when the format is first used.
+
+        Args:
+            name (str): The format name.
+            loader: The loader callable or its import path.
+            record_iterator: Optional record iterator callable or its import path.
+            sniffer (callable): Optional detection function taking a stripped content prefix.
+        """
+        self.formats[name] = ConverterFormat(name, loader, record_iterator, sniffer)
+
+    def get(self, name: str) -> ConverterFormat:
+        """
+        Returns a registered format.
+
+        Args:
+            name (str): The format name.
+
+        Returns:
+            ConverterFormat: The format.
+
+        Raises:
+            ValueError: If no format with that name is registered.
+        """
+        try:
+            return self.formats[name]
+        except KeyError:
+            raise ValueError(f"Unknown format: {name}") from None
+
+    def detect(self, content: str) -> str:
+        """
+        Detects the format of the content from a short prefix.
+
+        Sniffers are tried in registration order; the fallback format is returned when none
+        of them matches.
+
+        Args:
+            content (str): The content to inspect.
+
+        Returns:
+            str: The detected format name.
+        """
+        prefix = content[:SNIFF_SIZE].lstrip("\ufeff \t\r\n")
+        for converter_format in self.formats.values():
+            if converter_format.sniffer is not None and converter_format.sniffer(prefix):
+                return converter_format.name
+        return self.fallback
+
+    @measure("converter_registry.convert", size_arg=1)
+    def convert(self, data, src: str = "auto", dst: str = "object", **options):
+        """
+        Converts content to a Python object, a JSON string or JSON Lines.
+
+        Args:
+            data (str | bytes): The content to convert. Bytes are decoded as UTF-8.
+            src (str): The input format name, or "auto" to detect it.
+            dst (str): "object" for the loaded Python object, "json" for a compact JSON string,
+                or "jsonl" for one compact JSON line per record.
+            **options: Extra keyword arguments for the format's loader or record iterator.
+
+        Returns:
+            The converted content.
+
+        Raises:
+            ValueError: If the input or output format is unknown.
+        """
+        if dst not in OUTPUTS:
+            raise ValueError(f"Unknown output: {dst}")
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode("utf-8-sig")
+        converter_format = self.get(self.detect(data) if src == "auto" else src)
+
+        if dst == "jsonl":
+            encode = COMPACT_ENCODER.encode
+            return "\n".join(encode(record) for record in converter_format.iter_records(data, **options))
+        loaded = converter_format.load(data, **options)
+        if dst == "json":
+            return COMPACT_ENCODER.encode(loaded)
+        return loaded
+
+
+def resolve(target):
+    """
+    Resolves a "module:attribute" import path, leaving callables unchanged.
+
+    Args:
+        target: A callable or an import path.
+
+    Returns:
+        callable: The resolved callable.
+    """
+    if isinstance(target, str):
+        module_name, _, attribute = target.partition(":")
+        return getattr(importlib.import_module(module_name), attribute)
+    return target
+
+
+def sniff_json(prefix: str) -> bool:
+    # A leading quote is left to the CSV and YAML sniffers: it also starts quoted CSV headers
+    return prefix[:1] in ("{", "[")
+
+
+def sniff_xml(prefix: str) -> bool:
+    return prefix[:1] == "<"
+
+
+def sniff_yaml(prefix: str) -> bool:
+    return prefix.startswith(YAML_PREFIXES)
+
+
+def sniff_csv(prefix: str) -> bool:
+    # A CSV header has a comma and, unlike a YAML mapping, no colon before it. Other
+    # delimiters are not guessed; pass src="csv" and delimiter explicitly for those.
+    first_line = prefix.split("\n", 1)[0].rstrip("\r")
+    if ": " in first_line or CSV_HEADER_PATTERN.fullmatch(first_line) is None:
+        return False
+    # Commas inside a quoted string, as in "Hello, world", do not make a second column
+    return len(next(csv.reader([first_line]))) > 1
+
+
+def load_json(content: str):
+    return json.loads(content)
+
+
+converter_registry = ConverterRegistry()
+converter_registry.register("json", load_json, sniffer=sniff_json)
+converter_registry.register(
+    "xml", "fluxon.format_converter:load_xml", "fluxon.format_converter:iter_xml_records", sniff_xml
+)
+converter_registry.register(
+    "yaml", "fluxon.format_converter:load_yaml", "fluxon.format_converter:iter_yaml_documents", sniff_yaml
+)
+converter_registry.register(
+    "csv", "fluxon.format_converter:load_csv", "fluxon.format_converter:iter_csv_records", sniff_csv
+)
+
+
+def register_format(name: str, loader, record_iterator=None, sniffer=None):
+    """
+    Registers a format with the default registry.
+
+    Args:
+        name (str): The format name.
+        loader: The loader callable or its "module:attribute" import path.
+        record_iterator: Optional record iterator callable or its import path.
+        sniffer (callable): Optional detection function taking a stripped content prefix.
+    """
+    converter_registry.register(name, loader, record_iterator, sniffer)
+
+
+def convert(data, src: str = "auto", dst: str = "object", **options):
+    """
+    Converts content with the default registry. See ConverterRegistry.convert.
+    """
+    return converter_registry.convert(data, src, dst, **options)
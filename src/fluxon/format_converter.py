@@ -1,9 +1,90 @@
 import csv
 import json
-import yaml
-import xmltodict
-from io import StringIO
+import os
+import re
+import sys
+from array import array
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache, partial
+from importlib import import_module
+from io import BytesIO, StringIO
+from itertools import chain, islice, zip_longest
+from fluxon.metrics import measure
+from fluxon.utils import Preview, get_logger
 
+logger = get_logger(__name__)
+
+COMPACT_ENCODER = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+INTEGER_PATTERN = re.compile(r'[-+]?\d+')
+NUMBER_PATTERN = re.compile(r'[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?')
+BOOLEAN_VALUES = {"true": True, "false": False}
+# Numbers written with leading zeros, such as ZIP codes or "007", are identifiers
+LEADING_ZERO_PATTERN = re.compile(r'[-+]?0\d')
+
+COLUMN_BATCH_SIZE = 4096
+CSV_CHUNK_SIZE = 64 * 1024 * 1024
+SCAN_BLOCK_SIZE = 1024 * 1024
+DICT_READER_OPTIONS = ("fieldnames", "restkey", "restval")  # Not accepted by csv.reader
+
+# Optional dependencies are imported on first use, with the setup.py extra that provides them
+OPTIONAL_DEPENDENCIES = {"yaml": "yaml", "xmltodict": "xml"}
+
+
+def import_optional(module_name: str):
+    """
+    Imports an optional dependency of the converters.
+
+    Args:
+        module_name (str): The module to import.
+
+    Returns:
+        module: The imported module.
+
+    Raises:
+        ImportError: If the module is not installed, naming the extra that provides it.
+    """
+    try:
+        return import_module(module_name)
+    except ImportError as e:
+        extra = OPTIONAL_DEPENDENCIES.get(module_name, "all")
+        raise ImportError(f"{module_name} is required for this conversion; install fluxon[{extra}]") from e
+
+
+@lru_cache(maxsize=None)
+def get_yaml_loader():
+    """
+    Returns the fastest available safe YAML loader.
+
+    The LibYAML loader is several times faster than the pure-Python one when PyYAML was
+    built with it.
+
+    Returns:
+        type: CSafeLoader if available, otherwise SafeLoader.
+    """
+    yaml = import_optional("yaml")
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@measure("format_converter.load_yaml", size_arg=0)
+def load_yaml(yaml_content):
+    """
+    Loads a single YAML document with the fastest available safe loader.
+
+    Args:
+        yaml_content: The YAML string or a text file object.
+
+    Returns:
+        The loaded Python object.
+
+    Raises:
+        yaml.YAMLError: If the content is not valid YAML or holds several documents.
+    """
+    yaml = import_optional("yaml")
+    return yaml.load(yaml_content, Loader=get_yaml_loader())
+
+
+@measure("format_converter.yaml_to_json", size_arg=0)
 def yaml_to_json(yaml_content: str) -> str:
     """
     Converts YAML content to a JSON string.
@@ -14,11 +95,12 @@ def yaml_to_json(yaml_content: str) -> str:
     Returns:
         str: The equivalent JSON string.
     """
+    yaml = import_optional("yaml")
     try:
-        yaml_data = yaml.safe_load(yaml_content)
+        yaml_data = load_yaml(yaml_content)
         return json.dumps(yaml_data, indent=4)
     except yaml.YAMLError as e:
-        print(f"YAML to JSON conversion error: {e}")
+        logger.warning("YAML to JSON conversion error: %s; input: %s", e, Preview(yaml_content))
         return ""
 
 def validate_yaml_with_schema(yaml_content: str, schema: dict) -> bool:
@@ -32,17 +114,77 @@ def validate_yaml_with_schema(yaml_content: str, schema: dict) -> bool:
     Returns:
         bool: True if valid, False otherwise.
     """
-    from jsonschema import validate, ValidationError
+    return load_and_validate_yaml(yaml_content, schema)[1]
+
+
+@measure("format_converter.load_and_validate_yaml", size_arg=0)
+def load_and_validate_yaml(yaml_content: str, schema: dict) -> tuple:
+    """
+    Loads YAML content once and validates it against a JSON Schema.
 
+    Args:
+        yaml_content (str): The YAML string to load.
+        schema (dict): The JSON Schema dictionary.
+
+    Returns:
+        tuple: The loaded object (None if the YAML is invalid) and whether it matched the schema.
+    """
+    from fluxon.validator import validate_with_schema
+
+    yaml = import_optional("yaml")
     try:
-        yaml_data = yaml.safe_load(yaml_content)
-        validate(instance=yaml_data, schema=schema)
-        return True
-    except (yaml.YAMLError, ValidationError) as e:
-        print(f"Validation error: {e}")
-        return False
+        yaml_data = load_yaml(yaml_content)
+    except yaml.YAMLError as e:
+        logger.warning("YAML validation error: %s; input: %s", e, Preview(yaml_content))
+        return None, False
+    return yaml_data, validate_with_schema(yaml_data, schema)
+
+
+def iter_yaml_documents(source, schema: dict = None):
+    """
+    Streams the documents of a multi-document YAML source.
+
+    Documents are loaded one at a time, so a long "---" separated stream is never held in
+    memory as a whole.
+
+    Args:
+        source: An os.PathLike path, a text file object, or the YAML content as a string.
+        schema (dict): Optional JSON Schema each document is validated against.
+
+    Yields:
+        The loaded documents, or (document, is_valid) tuples when a schema is given.
+
+    Raises:
+        yaml.YAMLError: If a document is not valid YAML.
+    """
+    if schema is not None:
+        from fluxon.validator import validate_with_schema
+
+    yaml = import_optional("yaml")
+    with open_text_source(source) as stream:
+        for document in yaml.load_all(stream, Loader=get_yaml_loader()):
+            if schema is None:
+                yield document
+            else:
+                yield document, validate_with_schema(document, schema)
+
+
+def yaml_to_jsonl(source):
+    """
+    Streams the documents of a multi-document YAML source as compact JSON Lines.
+
+    Args:
+        source: An os.PathLike path, a text file object, or the YAML content as a string.
+
+    Yields:
+        str: One compact JSON value per document, without a trailing newline.
+    """
+    encode = COMPACT_ENCODER.encode
+    for document in iter_yaml_documents(source):
+        yield encode(document)
     
 
+@measure("format_converter.csv_to_json", size_arg=0)
 def csv_to_json(csv_content: str) -> str:
     """
     Converts CSV content to a JSON string.
@@ -58,13 +200,14 @@ def csv_to_json(csv_content: str) -> str:
         json_data = [row for row in csv_reader]
         return json.dumps(json_data, indent=4)
     except csv.Error as e:
-        print(f"CSV to JSON conversion error: {e}")
+        logger.warning("CSV to JSON conversion error: %s; input: %s", e, Preview(csv_content))
         return ""
     
 
 
 
 
+@measure("format_converter.xml_to_json", size_arg=0)
 def xml_to_json(xml_content: str) -> str:
     """
     Converts XML content to a JSON string.
@@ -76,9 +219,679 @@ def xml_to_json(xml_content: str) -> str:
         str: The equivalent JSON string.
     """
     try:
-        xml_data = xmltodict.parse(xml_content)
+        xml_data = import_optional("xmltodict").parse(xml_content)
         return json.dumps(xml_data, indent=4)
     except Exception as e:
-        print(f"XML to JSON conversion error: {e}")
+        logger.warning("XML to JSON conversion error: %s; input: %s", e, Preview(xml_content))
         return ""
 
+
+@measure("format_converter.load_csv", size_arg=0)
+def load_csv(csv_content: str, infer_types: bool = True, sample_size: int = 100, **reader_options) -> list:
+    """
+    Loads CSV content into a list of records.
+
+    Args:
+        csv_content (str): The CSV string to load.
+        infer_types (bool): Whether to convert values of integer, number and boolean columns.
+        sample_size (int): The number of rows sampled to infer column types.
+        **reader_options: Extra keyword arguments for csv.DictReader, such as delimiter.
+
+    Returns:
+        list: One dictionary per row.
+    """
+    return list(iter_csv_records(csv_content, infer_types, sample_size, **reader_options))
+
+
+@measure("format_converter.load_xml", size_arg=0)
+def load_xml(xml_content: str, **options) -> dict:
+    """
+    Loads XML content into a dictionary.
+
+    Args:
+        xml_content (str): The XML string to load.
+        **options: Extra keyword arguments for xmltodict.parse.
+
+    Returns:
+        dict: The parsed document.
+    """
+    return import_optional("xmltodict").parse(xml_content, **options)
+
+
+@contextmanager
+def open_text_source(source):
+    """
+    Opens a text source for streaming.
+
+    Args:
+        source: An os.PathLike path, a text file object, an iterable of lines, or the content
+                itself as a string. Strings are always content, never paths.
+
+    Yields:
+        iterable: An iterable of text lines.
+    """
+    if isinstance(source, os.PathLike):
+        with open(source, newline="", encoding="utf-8") as handle:
+            yield handle
+    elif isinstance(source, str):
+        yield StringIO(source, newline="")
+    else:
+        yield source
+
+
+def infer_column_types(rows: list, columns: list) -> dict:
+    """
+    Infers a JSON type for each column from a sample of rows.
+
+    Args:
+        rows (list): Sampled rows, as dictionaries.
+        columns (list): The column names.
+
+    Returns:
+        dict: The JSON Schema type name of each column.
+    """
+    return {column: infer_value_type([row.get(column) for row in rows]) for column in columns}
+
+
+def infer_value_type(values) -> str:
+    """
+    Infers the JSON type shared by a column's values.
+
+    A column is an integer, number or boolean column when every non-empty value parses as
+    one. Otherwise it is a string column, as is any column with a value that has a leading
+    zero, such as "02139", since converting it would drop the zero.
+
+    Args:
+        values (iterable): The raw values of the column.
+
+    Returns:
+        str: The JSON Schema type name.
+    """
+    values = [value for value in values if value]
+    if not values or any(LEADING_ZERO_PATTERN.match(value) for value in values):
+        return "string"
+    if all(INTEGER_PATTERN.fullmatch(value) for value in values):
+        return "integer"
+    if all(NUMBER_PATTERN.fullmatch(value) for value in values):
+        return "number"
+    if all(value.lower() in BOOLEAN_VALUES for value in values):
+        return "boolean"
+    return "string"
+
+
+def make_column_converter(column_type: str):
+    """
+    Builds the conversion applied to every value of a column.
+
+    Empty values of typed columns become None, and values that do not fit the inferred type
+    or have a leading zero are kept as strings.
+
+    Args:
+        column_type (str): The JSON Schema type name of the column.
+
+    Returns:
+        callable: A function converting one raw value.
+    """
+    if column_type == "string":
+        return None
+    parse = {
+        "integer": int,
+        "number": float,
+        "boolean": lambda value: BOOLEAN_VALUES[value.lower()],
+    }[column_type]
+
+    def convert(value):
+        if not value:
+            return None
+        if LEADING_ZERO_PATTERN.match(value):
+            return value
+        try:
+            return parse(value)
+        except (ValueError, KeyError):
+            return value
+
+    return convert
+
+
+def iter_csv_records(source, infer_types: bool = True, sample_size: int = 100, column_types: dict = None, **reader_options):
+    """
+    Streams CSV rows as dictionaries, converting typed columns.
+
+    Column types are inferred once from the first `sample_size` rows, so memory stays
+    constant regardless of the input size.
+
+    Args:
+        source: An os.PathLike path, a text file object, an iterable of lines, or the CSV
+            content as a string.
+        infer_types (bool): Whether to convert integer, number and boolean columns.
+        sample_size (int): The number of rows used to infer column types.
+        column_types (dict): Optional JSON Schema type name of each column, used instead
+            of inferring the types from the sample.
+        **reader_options: Extra options for csv.DictReader, such as delimiter.
+
+    Yields:
+        dict: Each row, keyed by column name.
+
+    Raises:
+        csv.Error: If the CSV content is malformed.
+    """
+    with open_text_source(source) as lines:
+        reader = csv.DictReader(lines, **reader_options)
+        if not infer_types:
+            yield from reader
+            return
+
+        sample = list(islice(reader, sample_size))
+        if column_types is None:
+            column_types = infer_column_types(sample, reader.fieldnames or [])
+        converters = [
+            (column, converter)
+            for column, converter in (
+                (column, make_column_converter(column_type))
+                for column, column_type in column_types.items()
+            )
+            if converter is not None
+        ]
+        for row in chain(sample, reader):
+            for column, converter in converters:
+                value = row.get(column)
+                if value is not None:
+                    row[column] = converter(value)
+            yield row
+
+
+def csv_to_jsonl(source, infer_types: bool = True, sample_size: int = 100, column_types: dict = None, **reader_options):
+    """
+    Streams CSV content as compact JSON Lines.
+
+    Args:
+        source: An os.PathLike path, a text file object, an iterable of lines, or the CSV
+            content as a string.
+        infer_types (bool): Whether to convert integer, number and boolean columns.
+        sample_size (int): The number of rows used to infer column types.
+        column_types (dict): Optional JSON Schema type name of each column.
+        **reader_options: Extra options for csv.DictReader.
+
+    Yields:
+        str: One compact JSON object per row, without a trailing newline.
+    """
+    encode = COMPACT_ENCODER.encode
+    for row in iter_csv_records(source, infer_types, sample_size, column_types, **reader_options):
+        yield encode(row)
+
+
+def iter_csv_batches(source, batch_size: int = 1000, infer_types: bool = True, sample_size: int = 100, **reader_options):
+    """
+    Streams CSV rows in lists of at most `batch_size` rows.
+
+    Args:
+        source: An os.PathLike path, a text file object, an iterable of lines, or the CSV
+            content as a string.
+        batch_size (int): The maximum number of rows per batch.
+        infer_types (bool): Whether to convert integer, number and boolean columns.
+        sample_size (int): The number of rows used to infer column types.
+        **reader_options: Extra options for csv.DictReader.
+
+    Yields:
+        list: Batches of row dictionaries.
+    """
+    records = iter_csv_records(source, infer_types, sample_size, **reader_options)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def element_to_value(element):
+    """
+    Converts an XML element into the value xmltodict.parse produces for it.
+
+    Attributes become "@name" keys, repeated children become lists and text becomes "#text"
+    when the element also has attributes or children. Namespaced tags keep ElementTree's
+    "{uri}tag" notation.
+
+    Args:
+        element (xml.etree.ElementTree.Element): The element to convert.
+
+    Returns:
+        The converted value: a dictionary, a string, or None for an empty element.
+    """
+    result = {"@" + name: value for name, value in element.attrib.items()}
+    text_parts = [element.text] if element.text else []
+    for child in element:
+        value = element_to_value(child)
+        if child.tag not in result:
+            result[child.tag] = value
+        elif isinstance(result[child.tag], list):
+            result[child.tag].append(value)
+        else:
+            result[child.tag] = [result[child.tag], value]
+        if child.tail:
+            text_parts.append(child.tail)
+
+    text = "".join(text_parts).strip()
+    if not result:
+        return text or None
+    if text:
+        result["#text"] = text
+    return result
+
+
+def iter_xml_records(source, item_depth: int = 2, path=None):
+    """
+    Streams the elements at a chosen depth or path of an XML document as dictionaries.
+
+    Each element is converted as soon as it is closed and then cleared from the tree, so
+    memory stays bounded by the largest record rather than the whole document.
+
+    Args:
+        source: An os.PathLike path, a binary or text file object, or the XML content as a
+            string or bytes. Strings and bytes are always content, never paths.
+        item_depth (int): The depth of the records, where 1 is the root element and 2 its
+            children. Ignored when `path` is given.
+        path: Optional tag path of the records, as "catalog/item" or a sequence of tags.
+
+    Yields:
+        The converted value of each record, as produced by xmltodict.parse.
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the XML is malformed.
+    """
+    if isinstance(path, str):
+        path = path.strip("/").split("/")
+    target = tuple(path) if path is not None else None
+    if isinstance(source, os.PathLike):
+        source = os.fspath(source)
+    elif isinstance(source, str):
+        source = StringIO(source)
+    elif isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+
+    tags = []
+    elements = []
+    from xml.etree import ElementTree
+
+    for event, element in ElementTree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            tags.append(element.tag)
+            elements.append(element)
+            continue
+
+        matched = tuple(tags) == target if target is not None else len(tags) == item_depth
+        tags.pop()
+        elements.pop()
+        if matched:
+            yield element_to_value(element)
+            if elements:
+                del elements[-1][:]  # Drop finished records from their parent
+            else:
+                element.clear()
+
+
+def xml_to_jsonl(source, item_depth: int = 2, path=None):
+    """
+    Streams the records of an XML document as compact JSON Lines.
+
+    Args:
+        source: An os.PathLike path, a binary or text file object, or the XML content.
+        item_depth (int): The depth of the records, where 1 is the root element.
+        path: Optional tag path of the records, as "catalog/item" or a sequence of tags.
+
+    Yields:
+        str: One compact JSON value per record, without a trailing newline.
+    """
+    encode = COMPACT_ENCODER.encode
+    for record in iter_xml_records(source, item_depth, path):
+        yield encode(record)
+
+
+class ColumnarTable:
+    """ A table stored column by column, with typed arrays for numeric columns. """
+    __slots__ = ("columns", "column_types", "row_count")
+
+    def __init__(self, columns: dict, column_types: dict, row_count: int):
+        """
+        Args:
+            columns (dict): The values of each column, keyed by column name.
+            column_types (dict): The JSON Schema type name of each column.
+            row_count (int): The number of rows.
+        """
+        self.columns = columns
+        self.column_types = column_types
+        self.row_count = row_count
+
+    def __len__(self):
+        return self.row_count
+
+    def __getitem__(self, column: str):
+        return self.columns[column]
+
+    def iter_records(self):
+        """
+        Lazily rebuilds the rows as dictionaries, reading the column storage in place.
+
+        Yields:
+            dict: Each row, keyed by column name.
+        """
+        names = list(self.columns)
+        columns = [column_values(column) for column in self.columns.values()]
+        for values in zip(*columns):
+            yield dict(zip(names, values))
+
+    def to_records(self) -> list:
+        """
+        Converts the table into a list of row dictionaries.
+
+        Returns:
+            list: One dictionary per row.
+        """
+        return list(self.iter_records())
+
+    def to_jsonl(self):
+        """
+        Streams the rows as compact JSON Lines.
+
+        Yields:
+            str: One compact JSON object per row, without a trailing newline.
+        """
+        encode = COMPACT_ENCODER.encode
+        for record in self.iter_records():
+            yield encode(record)
+
+
+def column_values(column):
+    """
+    Returns an iterable over the Python values of a column without copying it.
+
+    NumPy arrays iterate as NumPy scalars, which the JSON encoder rejects. Arrays that cover
+    a whole `array.array`, as built by csv_to_columns, are read through that array; other
+    arrays are converted one element at a time.
+
+    Args:
+        column: A list, an `array.array` or a one-dimensional NumPy array.
+
+    Returns:
+        iterable: The values of the column as Python objects.
+    """
+    if isinstance(column, (list, array)):
+        return column
+    base = column.base
+    if isinstance(base, array) and len(base) == len(column) and column.strides == (base.itemsize,):
+        return base
+    return map(column.item, range(len(column)))
+
+
+@measure("format_converter.csv_to_columns")
+def csv_to_columns(source, infer_types: bool = True, sample_size: int = 100, use_numpy=None, **reader_options) -> ColumnarTable:
+    """
+    Loads CSV content column by column.
+
+    Rows are read in batches that are transposed and appended to each column. Integer and
+    number columns are stored in `array.array` ("q" and "d") and exposed as NumPy arrays
+    over the same buffer when NumPy is used. String columns are interned lists, so repeated
+    values share one string object. Numeric columns that meet an empty or unparseable value,
+    or one with a leading zero, fall back to lists converted value by value, with None for
+    empty values.
+
+    Args:
+        source: An os.PathLike path, a text file object, an iterable of lines, or the CSV
+            content as a string.
+        infer_types (bool): Whether to convert integer, number and boolean columns.
+        sample_size (int): The number of values of each column used to infer its type.
+        use_numpy (bool): Whether to expose numeric columns as NumPy arrays. When None,
+            NumPy is used if it is installed.
+        **reader_options: Extra options for csv.reader, such as delimiter.
+
+    Returns:
+        ColumnarTable: The table.
+
+    Raises:
+        csv.Error: If the CSV content is malformed.
+        ImportError: If use_numpy is True and NumPy is not installed.
+    """
+    numpy = load_numpy(use_numpy)
+    with open_text_source(source) as lines:
+        reader = csv.reader(lines, **reader_options)
+        header = next(reader, [])
+        builders = None
+        row_count = 0
+        while True:
+            batch = list(islice(reader, max(COLUMN_BATCH_SIZE, sample_size)))
+            if not batch:
+                break
+            transposed = list(zip_longest(*batch, fillvalue=""))
+            missing = ("",) * len(batch)
+            columns = [transposed[index] if index < len(transposed) else missing for index in range(len(header))]
+            if builders is None:
+                builders = [
+                    ColumnBuilder(infer_value_type(values[:sample_size]) if infer_types else "string")
+                    for values in columns
+                ]
+            for builder, values in zip(builders, columns):
+                builder.extend(values)
+            row_count += len(batch)
+
+    if builders is None:
+        builders = [ColumnBuilder("string") for _ in header]
+    return ColumnarTable(
+        {name: builder.finish(numpy) for name, builder in zip(header, builders)},
+        {name: builder.column_type for name, builder in zip(header, builders)},
+        row_count,
+    )
+
+
+class ColumnBuilder:
+    """ Accumulates the values of one column in its storage type. """
+    __slots__ = ("column_type", "values")
+
+    TYPECODES = {"integer": "q", "number": "d"}
+    PARSERS = {"q": int, "d": float}
+
+    def __init__(self, column_type: str):
+        """
+        Args:
+            column_type (str): The JSON Schema type name of the column.
+        """
+        self.column_type = column_type
+        typecode = self.TYPECODES.get(column_type)
+        self.values = array(typecode) if typecode else []
+
+    def extend(self, values):
+        """
+        Converts and appends a batch of raw values.
+
+        Args:
+            values (sequence): The raw string values.
+        """
+        if isinstance(self.values, array):
+            typecode = self.values.typecode
+            if not any(map(LEADING_ZERO_PATTERN.match, values)):
+                try:
+                    self.values += array(typecode, map(self.PARSERS[typecode], values))
+                    return
+                except (ValueError, OverflowError):
+                    pass
+            self.values = self.values.tolist()
+        if self.column_type == "string":
+            self.values.extend(map(sys.intern, values))
+        else:
+            self.values.extend(map(make_column_converter(self.column_type), values))
+
+    def finish(self, numpy=None):
+        """
+        Returns the column storage.
+
+        Args:
+            numpy: The NumPy module to wrap numeric arrays with, or None.
+
+        Returns:
+            The column: an array for numeric columns, otherwise a list.
+        """
+        if numpy is not None and isinstance(self.values, array):
+            return numpy.frombuffer(self.values, dtype=numpy.int64 if self.values.typecode == "q" else numpy.float64)
+        return self.values
+
+
+def load_numpy(use_numpy=None):
+    """
+    Imports NumPy for columnar conversion.
+
+    Args:
+        use_numpy (bool): True to require NumPy, False to skip it, None to use it if installed.
+
+    Returns:
+        The NumPy module, or None.
+    """
+    if use_numpy is False:
+        return None
+    try:
+        import numpy
+    except ImportError:
+        if use_numpy:
+            raise
+        return None
+    return numpy
+
+
+def split_csv_ranges(path, chunk_size: int = CSV_CHUNK_SIZE, quotechar: str = '"', has_header: bool = True) -> tuple:
+    """
+    Splits a CSV file into byte ranges that start and end on record boundaries.
+
+    The file is pre-scanned once, counting quote characters. A newline ends a record only
+    when an even number of quotes precedes it, so newlines inside quoted values never split
+    a record. Doubled quotes inside values keep the parity unchanged. This only holds for
+    RFC 4180 quoting: with an escape character or QUOTE_NONE, quote parity does not track
+    record boundaries.
+
+    Args:
+        path: The path of the CSV file.
+        chunk_size (int): The approximate size of each range in bytes.
+        quotechar (str): The quote character of the CSV dialect.
+        has_header (bool): Whether the first record is a header. When False, the header is
+            empty and the ranges start at the beginning of the file.
+
+    Returns:
+        tuple: The header bytes and a list of (start, end) byte ranges covering the records.
+    """
+    quote = quotechar.encode("utf-8")
+    boundaries = [] if has_header else [0]
+    target = 0 if has_header else chunk_size  # The header ends at the first record boundary
+    quotes = 0
+    offset = 0
+    with open(path, "rb") as handle:
+        while True:
+            block = handle.read(SCAN_BLOCK_SIZE)
+            if not block:
+                break
+            position = max(target - offset, 0)
+            counted = 0
+            while position < len(block):
+                newline = block.find(b"\n", position)
+                if newline < 0:
+                    break
+                quotes += block.count(quote, counted, newline)
+                counted = newline
+                if quotes % 2 == 0:
+                    boundaries.append(offset + newline + 1)
+                    target = offset + newline + 1 + chunk_size
+                    position = target - offset
+                else:
+                    position = newline + 1
+            quotes += block.count(quote, counted)
+            offset += len(block)
+
+        if not boundaries:
+            return b"", []
+        handle.seek(0)
+        header = handle.read(boundaries[0])  # Empty without a header, as the first boundary is 0
+
+    if boundaries[-1] < offset:
+        boundaries.append(offset)
+    return header, list(zip(boundaries, boundaries[1:]))
+
+
+@measure("format_converter.parallel_csv_to_jsonl")
+def parallel_csv_to_jsonl(
+    path,
+    output,
+    chunk_size: int = CSV_CHUNK_SIZE,
+    executor=None,
+    workers: int = None,
+    infer_types: bool = True,
+    sample_size: int = 100,
+    **reader_options,
+) -> int:
+    """
+    Converts a large CSV file to JSON Lines on several processes.
+
+    The file is split into record-aligned byte ranges that workers convert independently.
+    Column types are inferred once from the start of the file so every range converts its
+    values the same way, and results are written in file order. At most two ranges per
+    worker are in flight, which bounds memory regardless of the file size. Dialects with an
+    escape character, QUOTE_NONE or without doubled quotes cannot be split safely, so their
+    files are converted as a single range. When `fieldnames` is given, the first line is
+    read as a record rather than a header.
+
+    Args:
+        path: The path of the CSV file, which must be UTF-8 encoded.
+        output: The output path or a writable text file object.
+        chunk_size (int): The approximate size of each range in bytes.
+        executor (Executor): Optional executor to run on. When omitted, a process pool with
+            `workers` processes is created for the call.
+        workers (int): The number of processes for the default process pool.
+        infer_types (bool): Whether to convert integer, number and boolean columns.
+        sample_size (int): The number of rows used to infer column types.
+        **reader_options: Extra options for csv.DictReader, such as delimiter or fieldnames.
+
+    Returns:
+        int: The number of records written.
+    """
+    dialect_options = {key: value for key, value in reader_options.items() if key not in DICT_READER_OPTIONS}
+    dialect = csv.reader((), **dialect_options).dialect
+    if dialect.escapechar is not None or dialect.quoting == csv.QUOTE_NONE or not dialect.doublequote:
+        header, ranges = b"", [(0, os.path.getsize(path))]
+    else:
+        has_header = reader_options.get("fieldnames") is None
+        header, ranges = split_csv_ranges(path, chunk_size, dialect.quotechar, has_header)
+    column_types = None
+    if infer_types:
+        with open(path, newline="", encoding="utf-8") as lines:
+            reader = csv.DictReader(lines, **reader_options)
+            column_types = infer_column_types(list(islice(reader, sample_size)), reader.fieldnames or [])
+    convert_range = partial(_convert_csv_range, os.fspath(path), header.decode("utf-8"), infer_types, column_types, reader_options)
+
+    with ExitStack() as stack:
+        if isinstance(output, (str, os.PathLike)):
+            output = stack.enter_context(open(output, "w", encoding="utf-8", newline="\n"))
+        if executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+        window = 2 * (workers or os.cpu_count() or 1)
+
+        record_count = 0
+        pending = deque()
+        for byte_range in ranges:
+            pending.append(executor.submit(convert_range, byte_range))
+            if len(pending) >= window:
+                record_count += _write_converted_range(output, pending.popleft().result())
+        while pending:
+            record_count += _write_converted_range(output, pending.popleft().result())
+    return record_count
+
+
+def _convert_csv_range(path, header, infer_types, column_types, reader_options, byte_range):
+    # Module-level so that process pools can pickle it
+    start, end = byte_range
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        content = header + handle.read(end - start).decode("utf-8")
+    lines = list(csv_to_jsonl(content, infer_types, column_types=column_types, **reader_options))
+    return len(lines), "".join(line + "\n" for line in lines)
+
+
+def _write_converted_range(output, converted):
+    record_count, text = converted
+    output.write(text)
+    return record_count
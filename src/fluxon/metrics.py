@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter_ns
+
+# Upper bounds of the latency histogram buckets, in nanoseconds
+LATENCY_BUCKETS_NS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000, 1_000_000_000, 10_000_000_000)
+
+
+class StageMetrics:
+    """ Call, error, byte and latency statistics of one instrumented stage. """
+    __slots__ = ("calls", "errors", "bytes", "latency_ns", "buckets")
+
+    def __init__(self, bucket_count: int):
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latency_ns = 0
+        self.buckets = [0] * (bucket_count + 1)  # The last bucket holds slower calls
+
+
+class MetricsRegistry:
+    """
+    Opt-in collector of per-stage counters and latency histograms.
+
+    Instrumented functions only check `enabled` while the registry is disabled, so the
+    instrumentation can stay in place in production.
+    """
+
+    def __init__(self, enabled: bool = False, buckets_ns: tuple = LATENCY_BUCKETS_NS):
+        """
+        Args:
+            enabled (bool): Whether to collect metrics from the start.
+            buckets_ns (tuple): Ascending upper bounds of the latency buckets, in nanoseconds.
+        """
+        self.enabled = enabled
+        self.buckets_ns = tuple(buckets_ns)
+        self.stages = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """
+        Discards everything collected so far.
+        """
+        with self.lock:
+            self.stages = {}
+            self.counters = {}
+
+    def record(self, stage: str, elapsed_ns: int, size: int = 0, error: bool = False):
+        """
+        Records one call of a stage.
+
+        Args:
+            stage (str): The stage name, such as "parser.parse_json_with_recovery".
+            elapsed_ns (int): The duration of the call in nanoseconds.
+            size (int): The number of input bytes processed by the call.
+            error (bool): Whether the call raised an exception.
+        """
+        bucket = bisect_left(self.buckets_ns, elapsed_ns)
+        with self.lock:
+            metrics = self.stages.get(stage)
+            if metrics is None:
+                metrics = self.stages[stage] = StageMetrics(len(self.buckets_ns))
+            metrics.calls += 1
+            metrics.errors += error
+            metrics.bytes += size
+            metrics.latency_ns += elapsed_ns
+            metrics.buckets[bucket] += 1
+
+    def count(self, name: str, value: int = 1):
+        """
+        Increments a named counter when the registry is enabled.
+
+        Args:
+            name (str): The counter name, such as "validator.invalid".
+            value (int): The amount to add.
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def measure(self, stage: str, size_arg: int = None, always: bool = False):
+        """
+        Decorates a function so that each call is recorded under a stage.
+
+        Args:
+            stage (str): The stage name.
+            size_arg (int): Optional position of the argument whose size is counted as the
+                input bytes of the call. Strings count their UTF-8 length and bytes their length.
+            always (bool): Whether to record calls even while the registry is disabled.
+
+        Returns:
+            callable: The decorator.
+        """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not (self.enabled or always):
+                    return func(*args, **kwargs)
+                start = perf_counter_ns()
+                error = True
+                try:
+                    result = func(*args, **kwargs)
+                    error = False
+                    return result
+                finally:
+                    size = payload_size(args[size_arg]) if size_arg is not None and size_arg < len(args) else 0
+                    self.record(stage, perf_counter_ns() - start, size, error)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> dict:
+        """
+        Copies the collected metrics into plain dictionaries.
+
+        Returns:
+            dict: "stages" maps each stage to its calls, errors, bytes, total latency and
+                  cumulative latency buckets keyed by upper bound in nanoseconds ("+Inf" last).
+                  "counters" maps each named counter to its value.
+        """
+        bounds = [str(bound) for bound in self.buckets_ns] + ["+Inf"]
+        with self.lock:
+            stages = {}
+            for stage, metrics in self.stages.items():
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(bounds, metrics.buckets):
+                    cumulative += count
+                    buckets[bound] = cumulative
+                stages[stage] = {
+                    "calls": metrics.calls,
+                    "errors": metrics.errors,
+                    "bytes": metrics.bytes,
+                    "latency_ns": metrics.latency_ns,
+                    "latency_buckets": buckets,
+                }
+            return {"stages": stages, "counters": dict(self.counters)}
+
+    def to_json(self) -> str:
+        """
+        Exports a snapshot as JSON.
+
+        Returns:
+            str: The snapshot as a JSON string.
+        """
+        return json.dumps(self.snapshot(), sort_keys=True)
+
+    def to_prometheus(self, prefix: str = "fluxon") -> str:
+        """
+        Exports a snapshot in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): The prefix of every metric name.
+
+        Returns:
+            str: The exposition text.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, kind in (("calls_total", "counter"), ("errors_total", "counter"), ("bytes_total", "counter")):
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            field = name[:-len("_total")]
+            for stage, metrics in snapshot["stages"].items():
+                lines.append(f'{prefix}_{name}{{stage="{stage}"}} {metrics[field]}')
+
+        lines.append(f"# TYPE {prefix}_latency_seconds histogram")
+        for stage, metrics in snapshot["stages"].items():
+            for bound, count in metrics["latency_buckets"].items():
+                upper = bound if bound == "+Inf" else repr(int(bound) / 1e9)
+                lines.append(f'{prefix}_latency_seconds_bucket{{stage="{stage}",le="{upper}"}} {count}')
+            lines.append(f'{prefix}_latency_seconds_sum{{stage="{stage}"}} {metrics["latency_ns"] / 1e9!r}')
+            lines.append(f'{prefix}_latency_seconds_count{{stage="{stage}"}} {metrics["calls"]}')
+
+        lines.append(f"# TYPE {prefix}_events_total counter")
+        for name, value in snapshot["counters"].items():
+            lines.append(f'{prefix}_events_total{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def payload_size(payload) -> int:
+    """
+    Measures the UTF-8 size of a payload without encoding ASCII strings.
+
+    Args:
+        payload: A string, bytes-like object or any other value.
+
+    Returns:
+        int: The size in bytes, or 0 for values without a size.
+    """
+    if isinstance(payload, str):
+        return len(payload) if payload.isascii() else len(payload.encode("utf-8", "surrogatepass"))
+    if isinstance(payload, (bytes, bytearray, memoryview)):
+        return len(payload)
+    return 0
+
+
+# Set FLUXON_METRICS=1 to collect metrics from import time
+metrics_registry = MetricsRegistry(enabled=os.environ.get("FLUXON_METRICS") == "1")
+
+
+def measure(stage: str, size_arg: int = None, always: bool = False):
+    """
+    Decorates a function so that its calls are recorded in the default registry.
+    See MetricsRegistry.measure.
+    """
+    return metrics_registry.measure(stage, size_arg, always)
+
+
+def count(name: str, value: int = 1):
+    """
+    Increments a named counter of the default registry. See MetricsRegistry.count.
+    """
+    metrics_registry.count(name, value)
+
+
+def enable_metrics():
+    metrics_registry.enable()
+
+
+def disable_metrics():
+    metrics_registry.disable()
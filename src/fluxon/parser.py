@@ -1,35 +1,69 @@
 import json
 import re
 from json import JSONDecodeError
-from fluxon.utils import normalize_json
+from fluxon.metrics import measure
+from fluxon.sanitizer import sanitize_json
+from fluxon.utils import Preview, get_logger, normalize_json
+from fluxon.structured_parsing.segment_scanner import get_segment_scanner, SegmentTypes
 
+logger = get_logger(__name__)
+
+# Unlabeled fences usually hold examples or commands rather than the answer
+EXTRACTION_FENCE_LANGUAGES = ("json", "jsonc", "json5")
+
+@measure("parser.parse_json_with_recovery", size_arg=0)
 def parse_json_with_recovery(json_str: str) -> dict:
     """
     Parses and recovers a JSON string, attempting to fix common errors.
 
+    Valid JSON is returned untouched. Otherwise the text is first sanitized, mapping
+    typographic quotes and unusual spaces outside string values and removing invisible and
+    control characters, before the slower repairs run.
+
     Args:
         json_str (str): The raw JSON string to parse.
 
     Returns:
         dict: The parsed JSON object, or an empty dictionary if parsing fails.
     """
+    try:
+        return recover_json(json_str)
+    except JSONDecodeError as final_error:
+        logger.warning("Final parsing failed: %s; input: %s", final_error, Preview(final_error.doc))
+        return {}
+
+def recover_json(json_str: str):
+    """
+    Parses and recovers a JSON string like parse_json_with_recovery, but raises when the
+    repairs fail instead of returning an empty dictionary.
+
+    Args:
+        json_str (str): The raw JSON string to parse.
+
+    Returns:
+        The parsed JSON value.
+
+    Raises:
+        JSONDecodeError: If the text cannot be recovered, for the repaired text.
+    """
     try:
         # First attempt: Try parsing the JSON directly
         return json.loads(json_str)
     except JSONDecodeError as e:
-        print(f"Initial parsing failed: {e}")
-        # Step 1: Remove any extraneous content (non-JSON)
-        json_str = clean_raw_json(json_str)
-        # Step 2: Fix common errors
-        json_str = fix_common_json_errors(json_str)
-
-        # Final attempt to parse
+        logger.debug("Initial parsing failed: %s", e)
+    # Step 1: Normalize quotes and drop invisible characters in one pass
+    sanitized = sanitize_json(json_str)
+    if sanitized != json_str:
         try:
-            output = json.loads(json_str)
-            return output
-        except JSONDecodeError as final_error:
-            print(f"Final parsing failed: {final_error}")
-            return {}
+            return json.loads(sanitized)
+        except JSONDecodeError:
+            json_str = sanitized
+    # Step 2: Remove any extraneous content (non-JSON)
+    json_str = clean_raw_json(json_str)
+    # Step 3: Fix common errors
+    json_str = fix_common_json_errors(json_str)
+    # Final attempt to parse
+    return json.loads(json_str)
 
 def trim_to_json(input_text: str) -> str:
     """
@@ -154,9 +188,13 @@ def fix_common_json_errors(json_str: str) -> str:
 
 
 
+@measure("parser.extract_json_from_text", size_arg=0)
 def extract_json_from_text(input_text: str, start_tag: str = "BEGIN_JSON", end_tag: str = "END_JSON") -> str:
     """
-    Extracts JSON content delimited by start and end tags.
+    Extracts JSON content delimited by start and end tags or by a Markdown ```json code fence.
+
+    Tags take precedence over fences, so example code blocks before the tagged answer are
+    ignored. Fences only count when they are labeled as JSON.
 
     Args:
         input_text (str): The LLM-generated text containing JSON.
@@ -164,22 +202,24 @@ def extract_json_from_text(input_text: str, start_tag: str = "BEGIN_JSON", end_t
         end_tag (str): The end tag indicating the end of JSON.
 
     Returns:
-        str: Extracted JSON string or an empty string if no valid JSON is found.
-    """
-    if start_tag not in input_text and end_tag not in input_text:
-        return input_text # No JSON tags found, return the original text
-    elif start_tag not in input_text:
-        end_pos = input_text.index(end_tag)
-        return input_text[:end_pos].strip()
-    elif end_tag not in input_text:
-        start_pos = input_text.index(start_tag) + len(start_tag)
-        return input_text[start_pos:].strip()
-    
-
-    match = re.search(fr"{start_tag}(.*?){end_tag}", input_text, re.DOTALL)
-    if match:
-        return match.group(1).strip()
-    return ""
+        str: The content of the first complete tagged segment, else of the first tagged
+             segment missing a tag, else of the first JSON fence, or the original text if no
+             delimiters are found.
+    """
+    scanner = get_segment_scanner(((start_tag, end_tag),), braces=False, fence_languages=EXTRACTION_FENCE_LANGUAGES)
+    tagged = fenced = None
+    for segment in scanner.iter_segments(input_text):
+        if segment.segment_type == SegmentTypes.TAGGED:
+            if segment.complete:
+                return segment.text(input_text)
+            if tagged is None:
+                tagged = segment
+        elif segment.segment_type == SegmentTypes.FENCED and fenced is None:
+            fenced = segment
+    fallback = tagged or fenced
+    if fallback is not None:
+        return fallback.text(input_text)
+    return input_text # No JSON delimiters found, return the original text
 
 def remove_comments(json_text: str) -> str:
     """
@@ -197,6 +237,7 @@ def remove_comments(json_text: str) -> str:
     json_text = re.sub(r'/\*.*?\*/', '', json_text, flags=re.DOTALL)
     return json_text
 
+@measure("parser.clean_raw_json", size_arg=0)
 def clean_raw_json(input_text: str) -> str:
     """
     Cleans LLM output by extracting JSON content and removing comments.
@@ -1,3 +1,22 @@
+import json
+
+PROMPT_SUFFIX = "\n\nOutput the JSON object between the tags:\n{start_tag}\n{schema}\n{end_tag}"
+
+# Schema renderings from the most readable to the smallest
+SCHEMA_MODES = ("pretty", "sorted", "compact", "minified")
+
+# Keywords that only document the schema and can be dropped from minified prompts
+DESCRIPTIVE_KEYWORDS = frozenset({"title", "description", "examples", "$comment", "$schema", "$id"})
+
+# Keywords whose values map names to subschemas, so their keys are never keywords themselves
+SCHEMA_MAP_KEYWORDS = frozenset({"properties", "patternProperties", "$defs", "definitions", "dependentSchemas"})
+
+# Keywords whose values are literal data rather than subschemas
+LITERAL_KEYWORDS = frozenset({"enum", "const", "required", "default"})
+
+CHARS_PER_TOKEN = 4
+
+
 def format_prompt(base_prompt: str, schema: dict, start_tag: str = "BEGIN_JSON", end_tag: str = "END_JSON") -> str:
     """
     Formats a prompt by appending a JSON schema-like description with start and end tags.
@@ -11,12 +30,115 @@ def format_prompt(base_prompt: str, schema: dict, start_tag: str = "BEGIN_JSON",
     Returns:
         str: A formatted prompt with the schema and tags.
     """
-    import json
-    schema_str = json.dumps(schema, indent=2)
-    return (
-        f"{base_prompt}\n\n"
-        f"Output the JSON object between the tags:\n"
-        f"{start_tag}\n"
-        f"{schema_str}\n"
-        f"{end_tag}"
-    )
+    return PromptTemplate(schema, start_tag, end_tag, mode="pretty").format(base_prompt)
+
+
+class PromptTemplate:
+    """ A prompt suffix with its schema serialized once, for formatting many prompts. """
+
+    def __init__(self, schema: dict, start_tag: str = "BEGIN_JSON", end_tag: str = "END_JSON", mode: str = "sorted", max_tokens: int = None):
+        """
+        Args:
+            schema (dict): A dictionary representing the JSON schema.
+            start_tag (str): The start tag for JSON output.
+            end_tag (str): The end tag for JSON output.
+            mode (str): The schema rendering, one of SCHEMA_MODES. Every mode but "pretty"
+                sorts keys, so equal schemas always produce byte-identical prompts.
+            max_tokens (int): Optional token budget for the schema. When the rendering in
+                `mode` exceeds it, the next smaller mode that fits is used.
+        """
+        self.schema_text = render_schema(schema, mode, max_tokens)
+        self.suffix = PROMPT_SUFFIX.format(start_tag=start_tag, schema=self.schema_text, end_tag=end_tag)
+
+    def format(self, base_prompt: str) -> str:
+        """
+        Formats a prompt with the precompiled schema and tags.
+
+        Args:
+            base_prompt (str): The initial instruction for the LLM.
+
+        Returns:
+            str: A formatted prompt with the schema and tags.
+        """
+        return base_prompt + self.suffix
+
+    @property
+    def schema_tokens(self) -> int:
+        """
+        The estimated token count of the rendered schema.
+        """
+        return estimate_tokens(self.schema_text)
+
+
+def render_schema(schema: dict, mode: str = "sorted", max_tokens: int = None) -> str:
+    """
+    Serializes a schema for a prompt.
+
+    Args:
+        schema (dict): The schema to serialize.
+        mode (str): "pretty" keeps the schema's key order with two-space indentation,
+            "sorted" also sorts keys, "compact" sorts keys without whitespace and "minified"
+            additionally drops descriptive keywords such as descriptions and titles.
+        max_tokens (int): Optional token budget. When the rendering exceeds it, the following
+            modes are tried in order.
+
+    Returns:
+        str: The serialized schema.
+
+    Raises:
+        ValueError: If the mode is unknown or even the minified schema exceeds the budget.
+    """
+    if mode not in SCHEMA_MODES:
+        raise ValueError(f"Unknown schema mode: {mode}")
+    for candidate in SCHEMA_MODES[SCHEMA_MODES.index(mode):]:
+        if candidate == "pretty":
+            text = json.dumps(schema, indent=2)
+        elif candidate == "sorted":
+            text = json.dumps(schema, indent=2, sort_keys=True)
+        elif candidate == "compact":
+            text = json.dumps(schema, separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+        else:
+            text = json.dumps(strip_descriptions(schema), separators=(",", ":"), sort_keys=True, ensure_ascii=False)
+        if max_tokens is None or estimate_tokens(text) <= max_tokens:
+            return text
+    raise ValueError(f"Schema needs about {estimate_tokens(text)} tokens, over the budget of {max_tokens}")
+
+
+def strip_descriptions(schema):
+    """
+    Removes descriptive keywords from a schema without touching property names.
+
+    Args:
+        schema: The schema or subschema.
+
+    Returns:
+        A copy of the schema without titles, descriptions, examples and comments.
+    """
+    if isinstance(schema, list):
+        return [strip_descriptions(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    stripped = {}
+    for key, value in schema.items():
+        if key in DESCRIPTIVE_KEYWORDS:
+            continue
+        if key in SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+            stripped[key] = {name: strip_descriptions(subschema) for name, subschema in value.items()}
+        elif key in LITERAL_KEYWORDS:
+            stripped[key] = value
+        else:
+            stripped[key] = strip_descriptions(value)
+    return stripped
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the token count of a text with the common four-characters-per-token rule.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
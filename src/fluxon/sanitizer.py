@@ -0,0 +1,129 @@
+import re
+
+# Typographic quotes LLMs emit in place of JSON quotes
+QUOTE_TRANSLATIONS = {
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u201f": '"', "\u2033": '"', "\uff02": '"',
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u201b": "'", "\u2032": "'", "\uff07": "'",
+}
+
+# Spaces that json.loads does not accept as whitespace
+SPACE_TRANSLATIONS = {
+    **{chr(code): " " for code in range(0x2000, 0x200B)},
+    "\u00a0": " ", "\u202f": " ", "\u205f": " ", "\u3000": " ",
+    "\u2028": "\n", "\u2029": "\n",
+}
+
+# Zero-width, bidirectional and other format characters with no visible effect
+INVISIBLE_CHARACTERS = "\ufeff\u00ad\u061c\u180e" + "".join(
+    chr(code)
+    for start, end in ((0x200B, 0x2010), (0x202A, 0x202F), (0x2060, 0x2065), (0x2066, 0x206A))
+    for code in range(start, end)
+)
+
+# C0 and C1 control characters other than tab, newline and carriage return
+CONTROL_CHARACTERS = "".join(
+    chr(code) for code in (*range(0x00, 0x20), *range(0x7F, 0xA0)) if chr(code) not in "\t\n\r"
+)
+ASCII_CONTROL_CODES = frozenset(ord(character) for character in CONTROL_CHARACTERS if character < "\x80")
+ASCII_CONTROL_PATTERN = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+
+# A JSON string literal delimited by ASCII quotes
+STRING_LITERAL_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+class Sanitizer:
+    """ Normalizes quotes, spaces and invisible characters in one str.translate pass. """
+
+    def __init__(self, quotes: bool = True, spaces: bool = True, invisible: bool = True, controls: bool = True, extra: dict = None):
+        """
+        Args:
+            quotes (bool): Whether to map typographic quotes to ASCII quotes.
+            spaces (bool): Whether to map Unicode spaces to ASCII spaces and line separators
+                to newlines.
+            invisible (bool): Whether to remove zero-width, bidirectional and other format
+                characters, including byte order marks.
+            controls (bool): Whether to remove control characters other than tab, newline and
+                carriage return.
+            extra (dict): Optional additional mapping of characters to replacements, where
+                an empty string or None removes the character.
+        """
+        mapping = {}
+        if quotes:
+            mapping.update(QUOTE_TRANSLATIONS)
+        if spaces:
+            mapping.update(SPACE_TRANSLATIONS)
+        if invisible:
+            mapping.update(dict.fromkeys(INVISIBLE_CHARACTERS))
+        if controls:
+            mapping.update(dict.fromkeys(CONTROL_CHARACTERS))
+        if extra:
+            mapping.update(extra)
+        self.table = str.maketrans(mapping)
+        ascii_keys = {key for key in self.table if key < 0x80}
+        self.ascii_controls_only = ascii_keys <= ASCII_CONTROL_CODES
+        # Finding nothing to translate with a regex is much faster than translating
+        self.pattern = re.compile("[" + "".join(re.escape(chr(key)) for key in sorted(self.table)) + "]") if self.table else None
+
+    def sanitize(self, text: str) -> str:
+        """
+        Sanitizes a text.
+
+        Unless extra mappings cover ASCII characters, ASCII text can only change through its
+        control characters, so it is checked with a narrower search. Text with nothing to
+        translate is returned as is.
+
+        Args:
+            text (str): The text to sanitize.
+
+        Returns:
+            str: The sanitized text.
+        """
+        if text.isascii() and self.ascii_controls_only:
+            if ASCII_CONTROL_PATTERN.search(text) is None:
+                return text
+        elif self.pattern is None or self.pattern.search(text) is None:
+            return text
+        return text.translate(self.table)
+
+
+default_sanitizer = Sanitizer()
+literal_sanitizer = Sanitizer(quotes=False, spaces=False)
+
+
+def sanitize_text(text: str) -> str:
+    """
+    Sanitizes a text with the default settings. See Sanitizer.sanitize.
+
+    Args:
+        text (str): The text to sanitize.
+
+    Returns:
+        str: The sanitized text.
+    """
+    return default_sanitizer.sanitize(text)
+
+
+def sanitize_json(text: str) -> str:
+    """
+    Sanitizes JSON text without mapping the quotes and spaces inside its string literals.
+
+    Typographic quotes and unusual spaces are only translated outside strings delimited by
+    ASCII quotes, where they break the JSON syntax. Inside strings they are content and kept
+    as is; invisible and control characters are removed everywhere.
+
+    Args:
+        text (str): The JSON text to sanitize.
+
+    Returns:
+        str: The sanitized text.
+    """
+    if default_sanitizer.sanitize(text) is text:
+        return text
+    pieces = []
+    pos = 0
+    for match in STRING_LITERAL_PATTERN.finditer(text):
+        pieces.append(default_sanitizer.sanitize(text[pos:match.start()]))
+        pieces.append(literal_sanitizer.sanitize(match.group(0)))
+        pos = match.end()
+    pieces.append(default_sanitizer.sanitize(text[pos:]))
+    return "".join(pieces)
@@ -0,0 +1,377 @@
+import copy
+import json
+from json import JSONDecodeError
+from fluxon.parser import parse_json_with_recovery
+from fluxon.validator import (
+    IMMUTABLE_TYPES,
+    SchemaCache,
+    coerce_value,
+    compile_repair_plan,
+    generate_schema,
+    get_validator,
+    schema_key,
+)
+
+# Keywords with no effect on validation
+ANNOTATION_KEYWORDS = frozenset({
+    "title", "description", "default", "examples", "format", "$schema", "$id", "$comment",
+    "readOnly", "writeOnly", "deprecated", "$defs", "definitions",
+})
+
+# Keywords the generated checks implement; any other keyword falls back to jsonschema
+SUPPORTED_KEYWORDS = ANNOTATION_KEYWORDS | {
+    "$ref", "type", "enum", "const", "properties", "required", "additionalProperties", "items",
+    "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum", "minLength", "maxLength",
+    "minItems", "maxItems", "minProperties", "maxProperties", "anyOf", "oneOf", "allOf",
+}
+
+TYPE_EXPRESSIONS = {
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "string": "isinstance({v}, str)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "integer": "(isinstance({v}, int) and not isinstance({v}, bool) or isinstance({v}, float) and {v}.is_integer())",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+}
+
+NUMBER_EXPRESSION = TYPE_EXPRESSIONS["number"]
+
+
+class UnsupportedSchemaError(Exception):
+    """ Raised while generating checks for a schema the generator cannot specialize. """
+
+
+class SchemaParser:
+    """ A generated parse-and-validate function specialized for one schema. """
+
+    def __init__(self, schema: dict, function, source: str, specialized_validation: bool):
+        self.schema = schema
+        self.function = function
+        self.source = source
+        self.specialized_validation = specialized_validation
+
+    def __call__(self, json_str: str) -> tuple:
+        """
+        Parses, repairs and validates raw JSON text.
+
+        Args:
+            json_str (str): The raw JSON string to parse.
+
+        Returns:
+            tuple: (json_obj, is_valid), identical to fluxon.validator.parse_and_validate.
+        """
+        return self.function(json_str)
+
+
+class SchemaCodeGenerator:
+    """ Generates the Python source of a SchemaParser. """
+
+    def __init__(self, schema: dict):
+        self.schema = schema
+        self.definitions = {**schema.get("definitions", {}), **schema.get("$defs", {})}
+        self.constants = []
+        self.functions = []
+        self.counter = 0
+
+    def generate(self) -> tuple:
+        """
+        Generates the module source for the schema.
+
+        Returns:
+            tuple: (source, constants, specialized_validation)
+        """
+        lines = [
+            "def parse(json_str):",
+            "    try:",
+            "        v0 = _loads(json_str)",
+            "    except _JSONDecodeError:",
+            "        v0 = _recover(json_str)",
+        ]
+        self.emit_repair(compile_repair_plan(self.schema), "v0", lines, 1, frozenset())
+
+        try:
+            check_name = self.emit_function(self.schema, frozenset())
+            specialized_validation = True
+        except UnsupportedSchemaError:
+            self.functions = []
+            check_name = f"{self.constant(get_validator(self.schema))}.is_valid"
+            specialized_validation = False
+
+        lines.append(f"    return v0, {check_name}(v0)")
+        source = "\n\n".join(["\n".join(function) for function in self.functions] + ["\n".join(lines)]) + "\n"
+        return source, self.constants, specialized_validation
+
+    def constant(self, value) -> str:
+        self.constants.append(value)
+        return f"_c[{len(self.constants) - 1}]"
+
+    def variable(self) -> str:
+        self.counter += 1
+        return f"v{self.counter}"
+
+    @staticmethod
+    def has_work(plan) -> bool:
+        return bool(
+            plan.types is not None or plan.properties or plan.defaults or plan.drop_additional
+            or plan.additional is not None or plan.items is not None
+        )
+
+    def emit_repair(self, plan, var: str, lines: list, indent: int, active: frozenset):
+        """
+        Emits the statements of RepairPlan.apply for one plan, unrolled for its keys and types.
+        """
+        pad = "    " * indent
+        if id(plan) in active:
+            lines.append(f"{pad}{var} = {self.constant(plan)}.apply({var})")  # Recursive schema
+            return
+        active = active | {id(plan)}
+
+        if plan.types is not None:
+            check = " or ".join(TYPE_EXPRESSIONS[json_type].format(v=var) for json_type in plan.types)
+            lines.append(f"{pad}if not ({check}):")
+            lines.append(f"{pad}    {var} = _coerce({var}, {self.constant(plan.types)})")
+
+        keyword = "if"
+        if plan.properties or plan.defaults or plan.drop_additional or plan.additional is not None:
+            lines.append(f"{pad}if isinstance({var}, dict):")
+            body_start = len(lines)
+            body = pad + "    "
+            if plan.drop_additional or plan.additional is not None:
+                key = self.variable()
+                declared = self.constant(frozenset(plan.properties))
+                lines.append(f"{body}for {key} in [{key} for {key} in {var} if {key} not in {declared}]:")
+                if plan.drop_additional:
+                    lines.append(f"{body}    del {var}[{key}]")
+                else:
+                    item = self.variable()
+                    lines.append(f"{body}    {item} = {var}[{key}]")
+                    self.emit_repair(plan.additional, item, lines, indent + 2, active)
+                    lines.append(f"{body}    {var}[{key}] = {item}")
+            for key, sub_plan in plan.properties.items():
+                if not self.has_work(sub_plan):
+                    continue
+                item = self.variable()
+                lines.append(f"{body}if {key!r} in {var}:")
+                lines.append(f"{body}    {item} = {var}[{key!r}]")
+                self.emit_repair(sub_plan, item, lines, indent + 2, active)
+                lines.append(f"{body}    {var}[{key!r}] = {item}")
+            for key, default in plan.defaults:
+                value = self.constant(default)
+                if not isinstance(default, IMMUTABLE_TYPES):
+                    value = f"_deepcopy({value})"
+                lines.append(f"{body}if {key!r} not in {var}:")
+                lines.append(f"{body}    {var}[{key!r}] = {value}")
+            if len(lines) == body_start:
+                lines.append(f"{body}pass")
+            keyword = "elif"
+
+        if plan.items is not None and self.has_work(plan.items):
+            index = self.variable()
+            item = self.variable()
+            lines.append(f"{pad}{keyword} isinstance({var}, list):")
+            lines.append(f"{pad}    for {index}, {item} in enumerate({var}):")
+            self.emit_repair(plan.items, item, lines, indent + 2, active)
+            lines.append(f"{pad}        {var}[{index}] = {item}")
+
+    def emit_function(self, node, active_refs: frozenset) -> str:
+        """
+        Emits a check function for a schema node and returns its name.
+        """
+        name = f"_check_{len(self.functions)}"
+        function = [f"def {name}(v0):"]
+        self.functions.append(function)
+        self.emit_check(node, "v0", function, 1, active_refs)
+        function.append("    return True")
+        return name
+
+    def emit_check(self, node, var: str, lines: list, indent: int, active_refs: frozenset):
+        """
+        Emits statements that return False when the value does not match the schema node.
+        """
+        pad = "    " * indent
+        if node is True or node == {}:
+            return
+        if node is False:
+            lines.append(f"{pad}return False")
+            return
+        if not isinstance(node, dict) or not SUPPORTED_KEYWORDS.issuperset(node):
+            raise UnsupportedSchemaError(node)
+
+        if "$ref" in node:
+            name = node["$ref"].rsplit("/", 1)[-1]
+            if not node["$ref"].startswith("#/") or name not in self.definitions or name in active_refs:
+                raise UnsupportedSchemaError(node)  # External or recursive reference
+            if not ANNOTATION_KEYWORDS.issuperset(set(node) - {"$ref"}):
+                raise UnsupportedSchemaError(node)  # Sibling semantics differ between drafts
+            self.emit_check(self.definitions[name], var, lines, indent, active_refs | {name})
+            return
+
+        if "type" in node:
+            types = (node["type"],) if isinstance(node["type"], str) else tuple(node["type"])
+            check = " or ".join(TYPE_EXPRESSIONS[json_type].format(v=var) for json_type in types)
+            lines.append(f"{pad}if not ({check}):")
+            lines.append(f"{pad}    return False")
+
+        if "enum" in node:
+            lines.append(f"{pad}if not any(_json_equal({var}, option) for option in {self.constant(node['enum'])}):")
+            lines.append(f"{pad}    return False")
+        if "const" in node:
+            lines.append(f"{pad}if not _json_equal({var}, {self.constant(node['const'])}):")
+            lines.append(f"{pad}    return False")
+
+        bounds = [
+            ("minimum", "<"), ("maximum", ">"), ("exclusiveMinimum", "<="), ("exclusiveMaximum", ">="),
+        ]
+        for keyword, operator in bounds:
+            if keyword in node:
+                if isinstance(node[keyword], bool):
+                    raise UnsupportedSchemaError(node)  # Draft 4 boolean exclusive bounds
+                lines.append(f"{pad}if {NUMBER_EXPRESSION.format(v=var)} and {var} {operator} {self.constant(node[keyword])}:")
+                lines.append(f"{pad}    return False")
+
+        self.emit_size_checks(node, var, lines, pad, "string", "minLength", "maxLength")
+        self.emit_size_checks(node, var, lines, pad, "array", "minItems", "maxItems")
+        self.emit_size_checks(node, var, lines, pad, "object", "minProperties", "maxProperties")
+
+        if "properties" in node or "required" in node or "additionalProperties" in node:
+            lines.append(f"{pad}if isinstance({var}, dict):")
+            body_start = len(lines)
+            body = pad + "    "
+            properties = node.get("properties", {})
+            if node.get("required"):
+                lines.append(f"{body}if not {var}.keys() >= {self.constant(frozenset(node['required']))}:")
+                lines.append(f"{body}    return False")
+            for key, sub_node in properties.items():
+                item = self.variable()
+                sub_lines = []
+                self.emit_check(sub_node, item, sub_lines, indent + 2, active_refs)
+                if sub_lines:
+                    lines.append(f"{body}if {key!r} in {var}:")
+                    lines.append(f"{body}    {item} = {var}[{key!r}]")
+                    lines.extend(sub_lines)
+            additional = node.get("additionalProperties", True)
+            declared = self.constant(frozenset(properties))
+            if additional is False:
+                lines.append(f"{body}if not {var}.keys() <= {declared}:")
+                lines.append(f"{body}    return False")
+            elif additional is not True:
+                key = self.variable()
+                item = self.variable()
+                sub_lines = []
+                self.emit_check(additional, item, sub_lines, indent + 3, active_refs)
+                if sub_lines:
+                    lines.append(f"{body}for {key}, {item} in {var}.items():")
+                    lines.append(f"{body}    if {key} not in {declared}:")
+                    lines.extend(sub_lines)
+            if len(lines) == body_start:
+                lines.pop()
+
+        if "items" in node:
+            if not isinstance(node["items"], (dict, bool)):
+                raise UnsupportedSchemaError(node)  # Tuple validation
+            item = self.variable()
+            sub_lines = []
+            self.emit_check(node["items"], item, sub_lines, indent + 2, active_refs)
+            if sub_lines:
+                lines.append(f"{pad}if isinstance({var}, list):")
+                lines.append(f"{pad}    for {item} in {var}:")
+                lines.extend(sub_lines)
+
+        for branch in node.get("allOf", []):
+            self.emit_check(branch, var, lines, indent, active_refs)
+        if "anyOf" in node:
+            names = [self.emit_function(branch, active_refs) for branch in node["anyOf"]]
+            lines.append(f"{pad}if not ({' or '.join(f'{name}({var})' for name in names)}):")
+            lines.append(f"{pad}    return False")
+        if "oneOf" in node:
+            names = [self.emit_function(branch, active_refs) for branch in node["oneOf"]]
+            lines.append(f"{pad}if ({' + '.join(f'{name}({var})' for name in names)}) != 1:")
+            lines.append(f"{pad}    return False")
+
+    def emit_size_checks(self, node, var, lines, pad, json_type, minimum_keyword, maximum_keyword):
+        for keyword, operator in ((minimum_keyword, "<"), (maximum_keyword, ">")):
+            if keyword in node:
+                lines.append(f"{pad}if {TYPE_EXPRESSIONS[json_type].format(v=var)} and len({var}) {operator} {int(node[keyword])}:")
+                lines.append(f"{pad}    return False")
+
+
+class SchemaParserCache(SchemaCache):
+    """ Caches generated schema parsers. """
+
+    def compile(self, schema: dict) -> SchemaParser:
+        source, constants, specialized_validation = SchemaCodeGenerator(schema).generate()
+        namespace = {
+            "_c": constants,
+            "_loads": json.loads,
+            "_JSONDecodeError": JSONDecodeError,
+            "_recover": parse_json_with_recovery,
+            "_coerce": coerce_types,
+            "_deepcopy": copy.deepcopy,
+            "_json_equal": json_equal,
+        }
+        exec(compile(source, f"<fluxon schema parser {schema_key(schema)}>", "exec"), namespace)
+        return SchemaParser(schema, namespace["parse"], source, specialized_validation)
+
+
+schema_parser_cache = SchemaParserCache()
+
+
+def compile_schema_parser(schema) -> SchemaParser:
+    """
+    Returns a parse-and-validate function specialized for a schema, generating it on first use.
+
+    The generated function produces the same (json_obj, is_valid) result as
+    fluxon.validator.parse_and_validate. Expected keys, types, defaults and required fields
+    are unrolled into straight-line code. Schemas that use keywords the generator does not
+    implement keep the specialized repair and fall back to the cached jsonschema validator.
+
+    Args:
+        schema: The JSON Schema dictionary or a Pydantic model class.
+
+    Returns:
+        SchemaParser: The cached specialized parser.
+    """
+    if not isinstance(schema, dict):
+        schema = generate_schema(schema)
+    return schema_parser_cache.get(schema)
+
+
+def coerce_types(value, types: tuple):
+    """
+    Applies the first unambiguous conversion to one of the given JSON types.
+
+    Args:
+        value: The value to convert.
+        types (tuple): The allowed JSON Schema types, in order.
+
+    Returns:
+        The converted value, or the original value if no conversion applies.
+    """
+    for json_type in types:
+        converted, value = coerce_value(value, json_type)
+        if converted:
+            break
+    return value
+
+
+def json_equal(left, right) -> bool:
+    """
+    Compares two JSON values the way JSON Schema does, keeping booleans distinct from numbers.
+
+    Args:
+        left: The first value.
+        right: The second value.
+
+    Returns:
+        bool: True if the values are equal.
+    """
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool) and left == right
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(json_equal(left[key], right[key]) for key in left)
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(map(json_equal, left, right))
+    if isinstance(left, (dict, list)) or isinstance(right, (dict, list)):
+        return False
+    return left == right
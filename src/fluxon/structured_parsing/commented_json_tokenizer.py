@@ -1,21 +1,33 @@
+import re
 from fluxon.structured_parsing.exceptions import UnExpectedCharacterError, MalformedJsonError
+from fluxon.utils import Preview, get_logger
+
+logger = get_logger(__name__)
+
+# Strings, comments and brackets: everything a balanced skip needs to look at.
+SKIP_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|//[^\n]*|/\*.*?\*/|[\[\]{}]', re.DOTALL)
+STRING_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
 
 class CommentedJsonTokenizer:
-    """ Tokenizes and renders JSON-like content. """
-    def __init__(self):
-        self.tokens = []
+    """
+    Tokenizes and renders JSON-like content.
+
+    The tokenizer keeps no per-call state, so a single instance can be shared between threads.
+    """
 
-    def tokenize(self, input_text: str) -> list:
+    def tokenize(self, input_text: str, projection=None) -> list:
         """
         Tokenizes the input JSON-like content using a stack-based approach.
 
         Args:
             input_text (str): The input JSON content.
+            projection (Projection): Optional projection of keys to keep. Values of other
+                keys are skipped with a balanced scan instead of being tokenized.
 
         Returns:
             list: A list of tokens with their types.
         """
-        self.tokens = []
+        tokens = []
         input_text = input_text.strip()
         if input_text.startswith("{"):
             input_text = input_text[1:]
@@ -30,8 +42,13 @@ class CommentedJsonTokenizer:
             # Start of a key-value pair
             if char == '"':
                 key, i = self.extract_key(input_text, i)
-                value, comment, value_type, i = self.extract_value_and_comment(input_text, i)
-                self.tokens.append({
+                if projection is not None and key not in projection:
+                    i = self.skip_value(input_text, i)
+                    continue
+                value, comment, value_type, i = self.extract_value_and_comment(
+                    input_text, i, projection.child(key) if projection is not None else None
+                )
+                tokens.append({
                     "type": "key_value",
                     "key": key,
                     "value": value,
@@ -42,7 +59,7 @@ class CommentedJsonTokenizer:
             # Inline comment
             elif input_text[i:i+2] == "//":
                 comment, i = self.extract_inline_comment(input_text, i)
-                self.tokens.append({
+                tokens.append({
                     "type": "inline_comment",
                     "value": comment,
                     "value_type": "comment"
@@ -51,7 +68,7 @@ class CommentedJsonTokenizer:
             # Block comment
             elif input_text[i:i+2] == "/*":
                 comment, i = self.extract_block_comment(input_text, i)
-                self.tokens.append({
+                tokens.append({
                     "type": "block_comment",
                     "value": comment,
                     "value_type": "comment"
@@ -66,7 +83,7 @@ class CommentedJsonTokenizer:
 
                 raise UnExpectedCharacterError(f"Unexpected character at position {i}: {char}")
 
-        return self.tokens
+        return tokens
 
     def extract_key(self, input_text: str, start: int) -> tuple:
         """
@@ -104,13 +121,14 @@ class CommentedJsonTokenizer:
             i += 1
         return i
 
-    def extract_value_and_comment(self, input_text: str, start: int) -> tuple:
+    def extract_value_and_comment(self, input_text: str, start: int, projection=None) -> tuple:
         """
         Extracts a value and its associated comment (if any).
 
         Args:
             input_text (str): The input JSON content.
             start (int): The starting position of the value.
+            projection (Projection): Optional projection applied to nested objects.
 
         Returns:
             tuple: (value, comment, value_type, new_position)
@@ -126,14 +144,13 @@ class CommentedJsonTokenizer:
         # Nested object
         if char == '{':
             nested_object, i = self.extract_nested_structure(input_text, i, '{', '}')
-            nested_tokenizer = CommentedJsonTokenizer()
-            value = nested_tokenizer.tokenize(nested_object[1:-1])  # Strip outer braces
+            value = self.tokenize(nested_object[1:-1], projection)  # Strip outer braces
             value_type = "object"
 
         # Array
         elif char == '[':
             array_content, i = self.extract_nested_structure(input_text, i, '[', ']')
-            value = self.parse_array(array_content[1:-1])  # Strip outer brackets
+            value = self.parse_array(array_content[1:-1], projection)  # Strip outer brackets
             value_type = "array"
 
         # String
@@ -167,6 +184,57 @@ class CommentedJsonTokenizer:
 
         return value, comment, value_type, i
 
+    def skip_value(self, input_text: str, start: int, skip_comment: bool = True) -> int:
+        """
+        Skips a value without tokenizing it, along with its trailing comma and inline comment.
+
+        Objects and arrays are skipped with a balanced scan that only inspects strings,
+        comments and brackets.
+
+        Args:
+            input_text (str): The input JSON content.
+            start (int): The starting position of the value.
+            skip_comment (bool): Whether to also skip the inline comment after the value.
+
+        Returns:
+            int: The position after the skipped value.
+        """
+        i = self.look_ahead_remove_whitespace(input_text, start)
+        n = len(input_text)
+        if i >= n:
+            raise MalformedJsonError("Missing value at end of input")
+        char = input_text[i]
+
+        if char in "{[":
+            depth = 0
+            for match in SKIP_PATTERN.finditer(input_text, i):
+                token = match.group(0)
+                if token in "{[":
+                    depth += 1
+                elif token in "}]":
+                    depth -= 1
+                    if depth == 0:
+                        i = match.end()
+                        break
+            else:
+                raise MalformedJsonError("Unmatched braces or brackets in skipped value")
+        elif char == '"':
+            match = STRING_PATTERN.match(input_text, i)
+            if match is None:
+                raise ValueError("Unterminated string value")
+            i = match.end()
+        else:
+            while i < n and input_text[i] not in ",}] \t\n":
+                i += 1
+
+        i = self.look_ahead_remove_whitespace(input_text, i)
+        if i < n and input_text[i] == ",":
+            i += 1
+        i = self.look_ahead_remove_whitespace(input_text, i)
+        if skip_comment and input_text[i:i+2] == "//":
+            _, i = self.extract_inline_comment(input_text, i)
+        return i
+
     def extract_nested_structure(self, input_text: str, start: int, open_char: str, close_char: str) -> tuple:
         """
         Extracts a nested structure (object or array) using a stack.
@@ -190,9 +258,7 @@ class CommentedJsonTokenizer:
             i += 1
 
         if stack:
-            print("stack", stack)
-            print("i", i)
-            print("input_text", input_text)
+            logger.debug("Unclosed %s at position %d, %d still open in %s", open_char, start, len(stack), Preview(input_text))
             raise MalformedJsonError("Unmatched braces or brackets in nested structure")
         return input_text[start:i], i
 
@@ -230,18 +296,18 @@ class CommentedJsonTokenizer:
         comment = input_text[start + 2:end].strip()
         return comment, end + 2
 
-    def parse_array(self, array_content: str) -> list:
+    def parse_array(self, array_content: str, projection=None) -> list:
         """
         Parses an array value.
 
         Args:
             array_content (str): The content of the array.
+            projection (Projection): Optional projection applied to objects in the array.
 
         Returns:
             list: A list of parsed array elements.
         """
         elements = []
-        tokenizer = CommentedJsonTokenizer()
         i = 0
         n = len(array_content)
 
@@ -251,7 +317,7 @@ class CommentedJsonTokenizer:
                 nested_object, i = self.extract_nested_structure(array_content, i, '{', '}')
                 elements.append({
                     "type": "nested_object",
-                    "value": tokenizer.tokenize(nested_object[1:-1]),
+                    "value": self.tokenize(nested_object[1:-1], projection),
                     "value_type": "object"
                 })
             elif char == '"':
@@ -276,6 +342,39 @@ class CommentedJsonTokenizer:
         return elements
     
 
+    def to_python(self, tokens: list) -> dict:
+        """
+        Converts tokenized JSON content into plain Python objects, dropping comments.
+
+        Args:
+            tokens (list): The tokenized JSON content.
+
+        Returns:
+            dict: The equivalent dictionary.
+        """
+        return {
+            token["key"]: self.value_to_python(token["value"], token["value_type"])
+            for token in tokens
+            if token["type"] == "key_value"
+        }
+
+    def value_to_python(self, value, value_type):
+        """
+        Converts a tokenized value into a plain Python object.
+
+        Args:
+            value: The tokenized value.
+            value_type (str): The type of the value.
+
+        Returns:
+            The equivalent Python object.
+        """
+        if value_type == "object":
+            return self.to_python(value)
+        if value_type == "array":
+            return [self.value_to_python(element["value"], element["value_type"]) for element in value]
+        return value
+
     def render(self, tokens=None, indent=2, level=0, compact=False) -> str:
         """
         Renders the tokenized JSON content into a formatted string.
@@ -291,7 +390,7 @@ class CommentedJsonTokenizer:
             str: The rendered JSON content.
         """
         if tokens is None:
-            tokens = self.tokens
+            raise ValueError("No tokens to render; pass the result of tokenize")
 
         output = "{\n"
         for token in tokens:
@@ -1,5 +1,6 @@
 import re
 from enum import Enum
+from fluxon.metrics import measure
 from fluxon.structured_parsing.exceptions import UnRecognizedInputFormatError, MalformedJsonError
 
 
@@ -14,14 +15,125 @@ class CommentedJsonPart:
         self.value = value
 
 
+class BraceScanner:
+    """ Resumable scanner that finds the end of a JSON object, skipping strings and comments. """
+    CODE, STRING, LINE_COMMENT, BLOCK_COMMENT = range(4)
+
+    CODE_PATTERN = re.compile(r'[{}"/]')
+    MEMBER_CODE_PATTERN = re.compile(r'[{}\[\]",/]')
+    STRING_PATTERN = re.compile(r'["\\]')
+
+    def __init__(self, track_members: bool = False):
+        """
+        Args:
+            track_members (bool): Whether to record where each top-level member after the first
+                begins, in `member_starts`. A member begins at the opening quote of a key that
+                follows a top-level comma.
+        """
+        self.track_members = track_members
+        self.code_pattern = self.MEMBER_CODE_PATTERN if track_members else self.CODE_PATTERN
+        self.reset()
+
+    def reset(self):
+        """
+        Resets the scanner so it can scan a new object.
+        """
+        self.depth = 0
+        self.mode = self.CODE
+        self.brackets = 0
+        self.after_comma = False
+        self.member_starts = []
+
+    def scan(self, input_text: str, start: int) -> tuple:
+        """
+        Scans forward from a position, carrying depth and string/comment state between calls.
+
+        Args:
+            input_text (str): The text being scanned.
+            start (int): The position to resume scanning from.
+
+        Returns:
+            tuple: (object_end, resume_position) where object_end is the position after the
+                   closing brace, or None if the object is still open. When the text ends on a
+                   character whose meaning depends on the next one, resume_position points at it.
+        """
+        pos = start
+        n = len(input_text)
+        while pos < n:
+            if self.mode == self.CODE:
+                match = self.code_pattern.search(input_text, pos)
+                if match is None:
+                    return None, n
+                char = match.group(0)
+                pos = match.end()
+                if char == '{':
+                    self.depth += 1
+                elif char == '}':
+                    self.depth -= 1
+                    if self.depth == 0:
+                        return pos, pos
+                elif char == '"':
+                    if self.after_comma and self.depth == 1 and self.brackets == 0:
+                        self.member_starts.append(match.start())
+                        self.after_comma = False
+                    self.mode = self.STRING
+                elif char == '[':
+                    self.brackets += 1
+                elif char == ']':
+                    self.brackets -= 1
+                elif char == ',':
+                    if self.depth == 1 and self.brackets == 0:
+                        self.after_comma = True
+                elif pos == n:
+                    return None, pos - 1  # A lone '/' may start a comment
+                elif input_text[pos] == '/':
+                    self.mode = self.LINE_COMMENT
+                    pos += 1
+                elif input_text[pos] == '*':
+                    self.mode = self.BLOCK_COMMENT
+                    pos += 1
+
+            elif self.mode == self.STRING:
+                match = self.STRING_PATTERN.search(input_text, pos)
+                if match is None:
+                    return None, n
+                pos = match.end()
+                if match.group(0) == '"':
+                    self.mode = self.CODE
+                elif pos == n:
+                    return None, pos - 1  # The escaped character has not arrived yet
+                else:
+                    pos += 1
+
+            elif self.mode == self.LINE_COMMENT:
+                end = input_text.find('\n', pos)
+                if end == -1:
+                    return None, n
+                pos = end + 1
+                self.mode = self.CODE
+
+            else:
+                end = input_text.find('*/', pos)
+                if end == -1:
+                    return None, max(pos, n - 1)  # Keep a trailing '*' for the next call
+                pos = end + 2
+                self.mode = self.CODE
+
+        return None, pos
+
+
 class ContentTokenizer:
-    """ Tokenizes mixed content containing free text and JSON objects. """
+    """
+    Tokenizes mixed content containing free text and JSON objects.
+
+    The tokenizer keeps no per-call state, so a single instance can be shared between threads.
+    """
     TOKEN_PATTERNS = {
         "free_text": r'[^{}]+',  # Matches free text (avoids overlapping with JSON objects)
     }
 
-    def __init__(self):
-        self.tokens = []
+    BRACE_PATTERN = re.compile(r'[{}]')
+    WHITESPACE_PATTERN = re.compile(r'\s*')
 
     def extract_nested_json(self, input_text: str):
         """
@@ -34,21 +146,60 @@ class ContentTokenizer:
             tuple: A tuple (json_object, remaining_text) where json_object is the matched JSON
                    and remaining_text is the text after the JSON object.
         """
-        stack = []
-        json_start = None
+        json_start = input_text.find('{')
+        if json_start == -1:
+            return None, input_text
+
+        json_end, _ = BraceScanner().scan(input_text, json_start)
+        if json_end is None:
+            return None, input_text  # No valid JSON found
+        return input_text[json_start:json_end], input_text[json_end:]
+
+    def iter_spans(self, input_text: str):
+        """
+        Walks the input once and yields free text and JSON object segments as spans.
 
-        for i, char in enumerate(input_text):
+        Args:
+            input_text (str): The input containing mixed content.
+
+        Yields:
+            tuple: (part_type, start, end) for each segment, where free text spans exclude
+                   surrounding whitespace.
+        """
+        scanner = BraceScanner()
+        pos = 0
+        n = len(input_text)
+
+        while True:
+            pos = self.WHITESPACE_PATTERN.match(input_text, pos).end()
+            if pos >= n:
+                return
+
+            char = input_text[pos]
+
+            # Extract JSON object if it starts with '{'
             if char == '{':
-                if not stack:
-                    json_start = i  # Mark the start of the JSON object
-                stack.append(char)
-            elif char == '}':
-                stack.pop()
-                if not stack:  # Found the matching closing brace
-                    return input_text[json_start:i + 1], input_text[i + 1:]
+                scanner.reset()
+                json_end, _ = scanner.scan(input_text, pos)
+                if json_end is None:
+                    raise MalformedJsonError("Malformed JSON detected")
+                yield CommentedJsonPartTypes.JSON_OBJECT, pos, json_end
+                pos = json_end
 
-        return None, input_text  # No valid JSON found
+            # Extract free text
+            elif char != '}':
+                match = self.BRACE_PATTERN.search(input_text, pos)
+                text_end = match.start() if match else n
+                end = text_end
+                while input_text[end - 1].isspace():
+                    end -= 1
+                yield CommentedJsonPartTypes.FREE_TEXT, pos, end
+                pos = text_end
+
+            else:
+                raise UnRecognizedInputFormatError(f"Unrecognized input: {input_text[pos:pos + 30]}")
 
+    @measure("content_tokenizer.tokenize", size_arg=1)
     def tokenize(self, input_text: str) -> list:
         """
         Tokenizes the input text into free text and JSON objects.
@@ -59,26 +210,119 @@ class ContentTokenizer:
         Returns:
             list: A list of tokens with their types.
         """
-        self.tokens = []
+        return [
+            {"type": part_type, "value": input_text[start:end]}
+            for part_type, start, end in self.iter_spans(input_text)
+        ]
 
-        while input_text:
-            input_text = input_text.strip()
 
-            # Extract JSON object if it starts with '{'
-            if input_text.startswith('{'):
-                json_object, input_text = self.extract_nested_json(input_text)
-                if json_object:
-                    self.tokens.append({"type": CommentedJsonPartTypes.JSON_OBJECT, "value": json_object})
-                else:
-                    raise MalformedJsonError("Malformed JSON detected")
+class StreamingContentTokenizer:
+    """ Tokenizes mixed content that arrives in chunks, emitting each part once it is complete. """
+    track_members = False
+
+    def __init__(self):
+        self.scanner = BraceScanner(track_members=self.track_members)
+        self.reset()
+
+    def reset(self):
+        """
+        Discards any buffered input so the tokenizer can be reused for a new stream.
+        """
+        self.scanner.reset()
+        self.pending = []  # Pieces of the current free text or open JSON object
+        self.carry = ""  # Unscanned tail whose meaning depends on the next chunk
+        self.in_object = False
+
+    @measure("content_tokenizer.feed", size_arg=1)
+    def feed(self, chunk: str) -> list:
+        """
+        Consumes the next chunk of the stream.
+
+        Only the currently open free text or JSON object is buffered, so memory is bounded by
+        the largest single part rather than by the whole stream.
+
+        Args:
+            chunk (str): The next piece of the input.
+
+        Returns:
+            list: The tokens completed by this chunk, in the same format as ContentTokenizer.tokenize.
+        """
+        return self._consume(chunk)
+
+    def close(self) -> list:
+        """
+        Signals the end of the stream and returns the remaining tokens.
+
+        Returns:
+            list: The tokens completed by the end of the stream.
+        """
+        if self.in_object:
+            self.reset()
+            raise MalformedJsonError("Malformed JSON detected")
+        tokens = []
+        self._flush_free_text(tokens)
+        self.reset()
+        return tokens
+
+    def tokenize_stream(self, chunks):
+        """
+        Tokenizes an iterable of chunks.
+
+        Args:
+            chunks (iterable): The chunks of the input, in order.
+
+        Yields:
+            dict: Each token as soon as it is complete.
+        """
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+
+    def _consume(self, chunk: str) -> list:
+        output = []
+        text = self.carry + chunk
+        self.carry = ""
+        pos = 0
+        n = len(text)
+
+        while pos < n:
+            if self.in_object:
+                object_end, resume, pos = self._scan_object(text, pos, output)
+                if object_end is None:
+                    self.pending.append(text[pos:resume])
+                    self.carry = text[resume:]
+                    break
+                self.pending.append(text[pos:object_end])
+                self._flush_object(output)
+                self.in_object = False
+                pos = object_end
 
-            # Extract free text
             else:
-                match = re.match(self.TOKEN_PATTERNS["free_text"], input_text)
-                if match:
-                    self.tokens.append({"type": CommentedJsonPartTypes.FREE_TEXT, "value": match.group(0).strip()})
-                    input_text = input_text[match.end():]
-                else:
-                    raise UnRecognizedInputFormatError(f"Unrecognized input: {input_text[:30]}")
+                match = ContentTokenizer.BRACE_PATTERN.search(text, pos)
+                if match is None:
+                    self.pending.append(text[pos:])
+                    break
+                if match.group(0) == '}':
+                    raise UnRecognizedInputFormatError(f"Unrecognized input: {text[match.start():match.start() + 30]}")
+                self.pending.append(text[pos:match.start()])
+                self._flush_free_text(output)
+                self.scanner.reset()
+                self.in_object = True
+                pos = match.start()
+
+        return output
+
+    def _scan_object(self, text: str, pos: int, output: list) -> tuple:
+        # Returns (object_end, resume_position, position of the first unbuffered character)
+        object_end, resume = self.scanner.scan(text, pos)
+        return object_end, resume, pos
+
+    def _flush_object(self, output: list):
+        output.append({"type": CommentedJsonPartTypes.JSON_OBJECT, "value": "".join(self.pending)})
+        self.pending = []
 
-        return self.tokens
+    def _flush_free_text(self, output: list):
+        value = "".join(self.pending).strip()
+        self.pending = []
+        if value:
+            output.append({"type": CommentedJsonPartTypes.FREE_TEXT, "value": value})
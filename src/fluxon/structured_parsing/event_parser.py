@@ -0,0 +1,187 @@
+import json
+import re
+from json import JSONDecodeError
+from fluxon.metrics import measure
+from fluxon.structured_parsing.commented_json_tokenizer import CommentedJsonTokenizer
+from fluxon.structured_parsing.exceptions import UnExpectedCharacterError, MalformedJsonError
+
+# Sentinels a visitor callback may return
+STOP = "stop"  # End parsing immediately
+SKIP = "skip"  # From on_key, on_object_start or on_array_start: skip the value without reporting it
+
+EVENT_PATTERN = re.compile(r'''
+    [\s,:]+
+    |(?P<open>[{\[])
+    |(?P<close>[}\]])
+    |"(?P<string>(?:[^"\\]|\\.)*)"
+    |//(?P<line_comment>[^\n]*)
+    |/\*(?P<block_comment>.*?)\*/
+    |(?P<primitive>[^\s,:{}\[\]"/]+)
+''', re.VERBOSE | re.DOTALL)
+
+PRIMITIVES = {"true": True, "false": False, "null": None}
+COLON_PATTERN = re.compile(r'\s*:?')
+
+
+class CommentedJsonVisitor:
+    """
+    Base class for event-driven consumers of commented JSON.
+
+    Override only the callbacks you need. Any callback may return STOP to end parsing early,
+    and on_key, on_object_start and on_array_start may return SKIP to jump over the value
+    without building it.
+    """
+
+    def on_object_start(self):
+        pass
+
+    def on_object_end(self):
+        pass
+
+    def on_array_start(self):
+        pass
+
+    def on_array_end(self):
+        pass
+
+    def on_key(self, key: str):
+        pass
+
+    def on_value(self, value, value_type: str):
+        pass
+
+    def on_comment(self, comment: str, comment_type: str):
+        pass
+
+
+class CallbackVisitor(CommentedJsonVisitor):
+    """ A visitor built from keyword callbacks, such as CallbackVisitor(on_key=print). """
+
+    def __init__(self, **callbacks):
+        for name, callback in callbacks.items():
+            if not hasattr(CommentedJsonVisitor, name):
+                raise TypeError(f"Unknown visitor callback: {name}")
+            setattr(self, name, callback)
+
+
+class CommentedJsonEventParser:
+    """
+    Parses commented JSON into a stream of visitor callbacks instead of a token tree.
+
+    The parser keeps no per-call state, so a single instance can be shared between threads.
+    """
+
+    def __init__(self):
+        self.skipper = CommentedJsonTokenizer()
+
+    @measure("event_parser.parse", size_arg=1)
+    def parse(self, input_text: str, visitor: CommentedJsonVisitor) -> bool:
+        """
+        Walks the input and reports each structural element to the visitor.
+
+        Args:
+            input_text (str): The commented JSON content.
+            visitor (CommentedJsonVisitor): The consumer of the events.
+
+        Returns:
+            bool: True if the whole input was parsed, False if the visitor stopped early.
+        """
+        stack = []  # True for objects, False for arrays
+        expect_key = False
+        pos = 0
+        n = len(input_text)
+
+        while pos < n:
+            match = EVENT_PATTERN.match(input_text, pos)
+            if match is None:
+                raise UnExpectedCharacterError(f"Unexpected character at position {pos}: {input_text[pos]}")
+            kind = match.lastgroup
+            pos = match.end()
+
+            if kind is None:
+                continue
+
+            if kind == "line_comment":
+                result = visitor.on_comment(match.group(kind).strip(), "inline")
+            elif kind == "block_comment":
+                result = visitor.on_comment(match.group(kind).strip(), "block")
+
+            elif kind == "open":
+                is_object = match.group(kind) == "{"
+                result = visitor.on_object_start() if is_object else visitor.on_array_start()
+                if result == SKIP:
+                    pos = self.skipper.skip_value(input_text, match.start(), skip_comment=False)
+                    expect_key = bool(stack) and stack[-1]
+                    continue
+                stack.append(is_object)
+                expect_key = is_object
+
+            elif kind == "close":
+                if not stack or stack[-1] != (match.group(kind) == "}"):
+                    raise MalformedJsonError(f"Unmatched {match.group(kind)} at position {match.start()}")
+                is_object = stack.pop()
+                result = visitor.on_object_end() if is_object else visitor.on_array_end()
+                expect_key = bool(stack) and stack[-1]
+
+            elif kind == "string" and expect_key:
+                result = visitor.on_key(decode_string(match.group(kind)))
+                expect_key = False
+                if result == SKIP:
+                    pos = COLON_PATTERN.match(input_text, pos).end()
+                    pos = self.skipper.skip_value(input_text, pos, skip_comment=False)
+                    expect_key = True
+                    continue
+
+            else:
+                if kind == "string":
+                    result = visitor.on_value(decode_string(match.group(kind)), "string")
+                else:
+                    result = visitor.on_value(parse_primitive(match.group(kind)), "primitive")
+                expect_key = bool(stack) and stack[-1]
+
+            if result == STOP:
+                return False
+
+        if stack:
+            raise MalformedJsonError("Unmatched braces or brackets")
+        return True
+
+
+def decode_string(raw: str) -> str:
+    """
+    Decodes the escape sequences in the body of a JSON string.
+
+    Args:
+        raw (str): The characters between the quotes.
+
+    Returns:
+        str: The decoded string.
+    """
+    if "\\" not in raw:
+        return raw
+    try:
+        return json.loads(f'"{raw}"', strict=False)
+    except JSONDecodeError:
+        raise UnExpectedCharacterError(f"Invalid escape sequence in string: {raw}") from None
+
+
+def parse_primitive(raw: str):
+    """
+    Converts a bare JSON literal into a Python value.
+
+    Args:
+        raw (str): The literal, such as a number, true, false or null.
+
+    Returns:
+        The Python value.
+    """
+    if raw in PRIMITIVES:
+        return PRIMITIVES[raw]
+    try:
+        return int(raw)
+    except ValueError:
+        pass
+    try:
+        return float(raw)
+    except ValueError:
+        raise UnExpectedCharacterError(f"Invalid primitive value: {raw}")
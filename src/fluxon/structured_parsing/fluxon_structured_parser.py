@@ -1,39 +1,138 @@
+import heapq
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import partial
+from fluxon.metrics import measure
 from fluxon.structured_parsing.commented_json_tokenizer import CommentedJsonTokenizer
 from fluxon.structured_parsing.content_tokenizer import ContentTokenizer, CommentedJsonPartTypes, CommentedJsonPart
+from fluxon.structured_parsing.exceptions import MalformedJsonError
+from fluxon.structured_parsing.projection import build_projection
+from fluxon.structured_parsing.result_set import ParsedObject, ParsedResultSet
+from fluxon.structured_parsing.segment_scanner import SegmentTypes
 
 
     
 
 class FluxonStructuredParser:
-    def __init__(self):
+    def __init__(self, segment_scanner=None):
+        """
+        Args:
+            segment_scanner (SegmentScanner): Optional scanner used to split the input on tags and
+                code fences before tokenizing. Delimited content is tokenized without its delimiters.
+        """
         self.content_tokenizer = ContentTokenizer()
         self.commented_json_tokenizer = CommentedJsonTokenizer()
+        self.segment_scanner = segment_scanner
 
-    def parse(self, input_text: str):
+    @measure("structured_parser.parse", size_arg=1)
+    def parse(self, input_text: str, projection=None):
         """
         Parses the given input text, tokenizing both outer free text and inner JSON objects.
 
         Args:
             input_text (str): The text containing free text and embedded JSON objects.
+            projection: Optional keys to keep in each JSON object, given as a list of dotted
+                paths, a JSON Schema dictionary, a Pydantic model class or a Projection.
+                Unrequested subtrees are skipped instead of being tokenized.
 
         Returns:
             list: A list of parsed segments, including free text and detailed JSON objects.
         """
+        projection = build_projection(projection)
         parsed_output = []
-        outer_tokens = self.content_tokenizer.tokenize(input_text)
-
-        for token in outer_tokens:
+        for token in self.tokenize_outer(input_text):
             if token["type"] == CommentedJsonPartTypes.FREE_TEXT:
                 parsed_output.append({"type":  CommentedJsonPartTypes.FREE_TEXT, "value": token["value"]})
             elif token["type"] == CommentedJsonPartTypes.JSON_OBJECT:
                 # Pass the JSON object value to InnerTokenizer for detailed parsing
-                inner_tokens = self.commented_json_tokenizer.tokenize(token["value"])
+                inner_tokens = self.commented_json_tokenizer.tokenize(token["value"], projection)
                 parsed_output.append({"type": CommentedJsonPartTypes.JSON_OBJECT, "value": inner_tokens})
             
 
         return parsed_output
     
+    @measure("structured_parser.parse_result_set", size_arg=1)
+    def parse_result_set(self, input_text: str, projection=None, schema: dict = None) -> ParsedResultSet:
+        """
+        Parses the given input text into a result set of its JSON objects.
+
+        Args:
+            input_text (str): The text containing free text and embedded JSON objects.
+            projection: Optional projection, as accepted by parse.
+            schema (dict): Optional JSON Schema each object is checked against.
+
+        Returns:
+            ParsedResultSet: The JSON objects with their precomputed metadata.
+        """
+        projection = build_projection(projection)
+        objects = []
+        for token in self.tokenize_outer(input_text):
+            if token["type"] == CommentedJsonPartTypes.JSON_OBJECT:
+                inner_tokens = self.commented_json_tokenizer.tokenize(token["value"], projection)
+                objects.append(ParsedObject(len(objects), inner_tokens, len(token["value"].encode("utf-8")), schema))
+        return ParsedResultSet(objects)
+
+    def parse_batch(self, texts, projection=None, executor=None, workers=None, chunksize=16) -> list:
+        """
+        Parses many texts concurrently.
+
+        The parser keeps no per-call state, so the same instance is shared by every worker.
+        Thread pools scale on free-threaded CPython builds; on standard builds pass a
+        ProcessPoolExecutor to spread the work across cores.
+
+        Args:
+            texts (iterable): The texts to parse.
+            projection: Optional projection applied to every text, as accepted by parse.
+            executor (Executor): Optional executor to run on. When omitted, a thread pool with
+                `workers` threads is created for the call.
+            workers (int): The number of threads for the default thread pool.
+            chunksize (int): The number of texts sent to a process worker at a time.
+
+        Returns:
+            list: The parsed output of each text, in input order.
+        """
+        parse_one = partial(_parse_text, self, build_projection(projection))
+        if executor is not None:
+            return list(executor.map(parse_one, texts, chunksize=chunksize))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(parse_one, texts))
+
+    def tokenize_outer(self, input_text: str) -> list:
+        """
+        Splits the input into free text and JSON object tokens.
+
+        Args:
+            input_text (str): The text containing free text and embedded JSON objects.
+
+        Returns:
+            list: A list of outer tokens.
+        """
+        if self.segment_scanner is None:
+            return self.content_tokenizer.tokenize(input_text)
+        return self.tokenize_segments(input_text)
+
+    def tokenize_segments(self, input_text: str) -> list:
+        """
+        Splits the input with the segment scanner and tokenizes the delimited content.
+
+        Args:
+            input_text (str): The text containing free text and delimited JSON.
+
+        Returns:
+            list: A list of outer tokens in the same format as ContentTokenizer.tokenize.
+        """
+        outer_tokens = []
+        for segment in self.segment_scanner.iter_segments(input_text):
+            if segment.segment_type == SegmentTypes.FREE_TEXT:
+                outer_tokens.append({"type": CommentedJsonPartTypes.FREE_TEXT, "value": segment.text(input_text)})
+            elif segment.segment_type == SegmentTypes.JSON_OBJECT:
+                if not segment.complete:
+                    raise MalformedJsonError("Malformed JSON detected")
+                outer_tokens.append({"type": CommentedJsonPartTypes.JSON_OBJECT, "value": segment.text(input_text)})
+            else:
+                outer_tokens.extend(self.content_tokenizer.tokenize(segment.text(input_text)))
+        return outer_tokens
+
     def render(self, parsed_output, compact=False):
         """
         Renders the parsed output into a string.
@@ -78,16 +177,26 @@ class FluxonStructuredParser:
 
         Args:
             parsed_output (list): The parsed output from the parse method.
+            num_objects (int): Optional number of objects to keep after sorting.
+            ascending (bool): Whether to sort from the fewest to the most keys.
 
         Returns:
             list: A list of JSON objects sorted by the number of keys.
         """
-        json_objects = self.get_json_objects(parsed_output, num_objects)
-        return sorted(json_objects, key=lambda x: len(x), reverse=not ascending)[:num_objects]
+        json_objects = self.get_json_objects(parsed_output)
+        if num_objects is None:
+            return sorted(json_objects, key=len, reverse=not ascending)
+        if ascending:
+            return heapq.nsmallest(num_objects, json_objects, key=len)
+        return heapq.nlargest(num_objects, json_objects, key=len)
     
 
 
 
+def _parse_text(parser, projection, input_text):
+    # Module-level so that process pools can pickle it
+    return parser.parse(input_text, projection)
+
 
 if __name__ == "__main__":
     input_text = """
@@ -0,0 +1,122 @@
+from enum import Enum
+from fluxon.metrics import measure
+from fluxon.structured_parsing.commented_json_tokenizer import CommentedJsonTokenizer
+from fluxon.structured_parsing.content_tokenizer import CommentedJsonPartTypes, StreamingContentTokenizer
+from fluxon.structured_parsing.projection import build_projection
+
+
+class IncrementalEventTypes(Enum):
+    SEGMENT = "segment"
+    TOKEN = "token"
+
+
+class IncrementalStructuredParser(StreamingContentTokenizer):
+    """
+    Parses streamed text chunk by chunk, producing the same output as FluxonStructuredParser.parse.
+
+    Each byte is scanned once. Top-level members of an open JSON object are tokenized as soon
+    as the next member starts, and the finished object is assembled from those tokens.
+    """
+    track_members = True
+
+    def __init__(self, projection=None):
+        """
+        Args:
+            projection: Optional projection, as accepted by FluxonStructuredParser.parse.
+        """
+        self.projection = build_projection(projection)
+        self.commented_json_tokenizer = CommentedJsonTokenizer()
+        super().__init__()
+
+    def reset(self):
+        """
+        Discards all state so the parser can be reused for a new stream.
+        """
+        super().reset()
+        self.object_tokens = []
+        self.closed = False
+        self.parsed_output = []
+
+    @property
+    def partial_object(self) -> list:
+        """
+        The tokens of the members completed so far in the currently open JSON object.
+        """
+        return list(self.object_tokens)
+
+    @measure("incremental_parser.feed", size_arg=1)
+    def feed(self, chunk: str) -> list:
+        """
+        Consumes the next chunk of the stream.
+
+        Args:
+            chunk (str): The next piece of the input.
+
+        Returns:
+            list: Events completed by this chunk. Each event is a dictionary whose "type" is an
+                  IncrementalEventTypes member. TOKEN events carry a token of the open JSON
+                  object; SEGMENT events carry a finished segment in the format of
+                  FluxonStructuredParser.parse.
+        """
+        if self.closed:
+            self.reset()
+        return self._consume(chunk)
+
+    def close(self) -> list:
+        """
+        Signals the end of the stream and discards the buffered input. `parsed_output` keeps
+        the segments of the stream until the parser is fed again or reset.
+
+        Returns:
+            list: The events completed by the end of the stream.
+        """
+        parsed_output = self.parsed_output
+        try:
+            return super().close()
+        finally:
+            self.parsed_output = parsed_output
+            self.closed = True
+
+    def parse_stream(self, chunks):
+        """
+        Parses an iterable of chunks.
+
+        Args:
+            chunks (iterable): The chunks of the input, in order.
+
+        Yields:
+            dict: Each event as soon as it is complete.
+        """
+        yield from self.tokenize_stream(chunks)
+
+    def _scan_object(self, text: str, pos: int, events: list) -> tuple:
+        del self.scanner.member_starts[:]
+        object_end, resume = self.scanner.scan(text, pos)
+        for member_start in self.scanner.member_starts:
+            self.pending.append(text[pos:member_start])
+            self._flush_member(events)
+            pos = member_start
+        return object_end, resume, pos
+
+    def _flush_object(self, events: list):
+        self._flush_member(events)
+        self._emit_segment(events, CommentedJsonPartTypes.JSON_OBJECT, self.object_tokens)
+        self.object_tokens = []
+
+    def _flush_member(self, events: list):
+        member_text = "".join(self.pending)
+        self.pending = []
+        tokens = self.commented_json_tokenizer.tokenize(member_text, self.projection)
+        self.object_tokens.extend(tokens)
+        events.extend({"type": IncrementalEventTypes.TOKEN, "value": token} for token in tokens)
+
+    def _flush_free_text(self, events: list):
+        value = "".join(self.pending).strip()
+        self.pending = []
+        if value:
+            self._emit_segment(events, CommentedJsonPartTypes.FREE_TEXT, value)
+
+    def _emit_segment(self, events: list, part_type: CommentedJsonPartTypes, value):
+        segment = {"type": part_type, "value": value}
+        self.parsed_output.append(segment)
+        events.append({"type": IncrementalEventTypes.SEGMENT, "value": segment})
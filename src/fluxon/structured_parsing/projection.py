@@ -0,0 +1,127 @@
+class Projection:
+    """ A tree of requested keys used to skip unrequested subtrees while tokenizing. """
+    def __init__(self, fields: dict = None):
+        # Maps a key to its sub-projection, or to None when the whole subtree is requested.
+        self.fields = fields if fields is not None else {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.fields
+
+    def child(self, key: str):
+        """
+        Returns the projection to apply to the value of a requested key.
+
+        Args:
+            key (str): The key whose value is being tokenized.
+
+        Returns:
+            Projection: The nested projection, or None if the whole value is requested.
+        """
+        return self.fields.get(key)
+
+    @classmethod
+    def from_paths(cls, paths) -> "Projection":
+        """
+        Builds a projection from dotted key paths such as "answer" or "sources.title".
+
+        Paths descend transparently through arrays, so "sources.title" keeps only the
+        "title" key of every object in the "sources" array.
+
+        Args:
+            paths (list): The dotted key paths to keep.
+
+        Returns:
+            Projection: The projection tree.
+        """
+        projection = cls()
+        for path in paths:
+            node = projection
+            parts = path.split(".")
+            for depth, part in enumerate(parts):
+                is_leaf = depth == len(parts) - 1
+                if part in node.fields and node.fields[part] is None:
+                    break  # An ancestor path already requests the whole subtree
+                if is_leaf:
+                    node.fields[part] = None
+                else:
+                    node = node.fields.setdefault(part, cls())
+        return projection
+
+    @classmethod
+    def from_schema(cls, schema: dict) -> "Projection":
+        """
+        Builds a projection from the properties declared in a JSON Schema.
+
+        Args:
+            schema (dict): The JSON Schema dictionary.
+
+        Returns:
+            Projection: The projection tree, or None if the schema does not restrict keys.
+        """
+        return cls._from_schema_node(schema, schema.get("$defs", schema.get("definitions", {})), set())
+
+    @classmethod
+    def from_model(cls, model) -> "Projection":
+        """
+        Builds a projection from the fields of a Pydantic model.
+
+        Args:
+            model (BaseModel): The Pydantic model class.
+
+        Returns:
+            Projection: The projection tree.
+        """
+        from fluxon.validator import generate_schema
+
+        return cls.from_schema(generate_schema(model))
+
+    @classmethod
+    def _from_schema_node(cls, node: dict, definitions: dict, seen: set):
+        ref = node.get("$ref")
+        if ref is not None:
+            name = ref.rsplit("/", 1)[-1]
+            if name in seen or name not in definitions:
+                return None  # Recursive or external reference: keep the whole subtree
+            return cls._from_schema_node(definitions[name], definitions, seen | {name})
+
+        for combinator in ("anyOf", "oneOf"):
+            if combinator in node:
+                branches = [
+                    cls._from_schema_node(branch, definitions, seen)
+                    for branch in node[combinator]
+                    if branch.get("type") != "null"
+                ]
+                return branches[0] if len(branches) == 1 else None
+
+        if "items" in node and isinstance(node["items"], dict):
+            return cls._from_schema_node(node["items"], definitions, seen)
+
+        properties = node.get("properties")
+        if not properties or node.get("additionalProperties") not in (None, False):
+            return None
+        return cls({
+            key: cls._from_schema_node(value, definitions, seen)
+            for key, value in properties.items()
+        })
+
+
+def build_projection(spec):
+    """
+    Normalizes a projection specification into a Projection.
+
+    Args:
+        spec: A Projection, a list of dotted key paths, a JSON Schema dictionary,
+              a Pydantic model class, or None.
+
+    Returns:
+        Projection: The projection tree, or None if everything should be tokenized.
+    """
+    if spec is None or isinstance(spec, Projection):
+        return spec
+    if isinstance(spec, dict):
+        return Projection.from_schema(spec)
+    if isinstance(spec, (list, tuple, set, frozenset)):
+        return Projection.from_paths(spec)
+    if isinstance(spec, type):
+        return Projection.from_model(spec)
+    raise TypeError(f"Unsupported projection specification: {type(spec).__name__}")
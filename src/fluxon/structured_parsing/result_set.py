@@ -0,0 +1,182 @@
+import heapq
+import json
+from fluxon.structured_parsing.commented_json_tokenizer import CommentedJsonTokenizer
+from fluxon.structured_parsing.content_tokenizer import CommentedJsonPartTypes
+
+
+class ParsedObject:
+    """ A parsed JSON object together with metadata computed once when it is collected. """
+    __slots__ = ("index", "tokens", "keys", "key_count", "byte_size", "depth", "schema_valid")
+
+    def __init__(self, index: int, tokens: list, byte_size: int, schema: dict = None):
+        """
+        Args:
+            index (int): The position of the object among the JSON objects of the output.
+            tokens (list): The tokens produced by CommentedJsonTokenizer.
+            byte_size (int): The UTF-8 size of the object's source text.
+            schema (dict): Optional JSON Schema to check the object against.
+        """
+        self.index = index
+        self.tokens = tokens
+        self.keys = frozenset(token["key"] for token in tokens if token["type"] == "key_value")
+        self.key_count = len(self.keys)
+        self.byte_size = byte_size
+        self.depth = token_depth(tokens)
+        self.schema_valid = None
+        if schema is not None:
+            from fluxon.validator import validate_with_schema
+
+            self.schema_valid = validate_with_schema(self.to_python(), schema)
+
+    def to_python(self) -> dict:
+        """
+        Converts the object into a plain dictionary.
+
+        Returns:
+            dict: The object without comments.
+        """
+        return CommentedJsonTokenizer().to_python(self.tokens)
+
+    def __repr__(self):
+        return (
+            f"ParsedObject(index={self.index}, key_count={self.key_count}, "
+            f"byte_size={self.byte_size}, depth={self.depth}, schema_valid={self.schema_valid})"
+        )
+
+
+class ParsedResultSet:
+    """ The JSON objects of a parsed output, with indexed selection and top-k queries. """
+
+    def __init__(self, objects: list):
+        self.objects = objects
+
+    @classmethod
+    def from_parsed_output(cls, parsed_output: list, schema: dict = None, sources: list = None) -> "ParsedResultSet":
+        """
+        Builds a result set from the output of FluxonStructuredParser.parse.
+
+        Args:
+            parsed_output (list): The parsed output.
+            schema (dict): Optional JSON Schema each object is checked against.
+            sources (list): Optional source text of each JSON object, used for byte sizes.
+                When omitted, sizes are measured on the minified JSON of each object.
+
+        Returns:
+            ParsedResultSet: The result set.
+        """
+        tokenizer = CommentedJsonTokenizer()
+        objects = []
+        for segment in parsed_output:
+            if segment["type"] != CommentedJsonPartTypes.JSON_OBJECT:
+                continue
+            index = len(objects)
+            if sources is not None:
+                source = sources[index]
+            else:
+                source = json.dumps(tokenizer.to_python(segment["value"]), separators=(",", ":"), ensure_ascii=False)
+            objects.append(ParsedObject(index, segment["value"], len(source.encode("utf-8")), schema))
+        return cls(objects)
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __iter__(self):
+        return iter(self.objects)
+
+    def __getitem__(self, index):
+        return self.objects[index]
+
+    def top_k(self, k: int, key="key_count", largest: bool = True, objects=None) -> list:
+        """
+        Selects the k best objects without sorting the whole set.
+
+        Args:
+            k (int): The number of objects to return.
+            key: The metadata attribute name to rank by, or a callable taking a ParsedObject.
+            largest (bool): Whether larger keys rank first.
+            objects (iterable): Optional subset to select from, such as the result of `with_keys`.
+
+        Returns:
+            list: Up to k objects, best first. Ties keep their original order.
+        """
+        key_function = _key_function(key)
+        candidates = self.objects if objects is None else objects
+        if largest:
+            return heapq.nlargest(k, candidates, key=key_function)
+        return heapq.nsmallest(k, candidates, key=key_function)
+
+    def best(self, key="key_count", largest: bool = True, objects=None):
+        """
+        Returns the single best object.
+
+        Args:
+            key: The metadata attribute name to rank by, or a callable taking a ParsedObject.
+            largest (bool): Whether larger keys rank first.
+            objects (iterable): Optional subset to select from.
+
+        Returns:
+            ParsedObject: The best object, or None if there are no candidates.
+        """
+        selected = self.top_k(1, key, largest, objects)
+        return selected[0] if selected else None
+
+    def with_keys(self, *keys):
+        """
+        Lazily filters the objects that contain all of the given top-level keys.
+
+        Args:
+            *keys (str): The required keys.
+
+        Yields:
+            ParsedObject: The matching objects, in order.
+        """
+        required = frozenset(keys)
+        return (parsed for parsed in self.objects if required <= parsed.keys)
+
+    def valid(self):
+        """
+        Lazily filters the objects that matched the schema given at construction.
+
+        Yields:
+            ParsedObject: The matching objects, in order.
+        """
+        return (parsed for parsed in self.objects if parsed.schema_valid)
+
+    def where(self, predicate):
+        """
+        Lazily filters the objects with a predicate.
+
+        Args:
+            predicate (callable): A function taking a ParsedObject and returning a bool.
+
+        Yields:
+            ParsedObject: The matching objects, in order.
+        """
+        return (parsed for parsed in self.objects if predicate(parsed))
+
+
+def token_depth(tokens: list) -> int:
+    """
+    Computes the nesting depth of tokenized JSON content, counting objects and arrays.
+
+    Args:
+        tokens (list): The tokenized JSON content.
+
+    Returns:
+        int: The depth, where an object without nested values has depth 1.
+    """
+    depth = 1
+    stack = [(tokens, 1)]
+    while stack:
+        items, level = stack.pop()
+        for item in items:
+            if item["value_type"] in ("object", "array"):
+                depth = max(depth, level + 1)
+                stack.append((item["value"], level + 1))
+    return depth
+
+
+def _key_function(key):
+    if callable(key):
+        return key
+    return lambda parsed: getattr(parsed, key)
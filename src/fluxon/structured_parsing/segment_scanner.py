@@ -0,0 +1,206 @@
+import re
+from enum import Enum
+from functools import lru_cache
+from fluxon.metrics import measure
+from fluxon.structured_parsing.content_tokenizer import BraceScanner
+
+
+class SegmentTypes(Enum):
+    FREE_TEXT = "free_text"
+    TAGGED = "tagged"
+    FENCED = "fenced"
+    JSON_OBJECT = "json_object"
+
+
+class Segment:
+    """ A span of the scanned text and the delimiter that produced it. """
+    __slots__ = ("segment_type", "start", "end", "delimiter", "complete")
+
+    def __init__(self, segment_type: SegmentTypes, start: int, end: int, delimiter: str = None, complete: bool = True):
+        self.segment_type = segment_type
+        self.start = start
+        self.end = end
+        self.delimiter = delimiter
+        self.complete = complete
+
+    def text(self, input_text: str) -> str:
+        """
+        Returns the text covered by the segment.
+
+        Args:
+            input_text (str): The text the segment was scanned from.
+
+        Returns:
+            str: The segment content, without its delimiters.
+        """
+        return input_text[self.start:self.end]
+
+    def __eq__(self, other):
+        if not isinstance(other, Segment):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return (
+            f"Segment({self.segment_type.name}, {self.start}, {self.end}, "
+            f"delimiter={self.delimiter!r}, complete={self.complete})"
+        )
+
+
+class SegmentScanner:
+    """ Splits text on start/end tags, Markdown code fences and bare JSON objects in one pass. """
+    FENCE = "```"
+    WHITESPACE_PATTERN = re.compile(r'\s*')
+
+    def __init__(self, tags=(("BEGIN_JSON", "END_JSON"),), fences: bool = True,
+                 fence_languages=("json", "jsonc", "json5", ""), braces: bool = True):
+        """
+        Args:
+            tags (iterable): (start_tag, end_tag) pairs that delimit JSON content.
+            fences (bool): Whether to recognize Markdown code fences.
+            fence_languages (iterable): Fence info strings treated as JSON. Other fences are
+                kept as free text.
+            braces (bool): Whether to recognize bare JSON objects outside other delimiters.
+        """
+        self.end_tags = dict(tags)
+        self.fence_languages = frozenset(language.lower() for language in fence_languages)
+        self.pattern = compile_delimiter_pattern(tuple(self.end_tags.items()), fences, braces)
+
+    def iter_segments(self, input_text: str):
+        """
+        Walks the input once and yields its segments in order.
+
+        Free text and bare objects are reported as they appear. Tagged and fenced segments
+        cover the content between their delimiters with surrounding whitespace removed, and
+        extend to the end of the text when the closing delimiter is missing. An end tag with
+        no start tag closes a segment that begins after the previous segment.
+
+        Args:
+            input_text (str): The text to scan.
+
+        Yields:
+            Segment: The segments of the text.
+        """
+        n = len(input_text)
+        pos = 0
+        free_start = 0
+        scanner = BraceScanner()
+
+        while pos < n:
+            match = self.pattern.search(input_text, pos)
+            if match is None:
+                break
+            kind = match.lastgroup
+            delimiter = match.group(0)
+
+            if kind == "fence":
+                language = delimiter[len(self.FENCE):].strip().lower()
+                content_start = match.end()
+                if content_start < n and input_text[content_start] == "\n":
+                    content_start += 1
+                content_end = input_text.find(self.FENCE, content_start)
+                complete = content_end != -1
+                if not complete:
+                    content_end = n
+                pos = content_end + len(self.FENCE) if complete else n
+                if language not in self.fence_languages:
+                    continue  # Other code blocks stay part of the free text
+                yield from self._free_text(input_text, free_start, match.start())
+                yield self._stripped(SegmentTypes.FENCED, input_text, content_start, content_end, delimiter, complete)
+                free_start = pos
+
+            elif kind == "start":
+                end_tag = self.end_tags[delimiter]
+                content_end = input_text.find(end_tag, match.end())
+                complete = content_end != -1
+                if not complete:
+                    content_end = n
+                yield from self._free_text(input_text, free_start, match.start())
+                yield self._stripped(SegmentTypes.TAGGED, input_text, match.end(), content_end, delimiter, complete)
+                pos = free_start = content_end + len(end_tag) if complete else n
+
+            elif kind == "end":
+                yield self._stripped(SegmentTypes.TAGGED, input_text, free_start, match.start(), delimiter, False)
+                pos = free_start = match.end()
+
+            else:
+                scanner.reset()
+                object_end, _ = scanner.scan(input_text, match.start())
+                complete = object_end is not None
+                if not complete:
+                    object_end = n
+                yield from self._free_text(input_text, free_start, match.start())
+                yield Segment(SegmentTypes.JSON_OBJECT, match.start(), object_end, "{", complete)
+                pos = free_start = object_end
+
+        yield from self._free_text(input_text, free_start, n)
+
+    @measure("segment_scanner.scan", size_arg=1)
+    def scan(self, input_text: str) -> list:
+        """
+        Scans the input into a list of segments.
+
+        Args:
+            input_text (str): The text to scan.
+
+        Returns:
+            list: The segments of the text.
+        """
+        return list(self.iter_segments(input_text))
+
+    def _free_text(self, input_text: str, start: int, end: int):
+        segment = self._stripped(SegmentTypes.FREE_TEXT, input_text, start, end, None, True)
+        if segment.start < segment.end:
+            yield segment
+
+    def _stripped(self, segment_type, input_text, start, end, delimiter, complete) -> Segment:
+        start = self.WHITESPACE_PATTERN.match(input_text, start, end).end()
+        while end > start and input_text[end - 1].isspace():
+            end -= 1
+        return Segment(segment_type, start, end, delimiter, complete)
+
+
+@lru_cache(maxsize=32)
+def compile_delimiter_pattern(tags: tuple, fences: bool, braces: bool):
+    """
+    Compiles all configured delimiters into a single alternation.
+
+    Args:
+        tags (tuple): (start_tag, end_tag) pairs.
+        fences (bool): Whether to match Markdown code fences.
+        braces (bool): Whether to match the opening brace of bare objects.
+
+    Returns:
+        re.Pattern: The combined pattern, with one named group per delimiter kind.
+    """
+    def alternation(words):
+        # Longest first so that a tag is never shadowed by one of its prefixes
+        return "|".join(re.escape(word) for word in sorted(set(words), key=len, reverse=True))
+
+    alternatives = []
+    if fences:
+        alternatives.append(r'(?P<fence>```[^\n`]*)')
+    if tags:
+        alternatives.append(f'(?P<start>{alternation(start for start, _ in tags)})')
+        alternatives.append(f'(?P<end>{alternation(end for _, end in tags)})')
+    if braces:
+        alternatives.append(r'(?P<brace>\{)')
+    return re.compile("|".join(alternatives) or r'(?!)')
+
+
+@lru_cache(maxsize=32)
+def get_segment_scanner(tags=(("BEGIN_JSON", "END_JSON"),), fences: bool = True, braces: bool = True,
+                        fence_languages=("json", "jsonc", "json5", "")) -> SegmentScanner:
+    """
+    Returns a shared scanner for the given delimiters.
+
+    Args:
+        tags (tuple): (start_tag, end_tag) pairs.
+        fences (bool): Whether to recognize Markdown code fences.
+        braces (bool): Whether to recognize bare JSON objects.
+        fence_languages (tuple): Fence info strings treated as JSON.
+
+    Returns:
+        SegmentScanner: A cached scanner. Scanners keep no per-call state and can be shared.
+    """
+    return SegmentScanner(tags, fences=fences, fence_languages=fence_languages, braces=braces)
@@ -1,6 +1,19 @@
+import hashlib
 import json
 import logging
+import threading
 import time
+from fluxon.metrics import measure
+from fluxon.sanitizer import Sanitizer
+
+PREVIEW_LENGTH = 120
+SETUP_HANDLER_NAME = "fluxon.setup_logger"
+CLEAN_SANITIZER = Sanitizer(quotes=False)
+CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+FINGERPRINT_SIZE = 16
+
+# Libraries should not configure output; applications attach handlers to "fluxon"
+logging.getLogger("fluxon").addHandler(logging.NullHandler())
 
 def normalize_json(json_str: str) -> str:
     """
@@ -20,9 +33,90 @@ def normalize_json(json_str: str) -> str:
 
 
 
+def canonical_json(obj) -> str:
+    """
+    Serializes a parsed object into a canonical compact JSON string.
+
+    Keys are sorted and floats with an integral value are written as integers, so objects
+    that compare equal in Python produce the same string.
+
+    Args:
+        obj: The parsed JSON value.
+
+    Returns:
+        str: The canonical JSON string.
+    """
+    return CANONICAL_ENCODER.encode(canonicalize_numbers(obj))
+
+
+def canonicalize_numbers(obj):
+    """
+    Replaces floats with an integral value by integers, copying only the containers that change.
+
+    Args:
+        obj: The parsed JSON value.
+
+    Returns:
+        The value with canonical numbers.
+    """
+    if isinstance(obj, float):
+        return int(obj) if obj.is_integer() else obj
+    if isinstance(obj, dict):
+        changed = None
+        for key, value in obj.items():
+            canonical = canonicalize_numbers(value)
+            if canonical is not value:
+                if changed is None:
+                    changed = dict(obj)
+                changed[key] = canonical
+        return obj if changed is None else changed
+    if isinstance(obj, list):
+        canonical = [canonicalize_numbers(value) for value in obj]
+        return obj if all(new is old for new, old in zip(canonical, obj)) else canonical
+    return obj
+
+
+def fingerprint(obj) -> str:
+    """
+    Computes a key-order-insensitive fingerprint of a parsed object.
+
+    Args:
+        obj: The parsed JSON value.
+
+    Returns:
+        str: A hexadecimal BLAKE2b digest of the canonical JSON.
+    """
+    return hashlib.blake2b(canonical_json(obj).encode("utf-8"), digest_size=FINGERPRINT_SIZE).hexdigest()
+
+
+def deduplicate(objects) -> list:
+    """
+    Groups identical parsed objects, such as the answers of several samples.
+
+    Args:
+        objects (iterable): The parsed objects.
+
+    Returns:
+        list: One dictionary per distinct object with its "fingerprint", first "value",
+              "indices" and "count", most frequent first. Ties keep first-seen order.
+    """
+    groups = {}
+    for index, obj in enumerate(objects):
+        key = fingerprint(obj)
+        group = groups.get(key)
+        if group is None:
+            groups[key] = {"fingerprint": key, "value": obj, "indices": [index], "count": 1}
+        else:
+            group["indices"].append(index)
+            group["count"] += 1
+    return sorted(groups.values(), key=lambda group: -group["count"])
+
+
 def clean_string(input_str: str) -> str:
     """
-    Removes extraneous whitespace and non-printable characters.
+    Removes surrounding whitespace, control and invisible characters.
+
+    Tabs and newlines inside the string are kept, and Unicode spaces become ASCII spaces.
 
     Args:
         input_str (str): The input string to clean.
@@ -30,7 +124,7 @@ def clean_string(input_str: str) -> str:
     Returns:
         str: A cleaned string.
     """
-    return ''.join(c for c in input_str if c.isprintable()).strip()
+    return CLEAN_SANITIZER.sanitize(input_str).strip()
 
 
 
@@ -40,19 +134,16 @@ def timer(func):
     """
     Decorator to time a function's execution.
 
+    Each call is recorded with perf_counter_ns under the function's qualified name in
+    fluxon.metrics.metrics_registry, even while metrics collection is disabled.
+
     Args:
         func (callable): The function to time.
 
     Returns:
         callable: The wrapped function with timing.
     """
-    def wrapper(*args, **kwargs):
-        start = time.time()
-        result = func(*args, **kwargs)
-        end = time.time()
-        print(f"{func.__name__} executed in {end - start:.4f} seconds")
-        return result
-    return wrapper
+    return measure(func.__qualname__, always=True)(func)
 
 
 
@@ -62,6 +153,8 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
     Sets up a custom logger.
 
+    Calling it again for the same logger updates the level instead of adding another handler.
+
     Args:
         name (str): The logger's name.
         level (int): The logging level (default: INFO).
@@ -70,9 +163,96 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
         logging.Logger: Configured logger.
     """
     logger = logging.getLogger(name)
-    handler = logging.StreamHandler()
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
+    if not any(handler.get_name() == SETUP_HANDLER_NAME for handler in logger.handlers):
+        handler = logging.StreamHandler()
+        handler.set_name(SETUP_HANDLER_NAME)
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
     logger.setLevel(level)
     return logger
+
+
+class Preview:
+    """ A payload shown truncated in log messages, formatted only if the message is emitted. """
+    __slots__ = ("payload", "limit")
+
+    def __init__(self, payload, limit: int = PREVIEW_LENGTH):
+        self.payload = payload
+        self.limit = limit
+
+    def __str__(self):
+        text = self.payload if isinstance(self.payload, str) else repr(self.payload)
+        if len(text) <= self.limit:
+            return repr(text)
+        return f"{text[:self.limit]!r}... ({len(text)} chars)"
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Drops repeats of a message logged again within an interval and reports how many were dropped.
+
+    Every record that passes gets a `suppressed` attribute with the number of repeats dropped
+    since its message was last emitted, which formatters can use as %(suppressed)d.
+    """
+
+    def __init__(self, interval: float = 60.0):
+        """
+        Args:
+            interval (float): The number of seconds during which repeats are dropped.
+        """
+        super().__init__()
+        self.interval = interval
+        self.last_emitted = {}
+        self.suppressed = {}
+        self.lock = threading.Lock()
+
+    def reset(self):
+        """
+        Forgets all messages seen so far.
+        """
+        with self.lock:
+            self.last_emitted.clear()
+            self.suppressed.clear()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Messages are keyed by their template, so repeats with different arguments count too
+        msg = record.msg if isinstance(record.msg, str) else str(record.msg)
+        key = (record.name, record.levelno, msg)
+        now = time.monotonic()
+        with self.lock:
+            last = self.last_emitted.get(key)
+            if last is not None and now - last < self.interval:
+                self.suppressed[key] = self.suppressed.get(key, 0) + 1
+                return False
+            self.last_emitted[key] = now
+            suppressed = self.suppressed.pop(key, 0)
+        record.suppressed = suppressed
+        if suppressed:
+            try:
+                message = record.getMessage()
+            except (TypeError, ValueError):
+                return True  # Leave the formatting error to the handler
+            # The merged message is not formatted again, so a literal "%" stays intact
+            record.msg = f"{message} ({suppressed} similar messages suppressed)"
+            record.args = ()
+        return True
+
+
+rate_limit_filter = RateLimitFilter()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Returns a module logger whose repeated messages are rate-limited.
+
+    Args:
+        name (str): The logger's name, usually the module's __name__.
+
+    Returns:
+        logging.Logger: The logger.
+    """
+    logger = logging.getLogger(name)
+    if rate_limit_filter not in logger.filters:
+        logger.addFilter(rate_limit_filter)
+    return logger
@@ -1,9 +1,218 @@
-from jsonschema import validate, ValidationError
-from pydantic import BaseModel
+import copy
+import hashlib
+import json
+import logging
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from importlib import import_module
+from json import JSONDecodeError
+from typing import TYPE_CHECKING
+from fluxon.parser import clean_raw_json, parse_json_with_recovery, recover_json
+from fluxon.metrics import count, measure
+from fluxon.utils import Preview, get_logger
 
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+logger = get_logger(__name__)
+
+# jsonschema and pydantic are imported on first use; these names stay importable from here
+LAZY_ATTRIBUTES = {
+    "ValidationError": ("jsonschema", "ValidationError"),
+    "BaseModel": ("pydantic", "BaseModel"),
+    "PydanticValidationError": ("pydantic", "ValidationError"),
+}
+
+
+def __getattr__(name: str):
+    if name in LAZY_ATTRIBUTES:
+        module_name, attribute = LAZY_ATTRIBUTES[name]
+        return getattr(import_module(module_name), attribute)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def schema_key(schema: dict) -> str:
+    """
+    Computes a stable hash of a schema, independent of key order.
+
+    Args:
+        schema (dict): The JSON Schema dictionary.
+
+    Returns:
+        str: A hexadecimal digest identifying the schema.
+    """
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class StrictScalar:
+    """ Stands for a number or boolean in schema snapshots, never equal across the two kinds. """
+    __slots__ = ("value", "is_bool")
+
+    def __init__(self, value):
+        self.value = value
+        self.is_bool = isinstance(value, bool)
+
+    def __eq__(self, other):
+        return isinstance(other, bool) == self.is_bool and other == self.value
+
+    __hash__ = None
+
+
+def snapshot_schema(value):
+    """
+    Copies a schema for equality checks that tell booleans from numbers, unlike plain ==
+    where True == 1, so that {"const": True} never matches a snapshot of {"const": 1}.
+
+    Args:
+        value: The schema or any value within it.
+
+    Returns:
+        The snapshot.
+    """
+    if isinstance(value, dict):
+        return {key: snapshot_schema(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(snapshot_schema(item) for item in value)
+    if isinstance(value, (bool, int, float)):
+        return StrictScalar(value)
+    return value
+
+
+class SchemaCache(ABC):
+    """
+    Compiles each JSON Schema once and caches the result with LRU eviction.
+
+    Schemas are compiled from a private deep copy, so callers may keep mutating their own
+    dictionaries. A schema object seen recently is recognized by comparing it with a snapshot,
+    which is much cheaper than hashing it; a mutated schema fails the comparison and is
+    hashed again.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Args:
+            maxsize (int): The maximum number of compiled schemas to keep.
+        """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()  # key -> (compiled schema, snapshot of the schema)
+        self.identities = OrderedDict()  # id(schema) -> (snapshot, key) of recently seen schemas
+        self.lock = threading.Lock()
+
+    @abstractmethod
+    def compile(self, schema: dict):
+        """
+        Compiles a schema. Subclasses define what a compiled schema is.
+
+        Args:
+            schema (dict): The JSON Schema dictionary, owned by the cache.
+        """
+
+    def get(self, schema: dict):
+        """
+        Returns the compiled form of a schema, compiling and caching it on first use.
+
+        Args:
+            schema (dict): The JSON Schema dictionary.
+
+        Returns:
+            The cached compiled schema.
+        """
+        with self.lock:
+            seen = self.identities.get(id(schema))
+        # Comparing outside the lock; snapshots are never mutated
+        if seen is not None and seen[0] == schema:
+            with self.lock:
+                entry = self.entries.get(seen[1])
+                if entry is not None:
+                    self.entries.move_to_end(seen[1])
+                    return entry[0]
+
+        key = schema_key(schema)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self._remember(schema, entry[1], key)
+                return entry[0]
+
+        compiled = self.compile(copy.deepcopy(schema))
+        snapshot = snapshot_schema(schema)
+
+        with self.lock:
+            self.entries[key] = (compiled, snapshot)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            self._remember(schema, snapshot, key)
+        return compiled
+
+    def clear(self):
+        """
+        Drops all cached entries.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.identities.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _remember(self, schema: dict, snapshot: dict, key: str):
+        # A reused id is harmless: the schema must still equal the snapshot to hit
+        self.identities[id(schema)] = (snapshot, key)
+        self.identities.move_to_end(id(schema))
+        while len(self.identities) > self.maxsize:
+            self.identities.popitem(last=False)
+
+
+class ValidatorRegistry(SchemaCache):
+    """ Caches compiled jsonschema validators. Validators are safe to share between threads. """
+
+    def compile(self, schema: dict):
+        """
+        Checks a schema against its metaschema and builds its validator.
+
+        Args:
+            schema (dict): The JSON Schema dictionary.
+
+        Returns:
+            jsonschema.protocols.Validator: The compiled validator.
+
+        Raises:
+            jsonschema.SchemaError: If the schema is invalid.
+        """
+        from jsonschema.validators import validator_for
+
+        validator_class = validator_for(schema)
+        validator_class.check_schema(schema)
+        return validator_class(schema)
+
+
+validator_registry = ValidatorRegistry()
+
+
+def get_validator(schema: dict):
+    """
+    Returns the cached compiled validator for a schema.
+
+    Args:
+        schema (dict): The JSON Schema dictionary.
+
+    Returns:
+        jsonschema.protocols.Validator: The compiled validator.
+    """
+    return validator_registry.get(schema)
+
+
+@measure("validator.validate_with_schema")
 def validate_with_schema(json_obj: dict, schema: dict) -> bool:
     """
-    Validates a JSON object against a schema.
+    Validates a JSON object against a schema, reusing the cached compiled validator.
 
     Args:
         json_obj (dict): The JSON object to validate.
@@ -12,15 +221,125 @@ def validate_with_schema(json_obj: dict, schema: dict) -> bool:
     Returns:
         bool: True if valid, False otherwise.
     """
-    try:
-        validate(instance=json_obj, schema=schema)
+    validator = get_validator(schema)
+    if validator.is_valid(json_obj):
         return True
-    except ValidationError as e:
-        print(f"Validation error: {e}")
-        return False
+    count("validator.invalid")
+    if logger.isEnabledFor(logging.INFO):
+        # Finding the most relevant error walks the whole instance again, so only do it when logged
+        from jsonschema.exceptions import best_match
+
+        error = best_match(validator.iter_errors(json_obj))
+        logger.info("Validation error at %s: %s", error.json_path, error.message)
+    return False
+
 
+class BatchValidationResult:
+    """ Compact outcome of a batch validation: a bitmap of valid items and errors for failures only. """
+    __slots__ = ("size", "bitmap", "errors")
 
-def generate_schema(model: BaseModel) -> dict:
+    def __init__(self, size: int):
+        """
+        Args:
+            size (int): The number of validated items.
+        """
+        self.size = size
+        self.bitmap = bytearray(b"\xff") * ((size + 7) // 8)
+        self.errors = {}  # Index of each invalid item -> list of (json_path, message)
+
+    def mark_invalid(self, index: int, errors: list):
+        """
+        Records a failed item.
+
+        Args:
+            index (int): The position of the item in the batch.
+            errors (list): The (json_path, message) pairs of the item.
+        """
+        self.bitmap[index >> 3] &= ~(1 << (index & 7))
+        self.errors[index] = errors
+
+    def __getitem__(self, index: int) -> bool:
+        if not 0 <= index < self.size:
+            raise IndexError("batch validation index out of range")
+        return bool(self.bitmap[index >> 3] & (1 << (index & 7)))
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return (self[index] for index in range(self.size))
+
+    @property
+    def all_valid(self) -> bool:
+        return not self.errors
+
+    @property
+    def valid_count(self) -> int:
+        return self.size - len(self.errors)
+
+    def failures(self) -> list:
+        """
+        Returns the positions of the invalid items.
+
+        Returns:
+            list: The sorted indices of the items that failed validation.
+        """
+        return sorted(self.errors)
+
+
+@measure("validator.validate_many")
+def validate_many(objects, schema: dict, workers: int = None, chunk_size: int = 1024, executor=None) -> BatchValidationResult:
+    """
+    Validates a batch of JSON objects against one schema, collecting every error with its path.
+
+    The schema is compiled once and the batch is split into chunks. Chunks are validated
+    inline unless `executor` or `workers` is given. Validation is CPU-bound Python, so thread
+    pools scale only on free-threaded CPython builds; on standard builds pass a
+    ProcessPoolExecutor to spread the work across cores.
+
+    Args:
+        objects (iterable): The JSON objects to validate.
+        schema (dict): The JSON Schema dictionary.
+        workers (int): Optional number of threads to validate on.
+        chunk_size (int): The number of objects validated per task.
+        executor (Executor): Optional executor to run on, such as a ProcessPoolExecutor.
+
+    Returns:
+        BatchValidationResult: The per-item outcome.
+    """
+    objects = objects if isinstance(objects, (list, tuple)) else list(objects)
+    get_validator(schema)  # Fail fast on an invalid schema
+    result = BatchValidationResult(len(objects))
+    starts = range(0, len(objects), chunk_size)
+    chunks = [objects[start:start + chunk_size] for start in starts]
+    validate_chunk = partial(_validate_chunk, schema)
+
+    if executor is not None:
+        outcomes = executor.map(validate_chunk, starts, chunks)
+    elif len(chunks) <= 1 or workers is None or workers <= 1:
+        outcomes = map(validate_chunk, starts, chunks)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(validate_chunk, starts, chunks))
+
+    for failures in outcomes:
+        for index, errors in failures:
+            result.mark_invalid(index, errors)
+    return result
+
+
+def _validate_chunk(schema: dict, start: int, chunk: list) -> list:
+    # Module-level so that process pools can pickle it; each worker compiles the schema once
+    validator = get_validator(schema)
+    failures = []
+    for offset, json_obj in enumerate(chunk):
+        if not validator.is_valid(json_obj):
+            errors = [(error.json_path, error.message) for error in validator.iter_errors(json_obj)]
+            failures.append((start + offset, errors))
+    return failures
+
+
+def generate_schema(model: "BaseModel") -> dict:
     """
     Generates a JSON schema from a Pydantic model.
 
@@ -30,21 +349,305 @@ def generate_schema(model: BaseModel) -> dict:
     Returns:
         dict: The generated JSON schema.
     """
+    if hasattr(model, "model_json_schema"):
+        return model.model_json_schema()
     return model.schema()
 
 
+@lru_cache(maxsize=256)
+def get_type_adapter(model):
+    """
+    Returns a cached Pydantic v2 TypeAdapter for a model or type.
+
+    Args:
+        model: The Pydantic model class, or any type Pydantic can validate.
+
+    Returns:
+        TypeAdapter: The cached adapter, or None on Pydantic v1.
+    """
+    try:
+        from pydantic import TypeAdapter
+    except ImportError:  # Pydantic v1
+        return None
+    return TypeAdapter(model)
+
+
+@measure("validator.parse_with_model", size_arg=0)
+def parse_with_model(json_str: str, model):
+    """
+    Parses raw LLM output straight into a Pydantic model.
+
+    On Pydantic v2 the raw text, and then the cleaned text, are parsed and validated in a
+    single pass by pydantic-core. The recovery pipeline runs only when both attempts fail.
+
+    Args:
+        json_str (str): The raw JSON string to parse.
+        model: The Pydantic model class, or any type Pydantic can validate.
+
+    Returns:
+        The validated instance, or None if the output cannot be parsed or validated.
+    """
+    from pydantic import ValidationError as PydanticValidationError
+
+    adapter = get_type_adapter(model)
+    if adapter is not None:
+        try:
+            return adapter.validate_json(json_str)
+        except PydanticValidationError:
+            pass
+        try:
+            return adapter.validate_json(clean_raw_json(json_str))
+        except PydanticValidationError:
+            pass
+
+    try:
+        json_obj = recover_json(json_str)
+    except JSONDecodeError as e:
+        # An empty object would validate against models whose fields all have defaults
+        logger.warning("Final parsing failed: %s; input: %s", e, Preview(e.doc))
+        return None
+    try:
+        if adapter is not None:
+            return adapter.validate_python(json_obj)
+        return model.parse_obj(json_obj)
+    except PydanticValidationError:
+        return None
+
+
+JSON_TYPE_CHECKS = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+    "integer": lambda value: (
+        isinstance(value, int) and not isinstance(value, bool)
+        or isinstance(value, float) and value.is_integer()
+    ),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+}
+
+INTEGER_PATTERN = re.compile(r'\s*[-+]?\d+\s*')
+NUMBER_PATTERN = re.compile(r'\s*[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?\s*')
+IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def coerce_value(value, json_type: str):
+    """
+    Converts a value to a JSON type when the conversion is unambiguous.
+
+    Args:
+        value: The value to convert.
+        json_type (str): The target JSON Schema type.
+
+    Returns:
+        tuple: (converted, value) where converted tells whether the conversion applied.
+    """
+    if json_type == "integer":
+        if isinstance(value, str) and INTEGER_PATTERN.fullmatch(value):
+            return True, int(value)
+    elif json_type == "number":
+        if isinstance(value, str) and NUMBER_PATTERN.fullmatch(value):
+            number = float(value)
+            return True, int(number) if INTEGER_PATTERN.fullmatch(value) else number
+    elif json_type == "boolean":
+        if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            return True, value.strip().lower() == "true"
+    elif json_type == "string":
+        if isinstance(value, bool):
+            return True, "true" if value else "false"
+        if isinstance(value, (int, float)):
+            return True, str(value)
+    return False, value
+
+
+class RepairPlan:
+    """ A schema node compiled into the steps needed to repair matching values. """
+    __slots__ = ("types", "properties", "defaults", "drop_additional", "additional", "items")
+
+    def __init__(self):
+        self.types = None  # Allowed JSON types, or None when unconstrained
+        self.properties = {}  # Key -> RepairPlan for declared properties
+        self.defaults = []  # (key, default) for declared properties with a default
+        self.drop_additional = False
+        self.additional = None  # RepairPlan for undeclared properties
+        self.items = None  # RepairPlan for array items
+
+    def apply(self, value):
+        """
+        Repairs a value in a single traversal. Objects and arrays are repaired in place.
+
+        Args:
+            value: The value to repair.
+
+        Returns:
+            The repaired value.
+        """
+        if self.types is not None and not any(JSON_TYPE_CHECKS[json_type](value) for json_type in self.types):
+            for json_type in self.types:
+                converted, value = coerce_value(value, json_type)
+                if converted:
+                    break
+
+        if isinstance(value, dict):
+            if self.drop_additional or self.additional is not None:
+                for key in [key for key in value if key not in self.properties]:
+                    if self.drop_additional:
+                        del value[key]
+                    else:
+                        value[key] = self.additional.apply(value[key])
+            for key, plan in self.properties.items():
+                if key in value:
+                    value[key] = plan.apply(value[key])
+            for key, default in self.defaults:
+                if key not in value:
+                    value[key] = default if isinstance(default, IMMUTABLE_TYPES) else copy.deepcopy(default)
+
+        elif isinstance(value, list) and self.items is not None:
+            for index, item in enumerate(value):
+                value[index] = self.items.apply(item)
+
+        return value
+
+
+class RepairPlanCompiler:
+    """ Compiles a JSON Schema, including local $ref definitions, into a RepairPlan tree. """
+
+    def __init__(self, schema: dict):
+        self.definitions = {**schema.get("definitions", {}), **schema.get("$defs", {})}
+        self.compiled_definitions = {}
+
+    def compile(self, node: dict) -> RepairPlan:
+        """
+        Compiles a schema node.
+
+        Args:
+            node (dict): The schema node.
+
+        Returns:
+            RepairPlan: The compiled plan. Recursive references share the same plan object.
+        """
+        node = self.unwrap(node)
+        plan = RepairPlan()
+        if not isinstance(node, dict):
+            return plan
+
+        ref = node.get("$ref")
+        if ref is not None:
+            name = ref.rsplit("/", 1)[-1]
+            if name not in self.definitions:
+                return plan
+            if name not in self.compiled_definitions:
+                self.compiled_definitions[name] = plan
+                self.fill(plan, self.unwrap(self.definitions[name]))
+            return self.compiled_definitions[name]
+
+        self.fill(plan, node)
+        return plan
+
+    @staticmethod
+    def unwrap(node):
+        """
+        Strips anyOf/oneOf unions of a single schema with null, such as Optional fields.
+
+        The union compiles to the plan of its non-null branch, shared rather than copied so
+        that recursive definitions still being filled are seen complete. None is never
+        coerced, so that plan also leaves null values as they are.
+
+        Args:
+            node: The schema node.
+
+        Returns:
+            The innermost schema node that is not such a union.
+        """
+        while isinstance(node, dict):
+            combinator = next((name for name in ("anyOf", "oneOf") if name in node), None)
+            if combinator is None:
+                break
+            branches = [branch for branch in node[combinator] if branch.get("type") != "null"]
+            if len(branches) != 1:
+                break
+            node = branches[0]
+        return node
+
+    def fill(self, plan: RepairPlan, node: dict):
+        if "anyOf" in node or "oneOf" in node:
+            return  # Unions of several schemas are left unrepaired
+
+        json_type = node.get("type")
+        if json_type is not None:
+            plan.types = (json_type,) if isinstance(json_type, str) else tuple(json_type)
+
+        for key, property_schema in node.get("properties", {}).items():
+            plan.properties[key] = self.compile(property_schema)
+            if isinstance(property_schema, dict) and "default" in property_schema:
+                plan.defaults.append((key, property_schema["default"]))
+
+        additional = node.get("additionalProperties")
+        if additional is False and "patternProperties" not in node:
+            plan.drop_additional = True
+        elif isinstance(additional, dict):
+            plan.additional = self.compile(additional)
+
+        if isinstance(node.get("items"), dict):
+            plan.items = self.compile(node["items"])
+
+
+class RepairPlanCache(SchemaCache):
+    """ Caches compiled repair plans. """
+
+    def compile(self, schema: dict) -> RepairPlan:
+        return RepairPlanCompiler(schema).compile(schema)
+
+
+repair_plan_cache = RepairPlanCache()
+
+
+def compile_repair_plan(schema: dict) -> RepairPlan:
+    """
+    Returns the cached repair plan for a schema.
+
+    Args:
+        schema (dict): The JSON Schema dictionary.
+
+    Returns:
+        RepairPlan: The compiled plan.
+    """
+    return repair_plan_cache.get(schema)
+
+
+@measure("validator.repair_with_schema")
 def repair_with_schema(json_obj: dict, schema: dict) -> dict:
     """
-    Repairs a JSON object by filling missing fields with default values from a schema.
+    Repairs a JSON object against a schema, recursing into nested objects and arrays.
+
+    Missing properties with a default are filled in, obvious type mismatches such as "3" for
+    an integer or "true" for a boolean are coerced, and properties are dropped where
+    additionalProperties is false. The schema is compiled once into a cached repair plan.
 
     Args:
-        json_obj (dict): The JSON object to repair.
+        json_obj (dict): The JSON object to repair. It is repaired in place.
         schema (dict): The JSON Schema dictionary.
 
     Returns:
         dict: The repaired JSON object.
     """
-    for key, value in schema.get("properties", {}).items():
-        if key not in json_obj and "default" in value:
-            json_obj[key] = value["default"]
-    return json_obj
+    return compile_repair_plan(schema).apply(json_obj)
+
+
+@measure("validator.parse_and_validate", size_arg=0)
+def parse_and_validate(json_str: str, schema) -> tuple:
+    """
+    Runs the generic pipeline: recovery parsing, schema-guided repair and validation.
+
+    Args:
+        json_str (str): The raw JSON string to parse.
+        schema: The JSON Schema dictionary or a Pydantic model class.
+
+    Returns:
+        tuple: (json_obj, is_valid) with the repaired object and whether it matches the schema.
+    """
+    if not isinstance(schema, dict):
+        schema = generate_schema(schema)
+    json_obj = repair_with_schema(parse_json_with_recovery(json_str), schema)
+    return json_obj, get_validator(schema).is_valid(json_obj)
@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+from fluxon.converter_registry import ConverterRegistry, convert, converter_registry
+
+
+class TestConverterRegistry(unittest.TestCase):
+
+    def test_detect(self):
+        cases = {
+            '{"a": 1}': "json",
+            "  [1, 2]": "json",
+            "<user><name>Alice</name></user>": "xml",
+            "name,age\nAlice,25": "csv",
+            '"name","age"\n"Alice",25': "csv",
+            '"Hello, world"': "yaml",
+            "name: Alice\nage: 25": "yaml",
+            "---\nname: Alice": "yaml",
+            "plain text": "yaml",
+        }
+        for content, expected in cases.items():
+            with self.subTest(content=content):
+                self.assertEqual(converter_registry.detect(content), expected)
+
+    def test_convert_to_object(self):
+        self.assertEqual(convert("name: Alice\nage: 25"), {"name": "Alice", "age": 25})
+        self.assertEqual(convert("name,age\nAlice,25"), [{"name": "Alice", "age": 25}])
+        self.assertEqual(convert('"name","age"\n"Alice",25'), [{"name": "Alice", "age": 25}])
+        self.assertEqual(convert('"Hello, world"'), "Hello, world")
+        self.assertEqual(convert("<user><name>Alice</name></user>"), {"user": {"name": "Alice"}})
+        self.assertEqual(convert(b'{"a": [1, 2]}'), {"a": [1, 2]})
+
+    def test_convert_to_json_and_jsonl(self):
+        self.assertEqual(convert("name: Alice", dst="json"), '{"name":"Alice"}')
+        self.assertEqual(convert("[1, {\"a\": 2}]", dst="jsonl"), '1\n{"a":2}')
+        self.assertEqual(convert("a: 1\n---\na: 2\n", dst="jsonl"), '{"a":1}\n{"a":2}')
+        self.assertEqual(convert("a;b\n1;2", src="csv", dst="jsonl", delimiter=";"), '{"a":1,"b":2}')
+        xml_content = "<users><user><name>Alice</name></user><user><name>Bob</name></user></users>"
+        self.assertEqual(convert(xml_content, dst="jsonl"), '{"name":"Alice"}\n{"name":"Bob"}')
+
+    def test_convert_treats_path_strings_as_content(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "secret.yaml")
+            with open(path, "w") as handle:
+                handle.write("password: hunter2\n")
+            self.assertEqual(convert(path), path)
+            self.assertEqual(convert(path, dst="json"), json.dumps(path))
+            self.assertEqual(convert(path, dst="jsonl"), json.dumps(path))
+            for dst in ("object", "json", "jsonl"):
+                with self.subTest(dst=dst):
+                    self.assertNotIn("hunter2", json.dumps(convert(path, src="csv", dst=dst)))
+
+    def test_unknown_formats(self):
+        with self.assertRaises(ValueError):
+            convert("a: 1", src="toml")
+        with self.assertRaises(ValueError):
+            convert("a: 1", dst="xml")
+
+    def test_register_lazy_format(self):
+        registry = ConverterRegistry(fallback="json")
+        registry.register("kv", "json:loads", sniffer=lambda prefix: prefix.startswith("kv"))
+        registry.register("ini", "configparser:NoSuchLoader", sniffer=lambda prefix: prefix.startswith("["))
+        self.assertEqual(registry.detect("[1]"), "ini")
+        self.assertEqual(registry.convert("[1, 2]", src="kv"), [1, 2])
+        self.assertEqual(json.loads(registry.convert("[1, 2]", src="kv", dst="json")), [1, 2])
+        with self.assertRaises(AttributeError):
+            registry.convert("[section]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,36 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
-from fluxon.format_converter import yaml_to_json, validate_yaml_with_schema, csv_to_json, xml_to_json
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+from xml.etree.ElementTree import ParseError
+
+import xmltodict
+
+from fluxon import format_converter
+from fluxon.format_converter import (
+    yaml_to_json,
+    validate_yaml_with_schema,
+    csv_to_json,
+    xml_to_json,
+    csv_to_jsonl,
+    iter_csv_records,
+    iter_csv_batches,
+    infer_column_types,
+    iter_xml_records,
+    xml_to_jsonl,
+    load_and_validate_yaml,
+    iter_yaml_documents,
+    yaml_to_jsonl,
+    csv_to_columns,
+    split_csv_ranges,
+    parallel_csv_to_jsonl,
+)
 
 
 class TestFormatConverter(unittest.TestCase):
@@ -55,6 +86,27 @@ class TestFormatConverter(unittest.TestCase):
         }
         self.assertFalse(validate_yaml_with_schema(yaml_content, schema))
 
+    def test_load_and_validate_yaml(self):
+        schema = {"type": "object", "properties": {"age": {"type": "integer"}}}
+        self.assertEqual(load_and_validate_yaml("age: 25", schema), ({"age": 25}, True))
+        self.assertEqual(load_and_validate_yaml("age: old", schema), ({"age": "old"}, False))
+        self.assertEqual(load_and_validate_yaml("age: 25:", schema), (None, False))
+
+    def test_iter_yaml_documents(self):
+        yaml_content = "name: Alice\n---\nname: Bob\n---\n- 1\n- 2\n"
+        self.assertEqual(list(iter_yaml_documents(yaml_content)), [{"name": "Alice"}, {"name": "Bob"}, [1, 2]])
+        self.assertEqual(list(yaml_to_jsonl(yaml_content)), ['{"name":"Alice"}', '{"name":"Bob"}', '[1,2]'])
+        schema = {"type": "object"}
+        self.assertEqual(
+            [is_valid for _, is_valid in iter_yaml_documents(yaml_content, schema)],
+            [True, True, False],
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bundle.yaml")
+            with open(path, "w") as handle:
+                handle.write(yaml_content)
+            self.assertEqual(len(list(iter_yaml_documents(Path(path)))), 3)
+
     def test_csv_to_json_valid(self):
         csv_content = "name,age,city\nAlice,25,New York\nBob,30,San Francisco"
         expected_output = (
@@ -91,6 +143,168 @@ class TestFormatConverter(unittest.TestCase):
 ]"""
         self.assertEqual(result, expected_output)  # Should return an empty string on error
 
+    def test_csv_to_jsonl_typed_columns(self):
+        csv_content = "name,age,score,active,zip\nAlice,25,1.5,true,\nBob,,2,False,02139\nCarl,x,3e2,true,1"
+        lines = list(csv_to_jsonl(csv_content, sample_size=2))
+        self.assertEqual(lines, [
+            '{"name":"Alice","age":25,"score":1.5,"active":true,"zip":""}',
+            '{"name":"Bob","age":null,"score":2.0,"active":false,"zip":"02139"}',
+            '{"name":"Carl","age":"x","score":300.0,"active":true,"zip":"1"}',
+        ])
+
+    def test_csv_to_jsonl_keeps_leading_zeros(self):
+        self.assertEqual(list(csv_to_jsonl("zip,id\n01234,007\n")), ['{"zip":"01234","id":"007"}'])
+        self.assertEqual(list(csv_to_jsonl("n,x\n0,0.5\n-0,0.25\n")), ['{"n":0,"x":0.5}', '{"n":0,"x":0.25}'])
+        # Values after the sample keep their leading zeros too
+        self.assertEqual(list(csv_to_jsonl("id\n1\n007\n", sample_size=1)), ['{"id":1}', '{"id":"007"}'])
+
+    def test_csv_to_jsonl_untyped(self):
+        csv_content = "name,age\nAlice,25"
+        self.assertEqual(list(csv_to_jsonl(csv_content, infer_types=False)), ['{"name":"Alice","age":"25"}'])
+
+    def test_iter_csv_records_from_file_and_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.csv")
+            with open(path, "w", newline="") as handle:
+                handle.write('id,text\n1,"multi\nline"\n2,plain\n')
+            records = list(iter_csv_records(Path(path)))
+            self.assertEqual(list(iter_csv_records(path)), [])  # A string is content, not a path
+            self.assertEqual(records, [{"id": 1, "text": "multi\nline"}, {"id": 2, "text": "plain"}])
+            with open(path, newline="") as handle:
+                self.assertEqual(list(iter_csv_records(handle)), records)
+        self.assertEqual(list(iter_csv_records(iter(["a;b\n", "1;2\n"]), delimiter=";")), [{"a": 1, "b": 2}])
+
+    def test_iter_csv_batches(self):
+        csv_content = "n\n" + "\n".join(str(i) for i in range(5))
+        batches = list(iter_csv_batches(csv_content, batch_size=2))
+        self.assertEqual([[row["n"] for row in batch] for batch in batches], [[0, 1], [2, 3], [4]])
+
+    def test_csv_to_columns(self):
+        csv_content = "id,score,name,flag,note\n1,0.5,Alice,true,\n2,1e3,Alice,false,x\n3,,Bob,true,\n"
+        table = csv_to_columns(csv_content, use_numpy=False)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table["id"], array("q", [1, 2, 3]))
+        self.assertEqual(table["score"], [0.5, 1000.0, None])
+        self.assertIs(table["name"][0], table["name"][1])
+        self.assertEqual(table["flag"], [True, False, True])
+        self.assertEqual(table.column_types["note"], "string")
+        self.assertEqual(table.to_records(), list(iter_csv_records(csv_content)))
+        self.assertEqual(next(table.to_jsonl()), '{"id":1,"score":0.5,"name":"Alice","flag":true,"note":""}')
+
+    def test_csv_to_columns_falls_back_across_batches(self):
+        csv_content = "n\n" + "\n".join(str(i) for i in range(5000)) + "\nx\n"
+        column = csv_to_columns(csv_content, use_numpy=False)["n"]
+        self.assertEqual(column[:3], [0, 1, 2])
+        self.assertEqual(column[-2:], [4999, "x"])
+
+    def test_csv_to_columns_keeps_leading_zeros(self):
+        csv_content = "zip,id\n02139,1\n10001,007\n"
+        table = csv_to_columns(csv_content, sample_size=1, use_numpy=False)
+        self.assertEqual(table["zip"], ["02139", "10001"])
+        self.assertEqual(table["id"], [1, "007"])
+
+    def test_column_values_reads_numpy_columns_in_place(self):
+        class NumpyColumn:
+            # The attributes of a NumPy array column_values relies on
+            def __init__(self, values, base=None, strides=(8,)):
+                self.values, self.base, self.strides = values, base, strides
+
+            def __len__(self):
+                return len(self.values)
+
+            def item(self, index):
+                return self.values[index]
+
+        values = array("q", [1, 2, 3])
+        self.assertIs(format_converter.column_values(NumpyColumn(values, values)), values)
+        reversed_view = NumpyColumn(values[::-1], values, strides=(-8,))
+        self.assertEqual(list(format_converter.column_values(reversed_view)), [3, 2, 1])
+        self.assertEqual(list(format_converter.column_values(NumpyColumn([1.5, 2.5]))), [1.5, 2.5])
+
+    def test_csv_to_columns_untyped_and_empty(self):
+        table = csv_to_columns("a,b\n1,2\n3\n", infer_types=False, use_numpy=False)
+        self.assertEqual(table.to_records(), [{"a": "1", "b": "2"}, {"a": "3", "b": ""}])
+        self.assertEqual(len(csv_to_columns("", use_numpy=False)), 0)
+
+    def write_quoted_csv(self, directory):
+        path = os.path.join(directory, "data.csv")
+        with open(path, "w", newline="") as handle:
+            handle.write("id,text\n")
+            for i in range(50):
+                handle.write(f'{i},"multi\nline ""{i}"""\n')
+        return path
+
+    def test_split_csv_ranges_respects_quoted_newlines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_quoted_csv(directory)
+            with open(path, "rb") as handle:
+                content = handle.read()
+            with mock.patch.object(format_converter, "SCAN_BLOCK_SIZE", 7):
+                header, ranges = split_csv_ranges(path, chunk_size=40)
+            self.assertEqual(header, b"id,text\n")
+            self.assertGreater(len(ranges), 1)
+            self.assertEqual(ranges[0][0], len(header))
+            self.assertEqual(ranges[-1][1], len(content))
+            for start, end in ranges:
+                self.assertEqual(content[start:end].count(b'"') % 2, 0)
+                self.assertTrue(content[start:end].endswith(b'"\n'))
+
+    def test_parallel_csv_to_jsonl(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_quoted_csv(directory)
+            expected = list(csv_to_jsonl(Path(path)))
+            output_path = os.path.join(directory, "data.jsonl")
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                count = parallel_csv_to_jsonl(path, output_path, chunk_size=64, executor=executor)
+            self.assertEqual(count, 50)
+            with open(output_path) as handle:
+                self.assertEqual(handle.read().splitlines(), expected)
+
+    def test_parallel_csv_to_jsonl_with_escaped_quotes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.csv")
+            with open(path, "w", newline="") as handle:
+                handle.write("id,text\n")
+                for i in range(20):
+                    handle.write(f'{i},"say \\"hi\nthen\\" {i}"\n')
+            expected = list(csv_to_jsonl(Path(path), escapechar="\\"))
+            output_path = os.path.join(directory, "data.jsonl")
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                count = parallel_csv_to_jsonl(path, output_path, chunk_size=32, executor=executor, escapechar="\\")
+            self.assertEqual(count, 20)
+            with open(output_path) as handle:
+                self.assertEqual(handle.read().splitlines(), expected)
+
+    def test_parallel_csv_to_jsonl_with_fieldnames(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_quoted_csv(directory)
+            options = {"fieldnames": ["key", "value", "note"], "restval": "-"}
+            expected = list(csv_to_jsonl(Path(path), **options))
+            output_path = os.path.join(directory, "data.jsonl")
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                count = parallel_csv_to_jsonl(path, output_path, chunk_size=64, executor=executor, **options)
+            self.assertEqual(count, 51)
+            with open(output_path) as handle:
+                self.assertEqual(handle.read().splitlines(), expected)
+            self.assertEqual(json.loads(expected[0]), {"key": "id", "value": "text", "note": "-"})
+
+    def test_parallel_csv_to_jsonl_with_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_quoted_csv(directory)
+            output_path = os.path.join(directory, "data.jsonl")
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                count = parallel_csv_to_jsonl(path, output_path, chunk_size=256, executor=executor)
+            self.assertEqual(count, 50)
+            with open(output_path) as handle:
+                self.assertEqual(json.loads(handle.readline()), {"id": 0, "text": 'multi\nline "0"'})
+
+    def test_infer_column_types(self):
+        rows = [{"a": "1", "b": "1.5", "c": "TRUE", "d": "x", "e": ""}]
+        self.assertEqual(
+            infer_column_types(rows, ["a", "b", "c", "d", "e"]),
+            {"a": "integer", "b": "number", "c": "boolean", "d": "string", "e": "string"},
+        )
+
     def test_xml_to_json_valid(self):
         xml_content = """
         <user>
@@ -121,6 +335,42 @@ class TestFormatConverter(unittest.TestCase):
         result = xml_to_json(xml_content)
         self.assertEqual(result, "")  # Should return an empty string on error
 
+    def test_iter_xml_records_matches_full_parse(self):
+        xml_content = (
+            '<r><i a="1">t<b>x</b><b>y</b></i><i/><i>  </i>'
+            '<i c="2">z</i><i>t <b>x</b> u</i></r>'
+        )
+        expected = xmltodict.parse(xml_content)
+        self.assertEqual(list(iter_xml_records(xml_content)), expected["r"]["i"])
+        self.assertEqual(list(iter_xml_records(xml_content, item_depth=1)), [expected["r"]])
+
+    def test_iter_xml_records_by_path_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.xml")
+            with open(path, "w") as handle:
+                handle.write('<?xml version="1.0"?><catalog><meta>m</meta><item id="1"><n>a</n></item><item id="2"/></catalog>')
+            records = list(iter_xml_records(Path(path), path="catalog/item"))
+            self.assertEqual(records, [{"@id": "1", "n": "a"}, {"@id": "2"}])
+            with self.assertRaises(ParseError):  # A string is content, not a path
+                list(iter_xml_records(path))
+            with open(path, "rb") as handle:
+                self.assertEqual(list(iter_xml_records(handle, path=("catalog", "item"))), records)
+
+    def test_xml_to_jsonl(self):
+        xml_content = "<users><user><name>Alice</name><age>25</age></user><user><name>Bob</name></user></users>"
+        lines = list(xml_to_jsonl(xml_content))
+        self.assertEqual(lines, ['{"name":"Alice","age":"25"}', '{"name":"Bob"}'])
+        self.assertEqual(json.loads(lines[0]), {"name": "Alice", "age": "25"})
+
+    def test_format_converter_defers_heavy_dependencies(self):
+        code = (
+            "import sys, fluxon.format_converter as f; "
+            "assert not {'yaml', 'xmltodict', 'multiprocessing'} & set(sys.modules); "
+            "assert f.load_yaml('a: 1') == {'a': 1}"
+        )
+        src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
+        subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": src_path})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,89 @@
+import json
+import unittest
+from fluxon.metrics import MetricsRegistry, metrics_registry, payload_size
+from fluxon.parser import parse_json_with_recovery
+from fluxon.utils import timer
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_disabled_registry_records_nothing(self):
+        registry = MetricsRegistry()
+        measured = registry.measure("stage", size_arg=0)(len)
+        self.assertEqual(measured("abc"), 3)
+        registry.count("events")
+        self.assertEqual(registry.snapshot(), {"stages": {}, "counters": {}})
+
+    def test_measure_records_calls_bytes_and_errors(self):
+        registry = MetricsRegistry(enabled=True, buckets_ns=(10**12,))
+
+        @registry.measure("stage", size_arg=0)
+        def check(text):
+            if not text:
+                raise ValueError("empty")
+            return text
+
+        check("héllo")
+        with self.assertRaises(ValueError):
+            check("")
+        registry.count("events", 2)
+
+        stage = registry.snapshot()["stages"]["stage"]
+        self.assertEqual((stage["calls"], stage["errors"], stage["bytes"]), (2, 1, 6))
+        self.assertEqual(stage["latency_buckets"], {str(10**12): 2, "+Inf": 2})
+        self.assertEqual(json.loads(registry.to_json())["counters"], {"events": 2})
+
+        registry.reset()
+        self.assertEqual(registry.snapshot()["stages"], {})
+
+    def test_to_prometheus(self):
+        registry = MetricsRegistry(enabled=True, buckets_ns=(1_000,))
+        registry.record("parse", 500, size=10)
+        registry.record("parse", 5_000, error=True)
+        registry.count("validator.invalid")
+        text = registry.to_prometheus()
+        self.assertIn('fluxon_calls_total{stage="parse"} 2', text)
+        self.assertIn('fluxon_errors_total{stage="parse"} 1', text)
+        self.assertIn('fluxon_bytes_total{stage="parse"} 10', text)
+        self.assertIn('fluxon_latency_seconds_bucket{stage="parse",le="1e-06"} 1', text)
+        self.assertIn('fluxon_latency_seconds_bucket{stage="parse",le="+Inf"} 2', text)
+        self.assertIn('fluxon_latency_seconds_count{stage="parse"} 2', text)
+        self.assertIn('fluxon_events_total{name="validator.invalid"} 1', text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_payload_size(self):
+        self.assertEqual(payload_size("abc"), 3)
+        self.assertEqual(payload_size("é"), 2)
+        self.assertEqual(payload_size(b"ab"), 2)
+        self.assertEqual(payload_size(None), 0)
+
+
+class TestDefaultRegistry(unittest.TestCase):
+
+    def setUp(self):
+        metrics_registry.reset()
+        metrics_registry.enable()
+
+    def tearDown(self):
+        metrics_registry.disable()
+        metrics_registry.reset()
+
+    def test_instrumented_parser(self):
+        parse_json_with_recovery('{"a": 1}')
+        stage = metrics_registry.snapshot()["stages"]["parser.parse_json_with_recovery"]
+        self.assertEqual((stage["calls"], stage["bytes"]), (1, 8))
+
+    def test_timer_records_while_disabled(self):
+        metrics_registry.disable()
+
+        @timer
+        def sample_function():
+            return "Success"
+
+        self.assertEqual(sample_function(), "Success")
+        stages = metrics_registry.snapshot()["stages"]
+        self.assertEqual(stages[sample_function.__qualname__]["calls"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,11 +9,26 @@ from fluxon.parser import (
     remove_comments,
     clean_raw_json
 )
-from fluxon.utils import normalize_json
+from fluxon.utils import normalize_json, rate_limit_filter
 
 
 class TestParser(unittest.TestCase):
 
+    def test_parse_json_with_recovery_logs_truncated_input(self):
+        rate_limit_filter.reset()
+        with self.assertLogs("fluxon.parser", level="WARNING") as log:
+            self.assertEqual(parse_json_with_recovery("[" + "x" * 1000), {})
+        self.assertIn("chars)", log.output[0])
+        self.assertLess(len(log.output[0]), 400)
+
+    def test_parse_json_with_recovery_sanitizes_first(self):
+        self.assertEqual(parse_json_with_recovery('\ufeff{\u201ca\u201d:\u00a01}'), {"a": 1})
+        self.assertEqual(parse_json_with_recovery('{"q": "\u201chi\u201d"}'), {"q": "\u201chi\u201d"})
+
+    def test_parse_json_with_recovery_keeps_quotes_in_strings(self):
+        self.assertEqual(parse_json_with_recovery('{"q": "\u201chi\u201d", "n": 1,}'), {"q": "\u201chi\u201d", "n": 1})
+        self.assertEqual(parse_json_with_recovery('{"q": "it\u2019s",}'), {"q": "it\u2019s"})
+
     def test_parse_json_with_recovery(self):
         input_json = '{"name": "Alice", "age": 25 "city": "New York"}'
         expected_output = {"name": "Alice", "age": 25, "city": "New York"}
@@ -55,6 +70,23 @@ class TestParser(unittest.TestCase):
         result = extract_json_from_text(input_text)
         self.assertEqual(result, expected_output)
 
+    def test_extract_json_from_code_fence(self):
+        input_text = "Sure, here it is:\n```json\n{\"key\": \"value\"}\n```\nAnything else?"
+        self.assertEqual(extract_json_from_text(input_text), '{"key": "value"}')
+
+    def test_extract_json_prefers_tags_over_fences(self):
+        input_text = 'Install it first:\n```\npip install fluxon\n```\nBEGIN_JSON\n{"ok": true}\nEND_JSON'
+        self.assertEqual(extract_json_from_text(input_text), '{"ok": true}')
+        self.assertEqual(parse_json_with_recovery(input_text), {"ok": True})
+        input_text = 'For example:\n```json\n{"ok": false}\n```\nBEGIN_JSON\n{"ok": true}\nEND_JSON'
+        self.assertEqual(extract_json_from_text(input_text), '{"ok": true}')
+        self.assertEqual(extract_json_from_text('```\n{"a": 1}\n```'), '```\n{"a": 1}\n```')
+
+    def test_extract_json_from_text_missing_tags(self):
+        self.assertEqual(extract_json_from_text('BEGIN_JSON {"a": 1}'), '{"a": 1}')
+        self.assertEqual(extract_json_from_text('{"a": 1} END_JSON'), '{"a": 1}')
+        self.assertEqual(extract_json_from_text('{"a": 1}'), '{"a": 1}')
+
     def test_remove_comments(self):
         input_json = '''
         {
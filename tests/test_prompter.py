@@ -1,5 +1,6 @@
+import json
 import unittest
-from fluxon.prompter import format_prompt
+from fluxon.prompter import format_prompt, PromptTemplate, render_schema, strip_descriptions
 
 
 class TestPrompter(unittest.TestCase):
@@ -116,6 +117,41 @@ class TestPrompter(unittest.TestCase):
         result = format_prompt(base_prompt, schema, start_tag, end_tag)
         self.assertEqual(result, expected_output)
 
+    def test_prompt_template_is_sorted_and_reusable(self):
+        template = PromptTemplate({"type": "object", "required": ["b"], "properties": {"b": {"type": "string"}}})
+        reordered = PromptTemplate({"properties": {"b": {"type": "string"}}, "required": ["b"], "type": "object"})
+        self.assertEqual(template.format("Hi."), reordered.format("Hi."))
+        self.assertTrue(template.format("Hi.").startswith("Hi.\n\nOutput the JSON object between the tags:\nBEGIN_JSON\n{\n"))
+        self.assertEqual(PromptTemplate({"a": 1}, mode="pretty").format("x"), format_prompt("x", {"a": 1}))
+
+    def test_render_schema_modes(self):
+        schema = {
+            "type": "object",
+            "description": "A user.",
+            "properties": {
+                "title": {"type": "string", "title": "Title", "description": "The title."},
+                "kind": {"enum": ["description"], "examples": ["description"]},
+            },
+        }
+        self.assertEqual(
+            render_schema(schema, "compact"),
+            json.dumps(schema, separators=(",", ":"), sort_keys=True),
+        )
+        self.assertEqual(
+            render_schema(schema, "minified"),
+            '{"properties":{"kind":{"enum":["description"]},"title":{"type":"string"}},"type":"object"}',
+        )
+        self.assertEqual(strip_descriptions(schema)["properties"]["title"], {"type": "string"})
+
+    def test_render_schema_within_budget(self):
+        schema = {"type": "object", "description": "x" * 200, "properties": {"a": {"type": "integer"}}}
+        self.assertEqual(render_schema(schema, max_tokens=20), render_schema(schema, "minified"))
+        self.assertEqual(render_schema(schema, max_tokens=500), render_schema(schema, "sorted"))
+        with self.assertRaises(ValueError):
+            render_schema(schema, max_tokens=2)
+        with self.assertRaises(ValueError):
+            render_schema(schema, mode="tiny")
+
 
 if __name__ == "__main__":
     unittest.main()
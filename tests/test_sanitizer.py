@@ -0,0 +1,34 @@
+import unittest
+from fluxon.sanitizer import Sanitizer, sanitize_json, sanitize_text
+
+
+class TestSanitizer(unittest.TestCase):
+
+    def test_sanitize_text(self):
+        text = '\ufeff{\u201cname\u201d:\u00a0\u201cAl\u200bice\u201d,\u2028\u2018x\u2019: "a\x00b\tc"}'
+        self.assertEqual(sanitize_text(text), '{"name": "Alice",\n\'x\': "ab\tc"}')
+
+    def test_ascii_text_is_returned_unchanged(self):
+        text = '{"a": [1, 2], "b": "line\\nbreak"}\n'
+        self.assertIs(sanitize_text(text), text)
+        self.assertEqual(sanitize_text("a\x07b\x7f"), "ab")
+
+    def test_non_ascii_text_without_changes_is_returned_unchanged(self):
+        text = '{"name": "Zoë"}'
+        self.assertIs(sanitize_text(text), text)
+
+    def test_sanitize_json_keeps_string_contents(self):
+        text = '{\u201ca\u201d:\u00a0"\u201chi\u201d it\u2019s\u00a0\u200b", "b": "x\\"\u2019"}'
+        self.assertEqual(sanitize_json(text), '{"a": "\u201chi\u201d it\u2019s\u00a0", "b": "x\\"\u2019"}')
+        plain = '{"q": "\u201chi\u201d"}'
+        self.assertEqual(sanitize_json(plain), plain)
+
+    def test_configuration(self):
+        text = "\u201cquoted\u201d\u00a0\x00"
+        self.assertEqual(Sanitizer(quotes=False).sanitize(text), "\u201cquoted\u201d ")
+        self.assertEqual(Sanitizer(spaces=False, controls=False).sanitize(text), '"quoted"\u00a0\x00')
+        self.assertEqual(Sanitizer(extra={"'": '"', "\u2026": "..."}).sanitize("'a\u2026'"), '"a..."')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+from fluxon.schema_compiler import compile_schema_parser, json_equal
+from fluxon.validator import parse_and_validate
+
+
+class Item(BaseModel):
+    name: str
+    qty: int = 1
+    tags: List[str] = []
+
+
+class Order(BaseModel):
+    id: int
+    paid: bool = False
+    items: List[Item]
+    note: Optional[str] = None
+
+
+class Node(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    v: int
+    child: Optional["Node"] = None
+
+
+class TestSchemaCompiler(unittest.TestCase):
+    inputs = [
+        '{"id": 1, "items": [{"name": "a"}]}',
+        '{"id": "7", "paid": "true", "items": [{"name": "a", "qty": "3", "tags": ["x"]}]}',
+        '{"id": 2, "items": [{"name": 5}], "note": null}',
+        '{"id": 2, "items": [{"qty": 1}]}',
+        '{"id": 2.0, "items": [], "extra": {"nested": [1, 2]}}',
+        '{"id": true, "items": "none"}',
+        'BEGIN_JSON {"id": 3, "items": [{"name": "b"}] // comment\n} END_JSON',
+        '{"id": 4 "items": []}',
+        'not json at all',
+        '[1, 2, 3]',
+    ]
+
+    def assert_matches_generic(self, schema, inputs):
+        parser = compile_schema_parser(schema)
+        for json_str in inputs:
+            with self.subTest(json_str=json_str):
+                self.assertEqual(parser(json_str), parse_and_validate(json_str, schema))
+        return parser
+
+    def test_pydantic_model(self):
+        parser = self.assert_matches_generic(Order, self.inputs)
+        self.assertTrue(parser.specialized_validation)
+        self.assertIs(parser, compile_schema_parser(Order))
+
+    def test_recursive_model(self):
+        inputs = [
+            '{"v": "1", "x": 1, "child": {"v": "2", "y": 2, "child": {"v": "3", "z": 3}}}',
+            '{"v": 1, "child": null}',
+        ]
+        parser = self.assert_matches_generic(Node, inputs)
+        self.assertEqual(parser(inputs[0]), ({"v": 1, "child": {"v": 2, "child": {"v": 3, "child": None}}}, True))
+
+    def test_keywords(self):
+        schema = {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer", "minimum": 1, "exclusiveMaximum": 10},
+                "status": {"enum": ["open", "closed", 1]},
+                "code": {"type": "string", "minLength": 2, "maxLength": 3},
+                "items": {"type": "array", "maxItems": 1, "items": {"type": ["string", "null"]}},
+                "flag": {"const": True},
+                "meta": {"type": "object", "additionalProperties": {"type": "integer"}, "maxProperties": 1},
+                "choice": {"oneOf": [{"type": "integer"}, {"type": "number", "minimum": 5}]},
+            },
+            "required": ["id"],
+            "additionalProperties": False,
+        }
+        inputs = [
+            '{"id": 1}',
+            '{"id": 0}',
+            '{"id": 10}',
+            '{"id": "5", "status": "open", "code": "ab", "items": [null], "flag": true, "meta": {"a": 1}}',
+            '{"id": 5, "status": true}',
+            '{"id": 5, "status": 1.0}',
+            '{"id": 5, "code": "abcd"}',
+            '{"id": 5, "items": ["a", "b"]}',
+            '{"id": 5, "flag": 1}',
+            '{"id": 5, "meta": {"a": 1, "b": 2}}',
+            '{"id": 5, "meta": {"a": "x"}}',
+            '{"id": 5, "choice": 7}',
+            '{"id": 5, "choice": 7.5}',
+            '{"id": 5, "unknown": 1}',
+        ]
+        parser = self.assert_matches_generic(schema, inputs)
+        self.assertTrue(parser.specialized_validation)
+
+    def test_unsupported_keywords_fall_back(self):
+        schema = {
+            "type": "object",
+            "properties": {"code": {"type": "string", "pattern": "^[A-Z]+$"}, "n": {"type": "integer", "default": 0}},
+        }
+        parser = self.assert_matches_generic(schema, ['{"code": "ABC"}', '{"code": "abc", "n": "2"}'])
+        self.assertFalse(parser.specialized_validation)
+
+    def test_json_equal(self):
+        self.assertTrue(json_equal(1, 1.0))
+        self.assertFalse(json_equal(1, True))
+        self.assertTrue(json_equal({"a": [1, {"b": None}]}, {"a": [1.0, {"b": None}]}))
+        self.assertFalse(json_equal([1], {"0": 1}))
+
+
+if __name__ == "__main__":
+    unittest.main()
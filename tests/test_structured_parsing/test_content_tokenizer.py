@@ -1,6 +1,6 @@
 import unittest
-from fluxon.structured_parsing.content_tokenizer import ContentTokenizer, CommentedJsonPartTypes
-from fluxon.structured_parsing.exceptions import MalformedJsonError
+from fluxon.structured_parsing.content_tokenizer import ContentTokenizer, CommentedJsonPartTypes, BraceScanner, StreamingContentTokenizer
+from fluxon.structured_parsing.exceptions import MalformedJsonError, UnRecognizedInputFormatError
 
 
 class TestContentTokenizer(unittest.TestCase):
@@ -32,3 +32,67 @@ class TestContentTokenizer(unittest.TestCase):
         input_text = "{This is not valid JSON"
         with self.assertRaises(MalformedJsonError):
             self.tokenizer.tokenize(input_text)
+
+    def test_iter_spans(self):
+        input_text = "  Intro  {\"a\": 1}\n{\"b\": 2}  outro "
+        spans = list(self.tokenizer.iter_spans(input_text))
+        self.assertEqual(
+            [(part_type, input_text[start:end]) for part_type, start, end in spans],
+            [
+                (CommentedJsonPartTypes.FREE_TEXT, "Intro"),
+                (CommentedJsonPartTypes.JSON_OBJECT, '{"a": 1}'),
+                (CommentedJsonPartTypes.JSON_OBJECT, '{"b": 2}'),
+                (CommentedJsonPartTypes.FREE_TEXT, "outro"),
+            ]
+        )
+
+    def test_braces_in_strings_and_comments(self):
+        input_text = '{"a": "}", // closing } here\n "b": "\\"}"} after'
+        tokens = self.tokenizer.tokenize(input_text)
+        self.assertEqual(len(tokens), 2)
+        self.assertEqual(tokens[0]["value"], input_text[:-6])
+        self.assertEqual(tokens[1]["value"], "after")
+
+    def test_unexpected_closing_brace(self):
+        with self.assertRaises(UnRecognizedInputFormatError):
+            self.tokenizer.tokenize("text } more")
+
+    def test_brace_scanner_resumes_across_chunks(self):
+        scanner = BraceScanner()
+        text = '{"a": "x\\'
+        object_end, resume = scanner.scan(text, 0)
+        self.assertIsNone(object_end)
+        self.assertEqual(resume, len(text) - 1)
+        text += '"", /'
+        object_end, resume = scanner.scan(text, resume)
+        self.assertIsNone(object_end)
+        text += '* } */ }'
+        object_end, _ = scanner.scan(text, resume)
+        self.assertEqual(object_end, len(text))
+
+
+class TestStreamingContentTokenizer(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = StreamingContentTokenizer()
+
+    def test_matches_batch_tokenizer_for_any_chunk_size(self):
+        input_text = (
+            'Intro text. {"a": "}", "b": {"c": [1, 2]}, // note }\n "d": "\\\\"} middle /* */ '
+            '{"e": 1 /* block } */} outro'
+        )
+        expected = ContentTokenizer().tokenize(input_text)
+        for size in range(1, len(input_text) + 1):
+            chunks = [input_text[i:i + size] for i in range(0, len(input_text), size)]
+            self.assertEqual(list(self.tokenizer.tokenize_stream(chunks)), expected)
+
+    def test_emits_objects_as_soon_as_complete(self):
+        self.assertEqual(self.tokenizer.feed('Hello '), [])
+        self.assertEqual(self.tokenizer.feed('{"a": '), [{"type": CommentedJsonPartTypes.FREE_TEXT, "value": "Hello"}])
+        tokens = self.tokenizer.feed('1} world')
+        self.assertEqual(tokens, [{"type": CommentedJsonPartTypes.JSON_OBJECT, "value": '{"a": 1}'}])
+        self.assertEqual(self.tokenizer.close(), [{"type": CommentedJsonPartTypes.FREE_TEXT, "value": "world"}])
+
+    def test_unterminated_object(self):
+        self.tokenizer.feed('{"a": 1')
+        with self.assertRaises(MalformedJsonError):
+            self.tokenizer.close()
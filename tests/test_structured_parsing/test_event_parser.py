@@ -0,0 +1,108 @@
+import unittest
+from fluxon.structured_parsing.event_parser import (
+    CommentedJsonEventParser,
+    CommentedJsonVisitor,
+    CallbackVisitor,
+    STOP,
+    SKIP,
+)
+from fluxon.structured_parsing.exceptions import MalformedJsonError
+
+
+class RecordingVisitor(CommentedJsonVisitor):
+    def __init__(self):
+        self.events = []
+
+    def on_object_start(self):
+        self.events.append(("object_start",))
+
+    def on_object_end(self):
+        self.events.append(("object_end",))
+
+    def on_array_start(self):
+        self.events.append(("array_start",))
+
+    def on_array_end(self):
+        self.events.append(("array_end",))
+
+    def on_key(self, key):
+        self.events.append(("key", key))
+
+    def on_value(self, value, value_type):
+        self.events.append(("value", value, value_type))
+
+    def on_comment(self, comment, comment_type):
+        self.events.append(("comment", comment, comment_type))
+
+
+class TestCommentedJsonEventParser(unittest.TestCase):
+    def setUp(self):
+        self.parser = CommentedJsonEventParser()
+
+    def test_events(self):
+        visitor = RecordingVisitor()
+        completed = self.parser.parse('{"a": "x", // note\n /* block */ "b": [1, 2.5, true, null], "c": {}}', visitor)
+        self.assertTrue(completed)
+        self.assertEqual(visitor.events, [
+            ("object_start",),
+            ("key", "a"), ("value", "x", "string"),
+            ("comment", "note", "inline"),
+            ("comment", "block", "block"),
+            ("key", "b"), ("array_start",),
+            ("value", 1, "primitive"), ("value", 2.5, "primitive"),
+            ("value", True, "primitive"), ("value", None, "primitive"),
+            ("array_end",),
+            ("key", "c"), ("object_start",), ("object_end",),
+            ("object_end",),
+        ])
+
+    def test_stop_early(self):
+        seen = {}
+        current = []
+
+        def on_key(key):
+            current[:] = [key]
+
+        def on_value(value, value_type):
+            if current == ["action"]:
+                seen["action"] = value
+                return STOP
+
+        visitor = CallbackVisitor(on_key=on_key, on_value=on_value)
+        self.assertFalse(self.parser.parse('{"action": "search", "query": {"unclosed": ', visitor))
+        self.assertEqual(seen, {"action": "search"})
+
+    def test_skip_subtrees(self):
+        visitor = RecordingVisitor()
+        visitor.on_key = lambda key: SKIP if key == "sources" else visitor.events.append(("key", key))
+        self.parser.parse('{"sources": [{"x": "]"}, 2], "answer": 42}', visitor)
+        self.assertEqual(visitor.events, [
+            ("object_start",), ("key", "answer"), ("value", 42, "primitive"), ("object_end",)
+        ])
+
+    def test_escaped_strings(self):
+        visitor = RecordingVisitor()
+        self.parser.parse('{"a \\"b\\"": "say \\"hi\\"\\n\\u00e9"}', visitor)
+        self.assertEqual(visitor.events[1:3], [("key", 'a "b"'), ("value", 'say "hi"\n\u00e9', "string")])
+
+    def test_skip_keeps_trailing_comment(self):
+        visitor = RecordingVisitor()
+        visitor.on_key = lambda key: SKIP if key == "sources" else visitor.events.append(("key", key))
+        self.parser.parse('{"sources": [1, 2], // cited\n "answer": "x" // final\n}', visitor)
+        self.assertEqual(visitor.events, [
+            ("object_start",), ("comment", "cited", "inline"),
+            ("key", "answer"), ("value", "x", "string"), ("comment", "final", "inline"),
+            ("object_end",),
+        ])
+
+    def test_unknown_callback(self):
+        with self.assertRaises(TypeError):
+            CallbackVisitor(on_unknown=print)
+
+    def test_malformed(self):
+        with self.assertRaises(MalformedJsonError):
+            self.parser.parse('{"a": [1}', CommentedJsonVisitor())
+
+
+if __name__ == "__main__":
+    unittest.main()
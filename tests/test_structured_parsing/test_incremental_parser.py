@@ -0,0 +1,70 @@
+import unittest
+from fluxon.structured_parsing.fluxon_structured_parser import FluxonStructuredParser
+from fluxon.structured_parsing.incremental_parser import IncrementalStructuredParser, IncrementalEventTypes
+from fluxon.structured_parsing.exceptions import MalformedJsonError
+
+
+class TestIncrementalStructuredParser(unittest.TestCase):
+    input_text = """
+    This is some free text before the JSON.
+    {
+        "key1": "value1", // Inline comment for key1
+        /* Block comment for key2 */
+        "key2": {
+            "nestedKey1": "nested, {braced} value",
+            "nestedKey2": ["arrayValue1", 123, {"deepKey": "deepValue"}] // Inline comment for nestedKey2
+        },
+        "key3": [1, 2, 3],
+        "key4": "value4"
+    }
+    More free text after the JSON. {"last": 1}
+    """
+
+    def test_matches_parse_for_any_chunk_size(self):
+        expected = FluxonStructuredParser().parse(self.input_text)
+        for size in (1, 2, 3, 7, 16, 64, len(self.input_text)):
+            parser = IncrementalStructuredParser()
+            chunks = [self.input_text[i:i + size] for i in range(0, len(self.input_text), size)]
+            events = list(parser.parse_stream(chunks))
+            self.assertEqual(parser.parsed_output, expected)
+            segments = [event["value"] for event in events if event["type"] == IncrementalEventTypes.SEGMENT]
+            self.assertEqual(segments, expected)
+
+    def test_emits_members_before_object_closes(self):
+        parser = IncrementalStructuredParser()
+        events = parser.feed('Thinking... {"action": "search", "query": "weather')
+        self.assertEqual(events[0]["type"], IncrementalEventTypes.SEGMENT)
+        self.assertEqual([event["value"]["key"] for event in events[1:]], ["action"])
+        self.assertEqual([token["key"] for token in parser.partial_object], ["action"])
+
+        events = parser.feed('", "limit": 3}')
+        self.assertEqual([event["type"] for event in events], [IncrementalEventTypes.TOKEN] * 2 + [IncrementalEventTypes.SEGMENT])
+        self.assertEqual([token["key"] for token in events[-1]["value"]["value"]], ["action", "query", "limit"])
+        self.assertEqual(parser.partial_object, [])
+
+    def test_projection(self):
+        parser = IncrementalStructuredParser(projection=["answer"])
+        list(parser.parse_stream(['{"answer": 1, "sources": [{"a": ', '1}]}']))
+        self.assertEqual([token["key"] for token in parser.parsed_output[0]["value"]], ["answer"])
+
+    def test_unterminated_object(self):
+        parser = IncrementalStructuredParser()
+        parser.feed('{"a": 1')
+        with self.assertRaises(MalformedJsonError):
+            parser.close()
+
+    def test_reuse_after_close(self):
+        parser = IncrementalStructuredParser()
+        parser.feed('{"a": 1')
+        with self.assertRaises(MalformedJsonError):
+            parser.close()
+        list(parser.parse_stream(['Done: {"b": ', '2}']))
+        self.assertEqual(parser.parsed_output, FluxonStructuredParser().parse('Done: {"b": 2}'))
+
+        list(parser.parse_stream(['{"c": 3}']))
+        self.assertEqual([token["key"] for token in parser.parsed_output[0]["value"]], ["c"])
+        self.assertEqual(len(parser.parsed_output), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
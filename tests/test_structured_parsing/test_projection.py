@@ -0,0 +1,78 @@
+import unittest
+from typing import List, Optional
+from pydantic import BaseModel
+from fluxon.structured_parsing.projection import Projection, build_projection
+from fluxon.structured_parsing.commented_json_tokenizer import CommentedJsonTokenizer
+from fluxon.structured_parsing.exceptions import MalformedJsonError
+from fluxon.structured_parsing.fluxon_structured_parser import FluxonStructuredParser
+
+
+class Source(BaseModel):
+    title: str
+
+
+class Answer(BaseModel):
+    answer: str
+    sources: List[Source]
+    meta: Optional[Source] = None
+
+
+class TestProjection(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = CommentedJsonTokenizer()
+
+    def test_from_paths(self):
+        projection = Projection.from_paths(["answer", "sources.title", "sources"])
+        self.assertIn("answer", projection)
+        self.assertIsNone(projection.child("answer"))
+        self.assertIsNone(projection.child("sources"))  # The shorter path wins
+
+    def test_from_model(self):
+        projection = build_projection(Answer)
+        self.assertEqual(set(projection.fields), {"answer", "sources", "meta"})
+        self.assertEqual(set(projection.child("sources").fields), {"title"})
+        self.assertEqual(set(projection.child("meta").fields), {"title"})
+
+    def test_unsupported_specification(self):
+        with self.assertRaises(TypeError):
+            build_projection(42)
+
+    def test_tokenize_skips_unrequested_keys(self):
+        input_text = '''{
+            "answer": "42", // The answer
+            "sources": [{"title": "a", "body": "text with } and ]"}, {"title": "b"}],
+            "debug": {"trace": [1, 2, {"deep": "}"}]}, // Skipped comment
+            "score": 0.5
+        }'''
+        tokens = self.tokenizer.tokenize(input_text, Projection.from_paths(["answer", "score"]))
+        self.assertEqual([token["key"] for token in tokens], ["answer", "score"])
+        self.assertEqual(tokens[0]["comment"], "The answer")
+        self.assertEqual(tokens[1]["value"], 0.5)
+
+    def test_tokenize_skips_strings_with_escaped_quotes(self):
+        input_text = '{"debug": "a\\"b, \\"c\\": 1", "answer": "yes"}'
+        tokens = self.tokenizer.tokenize(input_text, Projection.from_paths(["answer"]))
+        self.assertEqual([(token["key"], token["value"]) for token in tokens], [("answer", "yes")])
+
+    def test_skip_value_at_end_of_input(self):
+        with self.assertRaises(MalformedJsonError):
+            self.tokenizer.skip_value('"debug":   ', 8)
+
+    def test_tokenize_projects_into_arrays(self):
+        input_text = '{"sources": [{"title": "a", "body": "x"}, {"body": "y", "title": "b"}]}'
+        tokens = self.tokenizer.tokenize(input_text, Projection.from_paths(["sources.title"]))
+        elements = tokens[0]["value"]
+        self.assertEqual([element["value"][0]["key"] for element in elements], ["title", "title"])
+        self.assertEqual([len(element["value"]) for element in elements], [1, 1])
+
+    def test_parser_with_projection(self):
+        parser = FluxonStructuredParser()
+        input_text = 'Result: {"answer": "yes", "sources": [{"title": "a", "body": "b"}], "extra": 1}'
+        result = parser.parse(input_text, projection=Answer)
+        tokens = result[1]["value"]
+        self.assertEqual([token["key"] for token in tokens], ["answer", "sources"])
+        self.assertEqual(len(tokens[1]["value"][0]["value"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
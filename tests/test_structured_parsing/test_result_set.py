@@ -0,0 +1,52 @@
+import unittest
+from fluxon.structured_parsing.fluxon_structured_parser import FluxonStructuredParser
+from fluxon.structured_parsing.result_set import ParsedResultSet
+
+
+class TestParsedResultSet(unittest.TestCase):
+    def setUp(self):
+        self.parser = FluxonStructuredParser()
+        self.input_text = (
+            'First: {"action": "search"} '
+            'Second: {"action": "answer", "text": "done", "sources": [{"url": "a"}]} '
+            'Third: {"text": "maybe", "score": 3}'
+        )
+        self.schema = {
+            "type": "object",
+            "properties": {"action": {"type": "string"}},
+            "required": ["action"],
+        }
+
+    def test_metadata(self):
+        result_set = self.parser.parse_result_set(self.input_text, schema=self.schema)
+        self.assertEqual(len(result_set), 3)
+        self.assertEqual([parsed.key_count for parsed in result_set], [1, 3, 2])
+        self.assertEqual([parsed.depth for parsed in result_set], [1, 3, 1])
+        self.assertEqual([parsed.schema_valid for parsed in result_set], [True, True, False])
+        self.assertEqual(result_set[0].byte_size, len('{"action": "search"}'))
+        self.assertEqual(result_set[2].to_python(), {"text": "maybe", "score": 3})
+
+    def test_top_k_and_filters(self):
+        result_set = self.parser.parse_result_set(self.input_text, schema=self.schema)
+        self.assertEqual([parsed.index for parsed in result_set.top_k(2)], [1, 2])
+        self.assertEqual([parsed.index for parsed in result_set.top_k(2, key="byte_size", largest=False)], [0, 2])
+        self.assertEqual([parsed.index for parsed in result_set.with_keys("text")], [1, 2])
+        self.assertEqual(result_set.best(objects=result_set.valid()).index, 1)
+        self.assertEqual(result_set.best(key=lambda parsed: -parsed.index).index, 0)
+        self.assertIsNone(result_set.best(objects=result_set.with_keys("missing")))
+
+    def test_from_parsed_output(self):
+        result_set = ParsedResultSet.from_parsed_output(self.parser.parse(self.input_text))
+        self.assertEqual(result_set[0].byte_size, len('{"action":"search"}'))
+        self.assertIsNone(result_set[0].schema_valid)
+
+    def test_get_sorted_json_objects_sorts_before_limiting(self):
+        parsed_output = self.parser.parse(self.input_text)
+        largest = self.parser.get_sorted_json_objects(parsed_output, num_objects=1, ascending=False)
+        self.assertEqual(len(largest), 1)
+        self.assertEqual(largest[0][0]["value"], "answer")
+        self.assertEqual(len(self.parser.get_sorted_json_objects(parsed_output)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from fluxon.structured_parsing.segment_scanner import SegmentScanner, SegmentTypes
+from fluxon.structured_parsing.fluxon_structured_parser import FluxonStructuredParser
+from fluxon.structured_parsing.content_tokenizer import CommentedJsonPartTypes
+
+
+class TestSegmentScanner(unittest.TestCase):
+    def setUp(self):
+        self.scanner = SegmentScanner()
+
+    def segments(self, input_text):
+        return [
+            (segment.segment_type, segment.text(input_text), segment.complete)
+            for segment in self.scanner.iter_segments(input_text)
+        ]
+
+    def test_all_delimiters_in_one_pass(self):
+        input_text = (
+            'Intro BEGIN_JSON\n{"a": 1}\nEND_JSON then\n```json\n{"b": 2}\n```\n'
+            '```python\nx = {}\n```\nbare {"c": "END_JSON"} end'
+        )
+        self.assertEqual(self.segments(input_text), [
+            (SegmentTypes.FREE_TEXT, "Intro", True),
+            (SegmentTypes.TAGGED, '{"a": 1}', True),
+            (SegmentTypes.FREE_TEXT, "then", True),
+            (SegmentTypes.FENCED, '{"b": 2}', True),
+            (SegmentTypes.FREE_TEXT, "```python\nx = {}\n```\nbare", True),
+            (SegmentTypes.JSON_OBJECT, '{"c": "END_JSON"}', True),
+            (SegmentTypes.FREE_TEXT, "end", True),
+        ])
+
+    def test_missing_delimiters(self):
+        self.assertEqual(self.segments('BEGIN_JSON {"a": 1}'), [(SegmentTypes.TAGGED, '{"a": 1}', False)])
+        self.assertEqual(self.segments('{"a": 1} END_JSON'), [
+            (SegmentTypes.JSON_OBJECT, '{"a": 1}', True),
+            (SegmentTypes.TAGGED, "", False),
+        ])
+        self.assertEqual(self.segments('```json\n{"a": 1'), [(SegmentTypes.FENCED, '{"a": 1', False)])
+
+    def test_custom_tags(self):
+        scanner = SegmentScanner(tags=[("<json>", "</json>")], fences=False, braces=False)
+        input_text = "x <json>{}</json> ```json\n{}\n```"
+        self.assertEqual(
+            [segment.segment_type for segment in scanner.iter_segments(input_text)],
+            [SegmentTypes.FREE_TEXT, SegmentTypes.TAGGED, SegmentTypes.FREE_TEXT],
+        )
+
+    def test_structured_parser_with_scanner(self):
+        parser = FluxonStructuredParser(segment_scanner=self.scanner)
+        result = parser.parse('Here:\n```json\n{"key1": "value1"} // done\n```\nBEGIN_JSON{"key2": 2}END_JSON')
+        self.assertEqual(
+            [segment["type"] for segment in result],
+            [CommentedJsonPartTypes.FREE_TEXT, CommentedJsonPartTypes.JSON_OBJECT,
+             CommentedJsonPartTypes.FREE_TEXT, CommentedJsonPartTypes.JSON_OBJECT],
+        )
+        self.assertEqual(result[3]["value"][0]["key"], "key2")
+
+
+if __name__ == "__main__":
+    unittest.main()
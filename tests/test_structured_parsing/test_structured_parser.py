@@ -1,4 +1,5 @@
 import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from fluxon.structured_parsing.fluxon_structured_parser import FluxonStructuredParser
 from fluxon.structured_parsing.content_tokenizer import CommentedJsonPartTypes
 from fluxon.utils import normalize_json
@@ -42,3 +43,21 @@ class TestFluxonStructuredParser(unittest.TestCase):
         result = self.parser.parse(input_text)
         rendered = normalize_json(self.parser.render(result, compact=True))
         self.assertEqual(rendered, normalize_json('{"key1":"value1","key2":{"nestedKey":"nestedValue"}}'))
+
+    def test_parse_batch_threads(self):
+        texts = [f'Item {i}: {{"index": {i}, "items": [{i}, {{"nested": "{i}"}}]}}' for i in range(50)]
+        expected = [self.parser.parse(text) for text in texts]
+        self.assertEqual(self.parser.parse_batch(texts, workers=4), expected)
+
+    def test_parse_batch_processes(self):
+        texts = ['{"a": 1} text', 'more {"b": {"c": 2}, "d": 3}']
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            result = self.parser.parse_batch(texts, projection=["b"], executor=executor)
+        self.assertEqual(result, [self.parser.parse(text, ["b"]) for text in texts])
+
+    def test_shared_instance_across_threads(self):
+        texts = [f'{{"k{i}": {{"v": {i}}}}}' for i in range(200)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self.parser.parse, texts))
+        for i, result in enumerate(results):
+            self.assertEqual(result[0]["value"][0]["key"], f"k{i}")
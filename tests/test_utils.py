@@ -1,7 +1,18 @@
 import unittest
 import logging
 import json
-from fluxon.utils import normalize_json, clean_string, timer, setup_logger
+from fluxon.utils import (
+    normalize_json,
+    clean_string,
+    timer,
+    setup_logger,
+    Preview,
+    RateLimitFilter,
+    get_logger,
+    canonical_json,
+    fingerprint,
+    deduplicate,
+)
 
 
 class TestUtils(unittest.TestCase):
@@ -17,6 +28,28 @@ class TestUtils(unittest.TestCase):
         result = normalize_json(input_json)
         self.assertEqual(result, input_json)  # Should return the original invalid string
 
+    def test_canonical_json(self):
+        obj = {"b": [1.0, 2.5, {"z": 3, "a": -0.0}], "a": "é"}
+        self.assertEqual(canonical_json(obj), '{"a":"é","b":[1,2.5,{"a":0,"z":3}]}')
+        self.assertEqual(obj["b"][0], 1.0)  # The input is not modified
+        self.assertIsInstance(obj["b"][0], float)
+
+    def test_fingerprint_ignores_key_order_and_number_format(self):
+        first = json.loads('{"answer": 42.0, "steps": ["a", "b"]}')
+        second = json.loads('{"steps": ["a", "b"], "answer": 42}')
+        self.assertEqual(fingerprint(first), fingerprint(second))
+        self.assertNotEqual(fingerprint(first), fingerprint({"answer": 42, "steps": ["b", "a"]}))
+        self.assertEqual(len(fingerprint(first)), 32)
+
+    def test_deduplicate(self):
+        samples = [{"a": 1}, {"a": 2}, {"a": 1.0}, {"a": 2}, {"a": 1}, {"a": 3}]
+        groups = deduplicate(samples)
+        self.assertEqual([group["count"] for group in groups], [3, 2, 1])
+        self.assertEqual(groups[0]["indices"], [0, 2, 4])
+        self.assertEqual(groups[0]["value"], {"a": 1})
+        self.assertEqual(groups[1]["fingerprint"], fingerprint({"a": 2}))
+        self.assertEqual(deduplicate([]), [])
+
     def test_clean_string(self):
         input_str = "Hello, World!  \n\t  \r "
         expected_output = "Hello, World!"
@@ -29,6 +62,9 @@ class TestUtils(unittest.TestCase):
         result = clean_string(input_str)
         self.assertEqual(result, expected_output)
 
+    def test_clean_string_keeps_internal_newlines(self):
+        self.assertEqual(clean_string("\u200b line one\nline\u00a0two\x07 "), "line one\nline two")
+
     def test_timer_decorator(self):
         @timer
         def sample_function():
@@ -48,6 +84,58 @@ class TestUtils(unittest.TestCase):
             logger.debug("This is a debug message")
         self.assertIn("This is a debug message", log.output[0])
 
+    def test_setup_logger_does_not_duplicate_handlers(self):
+        logger = setup_logger("test_logger_twice")
+        setup_logger("test_logger_twice", level=logging.WARNING)
+        self.assertEqual(len(logger.handlers), 1)
+        self.assertEqual(logger.level, logging.WARNING)
+
+    def test_preview_truncates(self):
+        self.assertEqual(str(Preview("short")), "'short'")
+        preview = str(Preview("x" * 500, limit=10))
+        self.assertEqual(preview, "'xxxxxxxxxx'... (500 chars)")
+
+    def test_rate_limit_filter(self):
+        logger = logging.getLogger("test_rate_limited")
+        rate_limit = RateLimitFilter(interval=3600)
+        logger.addFilter(rate_limit)
+        try:
+            with self.assertLogs("test_rate_limited", level="WARNING") as log:
+                for i in range(5):
+                    logger.warning("Failure %d", i)
+                logger.warning("Other failure")
+                rate_limit.last_emitted.clear()  # As if the interval had passed
+                logger.warning("Failure %d", 5)
+        finally:
+            logger.removeFilter(rate_limit)
+        self.assertEqual(len(log.records), 3)
+        self.assertEqual(log.records[2].getMessage(), "Failure 5 (4 similar messages suppressed)")
+        self.assertEqual([record.suppressed for record in log.records], [0, 0, 4])
+
+    def test_rate_limit_filter_keeps_literal_percent(self):
+        logger = logging.getLogger("test_rate_limited_percent")
+        rate_limit = RateLimitFilter(interval=3600)
+        logger.addFilter(rate_limit)
+        try:
+            with self.assertLogs("test_rate_limited_percent", level="WARNING") as log:
+                logger.warning("100% failed")
+                logger.warning("100% failed")
+                rate_limit.last_emitted.clear()
+                logger.warning("100% failed")
+                logger.warning({"rate": 1})
+                logger.warning({"rate": 1})
+                rate_limit.last_emitted.clear()
+                logger.warning({"rate": 1})
+        finally:
+            logger.removeFilter(rate_limit)
+        self.assertEqual(log.records[1].getMessage(), "100% failed (1 similar messages suppressed)")
+        self.assertEqual(log.records[3].getMessage(), "{'rate': 1} (1 similar messages suppressed)")
+
+    def test_get_logger_adds_filter_once(self):
+        logger = get_logger("fluxon.test_module")
+        get_logger("fluxon.test_module")
+        self.assertEqual(len(logger.filters), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,29 @@
+import copy
+import os
+import subprocess
+import sys
 import unittest
-from jsonschema import ValidationError
-from pydantic import BaseModel
-from fluxon.validator import validate_with_schema, generate_schema, repair_with_schema
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Optional
+from unittest import mock
+from jsonschema import SchemaError
+from pydantic import BaseModel, ConfigDict
+from fluxon.utils import rate_limit_filter
+from fluxon.validator import (
+    validate_with_schema,
+    generate_schema,
+    repair_with_schema,
+    get_validator,
+    schema_key,
+    SchemaCache,
+    ValidatorRegistry,
+    validate_many,
+    parse_with_model,
+    get_type_adapter,
+    compile_repair_plan,
+)
+
+SRC_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src"))
 
 
 class TestValidator(unittest.TestCase):
@@ -30,6 +52,94 @@ class TestValidator(unittest.TestCase):
         }
         self.assertFalse(validate_with_schema(json_obj, schema))
 
+    def test_validate_with_schema_logs_best_error(self):
+        schema = {"type": "object", "properties": {"age": {"type": "integer"}}}
+        rate_limit_filter.reset()
+        with self.assertLogs("fluxon.validator", level="INFO") as log:
+            self.assertFalse(validate_with_schema({"age": "old"}, schema))
+        self.assertIn("$.age", log.output[0])
+
+    def test_validator_is_compiled_once(self):
+        schema = {"type": "object", "properties": {"a": {"type": "integer"}}}
+        reordered = {"properties": {"a": {"type": "integer"}}, "type": "object"}
+        self.assertEqual(schema_key(schema), schema_key(reordered))
+        self.assertIs(get_validator(schema), get_validator(reordered))
+
+    def test_registry_lru_eviction(self):
+        registry = ValidatorRegistry(maxsize=2)
+        first = registry.get({"type": "string"})
+        registry.get({"type": "integer"})
+        registry.get({"type": "string"})
+        registry.get({"type": "number"})  # Evicts "integer", the least recently used
+        self.assertEqual(len(registry), 2)
+        self.assertIs(registry.get({"type": "string"}), first)
+
+    def test_registry_identity_fast_path(self):
+        registry = ValidatorRegistry()
+        schema = {"type": "string"}
+        first = registry.get(schema)
+        with mock.patch("fluxon.validator.schema_key") as key:
+            self.assertIs(registry.get(schema), first)
+        key.assert_not_called()
+        self.assertIs(registry.get({"type": "string"}), first)
+
+    def test_cached_schemas_follow_caller_mutations(self):
+        schema = {"type": "object", "properties": {"a": {"type": "integer", "default": 1}}}
+        untouched = copy.deepcopy(schema)
+        self.assertTrue(validate_with_schema({"a": 1}, schema))
+        self.assertEqual(repair_with_schema({}, schema), {"a": 1})
+        schema["properties"]["a"] = {"type": "string", "default": "x"}
+        self.assertTrue(validate_with_schema({"a": "x"}, schema))
+        self.assertFalse(validate_with_schema({"a": "x"}, untouched))
+        self.assertEqual(repair_with_schema({}, schema), {"a": "x"})
+
+        const = {"const": 1}
+        self.assertTrue(validate_with_schema(1, const))
+        const["const"] = True
+        self.assertFalse(validate_with_schema(1, const))
+
+    def test_schema_cache_is_abstract(self):
+        with self.assertRaises(TypeError):
+            SchemaCache()
+
+    def test_invalid_schema(self):
+        with self.assertRaises(SchemaError):
+            validate_with_schema({}, {"type": "not-a-type"})
+
+    def test_validate_across_threads(self):
+        schema = {"type": "object", "required": ["id"]}
+        objects = [{"id": i} if i % 2 else {} for i in range(100)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda obj: validate_with_schema(obj, schema), objects))
+        self.assertEqual(results, [bool(i % 2) for i in range(100)])
+
+    def test_validate_many(self):
+        schema = {
+            "type": "object",
+            "properties": {"id": {"type": "integer"}, "tags": {"type": "array", "items": {"type": "string"}}},
+            "required": ["id"],
+        }
+        objects = [{"id": i, "tags": ["a", 1] if i % 5 == 0 else []} for i in range(20)] + [{}]
+        result = validate_many(objects, schema, workers=4, chunk_size=3)
+        self.assertEqual(len(result), 21)
+        self.assertEqual(result.failures(), [0, 5, 10, 15, 20])
+        self.assertEqual(list(result), [i % 5 != 0 for i in range(20)] + [False])
+        self.assertEqual(result.valid_count, 16)
+        self.assertFalse(result.all_valid)
+        self.assertEqual(result.errors[5], [("$.tags[1]", "1 is not of type 'string'")])
+        self.assertEqual(result.errors[20], [("$", "'id' is a required property")])
+
+        with mock.patch("fluxon.validator.ThreadPoolExecutor") as pool:
+            inline = validate_many(objects, schema, chunk_size=3)
+        pool.assert_not_called()
+        self.assertEqual(inline.errors, result.errors)
+
+    def test_validate_many_process_pool(self):
+        schema = {"type": "integer"}
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            result = validate_many([1, "2", 3, None], schema, chunk_size=2, executor=executor)
+        self.assertEqual(list(result), [True, False, True, False])
+
     def test_generate_schema(self):
         class User(BaseModel):
             name: str
@@ -46,6 +156,28 @@ class TestValidator(unittest.TestCase):
         }
         self.assertEqual(generate_schema(User), expected_schema)
 
+    def test_parse_with_model(self):
+        class User(BaseModel):
+            name: str
+            age: int
+
+        self.assertEqual(parse_with_model('{"name": "Alice", "age": 25}', User), User(name="Alice", age=25))
+        self.assertEqual(
+            parse_with_model('BEGIN_JSON {"name": "Alice", "age": 25} // note\nEND_JSON', User),
+            User(name="Alice", age=25),
+        )
+        self.assertEqual(parse_with_model('{"name": "Alice", "age": 25 "x": 1}', User), User(name="Alice", age=25))
+        self.assertIsNone(parse_with_model('{"name": "Alice"}', User))
+        self.assertIs(get_type_adapter(User), get_type_adapter(User))
+
+    def test_parse_with_model_rejects_unrecoverable_output(self):
+        class Options(BaseModel):
+            verbose: bool = False
+            limit: int = 10
+
+        self.assertIsNone(parse_with_model("Sorry, I cannot help with that.", Options))
+        self.assertEqual(parse_with_model("{}", Options), Options())
+
     def test_repair_with_schema(self):
         json_obj = {"name": "Alice"}
         schema = {
@@ -72,6 +204,86 @@ class TestValidator(unittest.TestCase):
         expected_output = {"name": "Alice"}
         self.assertEqual(repair_with_schema(json_obj, schema), expected_output)
 
+    def test_repair_with_schema_nested(self):
+        schema = {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "active": {"type": "boolean", "default": True},
+                "score": {"type": "number"},
+                "label": {"type": "string"},
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "qty": {"type": "integer"},
+                            "tags": {"type": "array", "default": []},
+                        },
+                        "additionalProperties": False,
+                    },
+                },
+            },
+        }
+        json_obj = {
+            "id": "3",
+            "score": "2.5",
+            "label": 7,
+            "items": [{"qty": "2", "junk": 1}, {"qty": "many"}],
+        }
+        expected_output = {
+            "id": 3,
+            "active": True,
+            "score": 2.5,
+            "label": "7",
+            "items": [{"qty": 2, "tags": []}, {"qty": "many", "tags": []}],
+        }
+        repaired = repair_with_schema(json_obj, schema)
+        self.assertEqual(repaired, expected_output)
+        self.assertIsNot(repaired["items"][0]["tags"], repaired["items"][1]["tags"])
+        self.assertTrue(validate_with_schema({"id": 1, "items": repaired["items"][:1]}, schema))
+
+    def test_repair_with_pydantic_schema(self):
+        class Address(BaseModel):
+            zip_code: int
+            verified: bool = False
+
+        class Customer(BaseModel):
+            name: str
+            address: Optional[Address] = None
+            history: List[Address] = []
+
+        schema = generate_schema(Customer)
+        json_obj = {"name": "Bob", "address": {"zip_code": "1000"}, "history": [{"zip_code": "2", "verified": "true"}]}
+        repaired = repair_with_schema(json_obj, schema)
+        self.assertEqual(repaired["address"], {"zip_code": 1000, "verified": False})
+        self.assertEqual(repaired["history"], [{"zip_code": 2, "verified": True}])
+        self.assertIs(compile_repair_plan(schema), compile_repair_plan(generate_schema(Customer)))
+
+    def test_repair_with_recursive_schema(self):
+        class Node(BaseModel):
+            model_config = ConfigDict(extra="forbid")
+            v: int
+            child: Optional["Node"] = None
+
+        schema = generate_schema(Node)
+        json_obj = {"v": "1", "x": 1, "child": {"v": "2", "y": 2, "child": {"v": "3", "z": 3}}}
+        repaired = repair_with_schema(json_obj, schema)
+        self.assertEqual(repaired, {"v": 1, "child": {"v": 2, "child": {"v": 3, "child": None}}})
+        self.assertEqual(repair_with_schema({"v": 1, "child": None}, schema), {"v": 1, "child": None})
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_validator_defers_heavy_dependencies(self):
+        code = (
+            "import sys, fluxon.validator as v; "
+            "assert 'jsonschema' not in sys.modules and 'pydantic' not in sys.modules; "
+            "v.get_validator({'type': 'object'}); assert 'jsonschema' in sys.modules; "
+            "import jsonschema; assert v.ValidationError is jsonschema.ValidationError"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": SRC_PATH})
+
 
 if __name__ == "__main__":
     unittest.main()